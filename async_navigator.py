@@ -0,0 +1,552 @@
+"""
+Async Community Navigator
+
+Same agent as navigator.CommunityNavigator, but every blocking step is
+moved off the event loop: Qdrant calls go through AsyncQdrantClient and the
+embedding model runs in an executor. One web worker can then serve many
+concurrent users without a thread per request.
+
+The async client cannot share the in-memory collection built by the
+synchronous setup_qdrant(), so build a persistent collection first:
+
+    client, model = setup_qdrant(storage_path="qdrant_storage")
+    client.close()
+    nav = AsyncCommunityNavigator(model=model, storage_path="qdrant_storage")
+    results = await nav.search_resources("free clinic")
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from degradation import FALLBACK, FULL, MAX_DEADLINE_QUERIES, SKIP_OPTIONAL, Deadline, SearchResults
+from filters import parse_open_at
+from memory_journal import is_journal_path
+from memory_store import DEFAULT_USER
+from navigator import CommunityNavigator
+from setup_qdrant import COLLECTION_NAME
+
+logger = logging.getLogger(__name__)
+
+
+def create_async_client(path=None, url=None):
+    """Async counterpart of setup_qdrant.create_client"""
+    from qdrant_client import AsyncQdrantClient
+
+    if url:
+        return AsyncQdrantClient(url=url)
+    if path:
+        return AsyncQdrantClient(path=path)
+    return AsyncQdrantClient(":memory:")
+
+
+class AsyncCommunityNavigator(CommunityNavigator):
+    """
+    CommunityNavigator with async search, recommendations and export
+
+    Memory, profile and analysis helpers are inherited unchanged. Concurrent
+    sessions are kept apart by passing a user_id to each call.
+    """
+
+    def __init__(self, client=None, model=None, embedding_cache=None,
+                 storage_path=None, url=None, executor=None, max_workers=4,
+                 memory_store=None, user_id=DEFAULT_USER, encoder_backend=None,
+                 metrics=None, exact_search_threshold=1000, sparse_index=None, hnsw_ef=None,
+                 quantization_rescore=None, quantization_oversampling=None, result_cache=None,
+                 regions=None, shard_timeout_ms=None):
+        """
+        Args:
+            client: AsyncQdrantClient (created from storage_path/url if omitted)
+            model: Embedding model shared by all requests
+            embedding_cache: Optional EmbeddingCache
+            storage_path: Directory of a collection built by setup_qdrant
+            url: Qdrant server URL
+            executor: Executor that runs model.encode and file I/O
+            max_workers: Threads in the default executor
+            memory_store: Per-user memory backend (in-process by default)
+            user_id: User assumed when a call doesn't pass one
+            encoder_backend: Embedding backend used when no model is given
+            metrics: Sink for per-stage timings (see metrics.py)
+            exact_search_threshold: Largest filter match count searched exactly
+            sparse_index: BM25Index (or its path) enabling hybrid search
+            hnsw_ef: Default search-time HNSW candidate list
+            quantization_rescore: Re-rank quantized candidates with originals
+            quantization_oversampling: Candidate multiplier before rescoring
+            result_cache: ResultCache for identical searches
+            regions: Regional collections to route and fan out searches to
+            shard_timeout_ms: Time a regional collection has to answer
+        """
+        super().__init__(
+            client=client,
+            model=model,
+            embedding_cache=embedding_cache,
+            storage_path=storage_path,
+            url=url,
+            memory_store=memory_store,
+            user_id=user_id,
+            encoder_backend=encoder_backend,
+            metrics=metrics,
+            exact_search_threshold=exact_search_threshold,
+            sparse_index=sparse_index,
+            hnsw_ef=hnsw_ef,
+            quantization_rescore=quantization_rescore,
+            quantization_oversampling=quantization_oversampling,
+            result_cache=result_cache,
+            regions=regions,
+            shard_timeout_ms=shard_timeout_ms
+        )
+
+        self.executor = executor if executor else ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="navigator-encode"
+        )
+
+    def _create_client(self):
+        """Create an AsyncQdrantClient for the configured storage mode"""
+        return create_async_client(path=self._storage_path, url=self._url)
+
+    async def warmup(self):
+        """Async version of CommunityNavigator.warmup"""
+        loop = asyncio.get_running_loop()
+        timings = {}
+
+        start = time.perf_counter()
+        await loop.run_in_executor(self.executor, lambda: self.model.encode("warmup"))
+        timings["model_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        client = await self._loaded_client()
+        for collection_name in self._collections():
+            await client.get_collection(collection_name=collection_name)
+        timings["client_seconds"] = time.perf_counter() - start
+
+        logger.info("✅ Navigator warmed up in %.2fs", sum(timings.values()))
+        return timings
+
+    async def search_resources(self, query, category_filter=None, top_k=5, user_id=None, hybrid=None,
+                               hnsw_ef=None, deadline_ms=None, open_at=None):
+        """Async version of CommunityNavigator.search_resources"""
+        category_filter = self._with_open_at(category_filter, parse_open_at(open_at))
+        logger.debug("🔍 Searching for: '%s'", query)
+        if category_filter:
+            logger.debug("   Filtering by: %s", category_filter)
+
+        deadline = Deadline(deadline_ms)
+        hybrid = self._use_hybrid(hybrid)
+        cache_key = self._result_key(query, category_filter, top_k, hybrid, hnsw_ef)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            query_vector, results = cached
+            degradation = FULL
+        else:
+            query_vector, results, degradation = await self._search_uncached_async(
+                query, category_filter, top_k, hybrid, hnsw_ef, deadline
+            )
+            if degradation == FULL:
+                self.result_cache.put(cache_key, query_vector, results)
+
+        # Memory stores may block (SQLite), so update them off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.executor,
+            lambda: self._add_to_memory(query, results, category_filter, user_id=user_id, query_vector=query_vector)
+        )
+
+        logger.debug("   Found %d relevant resources (%s)", len(results), degradation)
+
+        return SearchResults(results, degradation)
+
+    async def search_resources_batch(self, queries, category_filters=None, top_k=5, user_id=None,
+                                     hybrid=None, hnsw_ef=None, deadline_ms=None, open_at=None):
+        """Async version of CommunityNavigator.search_resources_batch"""
+        queries = list(queries)
+        if not queries:
+            return []
+
+        open_at = parse_open_at(open_at)
+        category_filters = [
+            self._with_open_at(category_filter, open_at)
+            for category_filter in self._per_query_filters(queries, category_filters)
+        ]
+
+        logger.debug("🔍 Batch searching %d queries", len(queries))
+
+        deadline = Deadline(deadline_ms)
+        hybrid = self._use_hybrid(hybrid)
+        cache_keys = [
+            self._result_key(query, category_filter, top_k, hybrid, hnsw_ef)
+            for query, category_filter in zip(queries, category_filters)
+        ]
+        outcomes = [self.result_cache.get(key) for key in cache_keys]
+
+        misses = [i for i, outcome in enumerate(outcomes) if outcome is None]
+        degradations = [FULL] * len(queries)
+        if misses:
+            miss_vectors, miss_results, degradation = await self._search_batch_uncached_async(
+                [queries[i] for i in misses], [category_filters[i] for i in misses], top_k, hybrid, hnsw_ef,
+                deadline
+            )
+            for i, query_vector, results in zip(misses, miss_vectors, miss_results):
+                outcomes[i] = (query_vector, results)
+                degradations[i] = degradation
+                if degradation == FULL:
+                    self.result_cache.put(cache_keys[i], query_vector, results)
+
+        query_vectors = [query_vector for query_vector, _ in outcomes]
+        batch_results = [
+            SearchResults(results, degradation) for (_, results), degradation in zip(outcomes, degradations)
+        ]
+
+        def add_to_memory():
+            for query, results, category_filter, query_vector in zip(
+                    queries, batch_results, category_filters, query_vectors):
+                self._add_to_memory(query, results, category_filter, user_id=user_id, query_vector=query_vector)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, add_to_memory)
+
+        return batch_results
+
+    async def _search_uncached_async(self, query, category_filter, top_k, hybrid, hnsw_ef, deadline=None):
+        """Async version of CommunityNavigator._search_uncached"""
+        deadline = deadline or Deadline()
+        level = self._plan_level(deadline, hybrid)
+        if level == FALLBACK:
+            return None, self._fallback_results(category_filter, top_k), FALLBACK
+
+        with self._stage_timer.time("encode"):
+            query_vector = await self._encode_query_async(query)
+        if not deadline.allows(0):
+            return query_vector, self._fallback_results(category_filter, top_k), FALLBACK
+
+        with self._stage_timer.time("filter_build"):
+            search_filter = self._build_filter(category_filter)
+            search_params = await self._plan_search_async(
+                category_filter, search_filter, self._degraded_ef(level, hnsw_ef), deadline
+            )
+
+        limit = self._candidate_limit(top_k, hybrid, self._decays(category_filter))
+        results = await self._query_by_deadline_async(deadline, self._query_async(
+            query_vector, search_filter, limit, search_params, self._collections(category_filter)
+        ), stage="qdrant_query")
+        if results is None:
+            return query_vector, self._fallback_results(category_filter, top_k), FALLBACK
+
+        results = self._distance_ranked(results, category_filter)
+        if hybrid:
+            level = self._hybrid_level(level, deadline)
+            if level == SKIP_OPTIONAL:
+                results = results[:top_k]
+            else:
+                results = await self._hybrid_results_async(query, results, category_filter, top_k)
+        else:
+            results = results[:top_k]
+
+        if level == FULL:
+            self.popular_results.record(results)
+        return query_vector, results, level
+
+    async def _search_batch_uncached_async(self, queries, category_filters, top_k, hybrid, hnsw_ef,
+                                           deadline=None):
+        """Async version of CommunityNavigator._search_batch_uncached"""
+        deadline = deadline or Deadline()
+        level = self._plan_level(deadline, hybrid)
+        if level == FALLBACK:
+            return self._fallback_batch(queries, category_filters, top_k)
+
+        loop = asyncio.get_running_loop()
+        with self._stage_timer.time("encode"):
+            query_vectors = await loop.run_in_executor(self.executor, self._encode_queries, queries)
+        if not deadline.allows(0):
+            return self._fallback_batch(queries, category_filters, top_k, query_vectors)
+
+        with self._stage_timer.time("filter_build"):
+            search_filters = [self._build_filter(c) for c in category_filters]
+            search_params = [
+                await self._plan_search_async(c, f, self._degraded_ef(level, hnsw_ef), deadline)
+                for c, f in zip(category_filters, search_filters)
+            ]
+
+        limit = self._candidate_limit(top_k, hybrid, any(self._decays(c) for c in category_filters))
+        batch_results = await self._query_by_deadline_async(deadline, self._query_batch_async(
+            query_vectors, search_filters, limit, search_params,
+            [self._collections(c) for c in category_filters]
+        ), stage="qdrant_query")
+        if batch_results is None:
+            return self._fallback_batch(queries, category_filters, top_k, query_vectors)
+
+        batch_results = [
+            self._distance_ranked(results, category_filter)
+            for results, category_filter in zip(batch_results, category_filters)
+        ]
+        if hybrid:
+            level = self._hybrid_level(level, deadline, len(queries))
+            if level == SKIP_OPTIONAL:
+                batch_results = [results[:top_k] for results in batch_results]
+            else:
+                batch_results = [
+                    await self._hybrid_results_async(query, results, category_filter, top_k)
+                    for query, results, category_filter in zip(queries, batch_results, category_filters)
+                ]
+        else:
+            batch_results = [results[:top_k] for results in batch_results]
+
+        if level == FULL:
+            for results in batch_results:
+                self.popular_results.record(results)
+        return query_vectors, batch_results, level
+
+    async def get_recommendations(self, top_k=3, user_id=None, deadline_ms=None):
+        """Async version of CommunityNavigator.get_recommendations"""
+        user_id = self._user(user_id)
+        deadline = Deadline(deadline_ms)
+        loop = asyncio.get_running_loop()
+
+        interest_vector = await loop.run_in_executor(self.executor, self.memory_store.interest_vector, user_id)
+        if interest_vector is None:
+            history = await loop.run_in_executor(self.executor, self.memory_store.history, user_id)
+            if not history:
+                logger.debug("💡 No search history yet. Showing popular resources...")
+                return await self.search_resources("community services", top_k=top_k, user_id=user_id,
+                                                   deadline_ms=deadline.remaining_ms())
+
+            if self._plan_level(deadline) != FULL:
+                return await loop.run_in_executor(self.executor, self._fallback_recommendations, user_id, top_k)
+
+            with self._stage_timer.time("encode"):
+                interest_vector = await self._encode_query_async(self._recent_interest_query(history))
+
+        level = self._recommendation_level(deadline)
+        if level == FALLBACK:
+            return await loop.run_in_executor(self.executor, self._fallback_recommendations, user_id, top_k)
+
+        logger.debug("💡 Generating personalized recommendations...")
+
+        with self._stage_timer.time("recommendation_filter"):
+            unseen_filter = await loop.run_in_executor(self.executor, self._unseen_filter, user_id)
+        results = await self._query_by_deadline_async(deadline, self._query_async(
+            interest_vector, unseen_filter, top_k,
+            self._search_params(hnsw_ef=self._degraded_ef(level, None)), self._collections()
+        ), stage="qdrant_query")
+        if results is None:
+            return await loop.run_in_executor(self.executor, self._fallback_recommendations, user_id, top_k)
+        return SearchResults(results, level)
+
+    async def export_memory(self, filepath='memory_export.json', user_id=None):
+        """Async version of CommunityNavigator.export_memory"""
+        loop = asyncio.get_running_loop()
+        if is_journal_path(filepath):
+            # The journal takes consistent per-user snapshots itself
+            await loop.run_in_executor(self.executor, self._flush_journal, filepath, user_id)
+            return
+
+        # The store snapshots a user atomically, so concurrent searches can't change it mid-write
+        memory_data = await loop.run_in_executor(self.executor, self._memory_snapshot, user_id)
+        await loop.run_in_executor(self.executor, self._write_memory_export, filepath, memory_data)
+
+    async def import_memory(self, filepath, user_id=None):
+        """Async version of CommunityNavigator.import_memory"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, CommunityNavigator.import_memory, self, filepath, user_id
+        )
+
+    async def close(self):
+        """Close the Qdrant client and stop the encoder threads"""
+        if self._client is not None:
+            await self._client.close()
+        self.executor.shutdown(wait=False)
+
+    async def _loaded_model(self):
+        """The embedding model, loaded in the executor on first use so the loop never blocks"""
+        if self._model is None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, lambda: self.model)
+        return self._model
+
+    async def _loaded_client(self):
+        """The Qdrant client, created in the executor on first use (opening local storage blocks)"""
+        if self._client is None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, lambda: self.client)
+        return self._client
+
+    async def _encode_query_async(self, query):
+        """Embed a query in the executor, reusing the cached vector when available"""
+        vector = self.embedding_cache.get(query)
+        if vector is None:
+            model = await self._loaded_model()
+            if hasattr(model, "encode_async"):
+                # A MicroBatchEncoder batches concurrent queries itself
+                vector = await model.encode_async(query)
+            else:
+                loop = asyncio.get_running_loop()
+                vector = await loop.run_in_executor(self.executor, model.encode, query)
+            self.embedding_cache.put(query, vector)
+        return vector.tolist()
+
+    async def _hybrid_results_async(self, query, dense_results, category_filter, top_k):
+        """Async version of CommunityNavigator._hybrid_results"""
+        with self._stage_timer.time("sparse_query"):
+            sparse_ids = self._sparse_ranking(query, top_k)
+            missing = self._missing_ids(dense_results, sparse_ids)
+            client = await self._loaded_client()
+            records = await client.retrieve(
+                collection_name=COLLECTION_NAME,
+                ids=missing,
+                with_payload=True
+            ) if missing else []
+
+        with self._stage_timer.time("fusion"):
+            return self._fuse(dense_results, sparse_ids, records, category_filter, top_k)
+
+    async def _plan_search_async(self, category_filter, search_filter, hnsw_ef=None, deadline=None):
+        """Async version of CommunityNavigator._plan_search"""
+        plan = self._cardinality_plan(category_filter, search_filter)
+        if plan is None:
+            return self._search_params(hnsw_ef=hnsw_ef)
+
+        key, count_filter = plan
+        matches = self._filter_cardinality.get(key)
+        if matches is None:
+            matches = await self._query_by_deadline_async(
+                deadline or Deadline(), self._count_matches_async(category_filter, count_filter)
+            )
+            if matches is None:
+                return self._search_params(hnsw_ef=hnsw_ef)
+            self._remember_cardinality(key, matches)
+        return self._search_params(matches, hnsw_ef)
+
+    async def _count_matches_async(self, category_filter, count_filter):
+        """Async version of CommunityNavigator._count_matches"""
+        client = await self._loaded_client()
+        matches = 0
+        for collection_name in self._collections(category_filter):
+            response = await client.count(
+                collection_name=collection_name,
+                count_filter=count_filter,
+                exact=False
+            )
+            matches += response.count
+        return matches
+
+    async def _query_by_deadline_async(self, deadline, query, stage=None):
+        """Async version of CommunityNavigator._query_by_deadline: await a query coroutine"""
+        if deadline.expires_at is None:
+            if stage is None:
+                return await query
+            with self._stage_timer.time(stage):
+                return await query
+
+        if not deadline.allows(0) or not self._deadline_slots.acquire(blocking=False):
+            query.close()
+            logger.warning("⚠️ %d Qdrant queries in flight; serving fallback results", MAX_DEADLINE_QUERIES)
+            return None
+
+        started = time.perf_counter()
+        task = asyncio.ensure_future(query)
+
+        def finished(task):
+            self._finish_deadline_query(stage, started)
+            # An abandoned query's error has no caller left to raise it
+            if not task.cancelled():
+                task.exception()
+
+        task.add_done_callback(finished)
+        # Like the sync version, a late query runs on so its duration is known; only its result is dropped
+        done, _ = await asyncio.wait({task}, timeout=max(deadline.remaining(), 0))
+        if task not in done:
+            logger.warning("⚠️ Qdrant query missed the deadline; serving fallback results")
+            return None
+        return task.result()
+
+    async def _fan_out_async(self, collections, search):
+        """Async version of CommunityNavigator._fan_out (search returns a coroutine)"""
+        if len(collections) == 1:
+            return [await search(collections[0])]
+        if not collections:
+            return []
+
+        shards = {asyncio.ensure_future(search(collection_name)): collection_name
+                  for collection_name in collections}
+        timeout = None if self.shard_timeout_ms is None else self.shard_timeout_ms / 1000.0
+        done, _ = await asyncio.wait(shards, timeout=timeout)
+        return self._shard_results(shards, done)
+
+    async def _query_async(self, query_vector, search_filter, top_k, search_params=None, collections=None):
+        """Run a single vector search without blocking the event loop"""
+        shard_results = await self._fan_out_async(
+            collections if collections is not None else self._collections(),
+            lambda collection_name: self._query_collection_async(
+                collection_name, query_vector, search_filter, top_k, search_params
+            )
+        )
+        return self._merge_shards(shard_results, top_k)
+
+    async def _query_collection_async(self, collection_name, query_vector, search_filter, top_k,
+                                      search_params=None):
+        """Async version of CommunityNavigator._query_collection"""
+        client = await self._loaded_client()
+        try:
+            # New API (v1.16+)
+            search_result = await client.query_points(
+                collection_name=collection_name,
+                query=query_vector,
+                limit=top_k,
+                query_filter=search_filter,
+                search_params=search_params,
+                with_payload=True
+            )
+            return search_result.points
+        except AttributeError:
+            # Fallback for older versions
+            return await client.search(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                query_filter=search_filter,
+                search_params=search_params,
+                limit=top_k,
+                with_payload=True
+            )
+
+    async def _query_batch_async(self, query_vectors, search_filters, top_k, search_params=None, routes=None):
+        """Async version of CommunityNavigator._query_batch"""
+        if search_params is None:
+            search_params = [None] * len(query_vectors)
+        if routes is None:
+            routes = [self._collections()] * len(query_vectors)
+
+        async def search(collection_name):
+            indexes = [i for i, route in enumerate(routes) if collection_name in route]
+            return indexes, await self._query_batch_collection_async(
+                collection_name,
+                [query_vectors[i] for i in indexes],
+                [search_filters[i] for i in indexes],
+                top_k,
+                [search_params[i] for i in indexes]
+            )
+
+        collections = list(dict.fromkeys(collection_name for route in routes for collection_name in route))
+        shard_results = [[] for _ in query_vectors]
+        for indexes, batch_results in await self._fan_out_async(collections, search):
+            for i, results in zip(indexes, batch_results):
+                shard_results[i].append(results)
+        return [self._merge_shards(results, top_k) if results else [] for results in shard_results]
+
+    async def _query_batch_collection_async(self, collection_name, query_vectors, search_filters, top_k,
+                                            search_params=None):
+        """Async version of CommunityNavigator._query_batch_collection"""
+        client = await self._loaded_client()
+        use_query_api, requests = self._batch_requests(query_vectors, search_filters, top_k, search_params)
+        if use_query_api:
+            responses = await client.query_batch_points(
+                collection_name=collection_name,
+                requests=requests
+            )
+            return [response.points for response in responses]
+
+        return await client.search_batch(
+            collection_name=collection_name,
+            requests=requests
+        )
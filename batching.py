@@ -0,0 +1,210 @@
+"""
+Dynamic micro-batching for query embedding
+
+A SentenceTransformer encodes 32 sentences in little more time than one,
+but concurrent requests each call ``model.encode`` on a single query.
+MicroBatchEncoder sits in front of the model: callers enqueue their text,
+a scheduler thread collects queries for up to ``max_wait_ms`` (or until
+``max_batch_size`` are waiting), encodes them in one call and routes each
+vector back to its caller.
+
+It exposes the same ``encode`` method as the model, so it can be passed
+anywhere a model is accepted:
+
+    encoder = MicroBatchEncoder(load_model(), max_wait_ms=5)
+    nav = CommunityNavigator(client=client, model=encoder)
+
+Pass ``model_factory`` instead of a model to defer loading it until the
+first encode (or ``load()``), e.g. so a server can bind its socket first.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class _Request:
+    """One query waiting to be encoded"""
+
+    __slots__ = ("text", "future", "enqueued_at")
+
+    def __init__(self, text):
+        self.text = text
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatchEncoder:
+    """
+    Coalesce concurrent encode calls into batched model calls
+
+    Metrics for batch size, queueing delay and encode time are kept over
+    the last ``history_size`` batches and reported by ``stats()``.
+    """
+
+    def __init__(self, model=None, max_batch_size=32, max_wait_ms=5.0, history_size=1024, model_factory=None):
+        """
+        Args:
+            model: Embedding model exposing ``encode(list_of_texts)``
+            max_batch_size: Encode as soon as this many queries are waiting
+            max_wait_ms: Longest a query waits for others to join its batch
+            history_size: Batches kept for the metrics window
+            model_factory: Zero-argument callable returning the model, called
+                on first use when no model is given
+        """
+        if model is None and model_factory is None:
+            raise ValueError("MicroBatchEncoder needs a model or a model_factory")
+        self._model = model
+        self._model_factory = model_factory
+        self._model_lock = threading.Lock()
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue = queue.Queue()
+        self._batch_sizes = deque(maxlen=history_size)
+        self._queue_delays_ms = deque(maxlen=history_size * max_batch_size)
+        self._encode_ms = deque(maxlen=history_size)
+        self._metrics_lock = threading.Lock()
+        self.total_batches = 0
+        self.total_requests = 0
+
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name="micro-batch-encoder",
+            daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def model(self):
+        """Embedding model, loaded from model_factory on first access"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._model_factory()
+        return self._model
+
+    def load(self):
+        """Load the model now instead of on the first encode"""
+        return self.model
+
+    def submit(self, text):
+        """Queue one query and return a Future resolving to its vector"""
+        if self._closed:
+            raise RuntimeError("MicroBatchEncoder is closed")
+        request = _Request(text)
+        self._queue.put(request)
+        return request.future
+
+    def encode(self, sentences, **kwargs):
+        """
+        Encode one text or a list of texts through the scheduler
+
+        Mirrors ``SentenceTransformer.encode``: a string returns one vector,
+        a list returns a 2-D array. Extra keyword arguments such as
+        ``batch_size`` are accepted for compatibility and ignored, since the
+        scheduler decides batch composition.
+        """
+        if isinstance(sentences, str):
+            return self.submit(sentences).result()
+
+        futures = [self.submit(text) for text in sentences]
+        return np.stack([future.result() for future in futures])
+
+    async def encode_async(self, text):
+        """Await the vector for one query without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def close(self):
+        """Encode anything still queued, then stop the scheduler thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self):
+        """Batch size, queueing delay and encode time over the metrics window"""
+        with self._metrics_lock:
+            sizes = list(self._batch_sizes)
+            delays = list(self._queue_delays_ms)
+            encode_ms = list(self._encode_ms)
+            total_batches = self.total_batches
+            total_requests = self.total_requests
+
+        return {
+            "batches": total_batches,
+            "requests": total_requests,
+            "batch_size_mean": sum(sizes) / len(sizes) if sizes else 0.0,
+            "batch_size_p50": _percentile(sizes, 50),
+            "batch_size_max": max(sizes) if sizes else 0,
+            "queue_delay_ms_mean": sum(delays) / len(delays) if delays else 0.0,
+            "queue_delay_ms_p50": _percentile(delays, 50),
+            "queue_delay_ms_p95": _percentile(delays, 95),
+            "queue_delay_ms_max": max(delays) if delays else 0.0,
+            "encode_ms_mean": sum(encode_ms) / len(encode_ms) if encode_ms else 0.0,
+            "encode_ms_p95": _percentile(encode_ms, 95)
+        }
+
+    def _run(self):
+        """Scheduler loop: gather a batch, encode it, repeat"""
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            # The window opens when the first query of the batch arrived
+            deadline = first.enqueued_at + self.max_wait_ms / 1000.0
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    request = self._queue.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch):
+        """Encode a batch and resolve each caller's future"""
+        started = time.perf_counter()
+        try:
+            vectors = self.model.encode([r.text for r in batch], batch_size=len(batch))
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        finished = time.perf_counter()
+
+        for request, vector in zip(batch, vectors):
+            # Copy the row so a cached vector does not pin the whole batch
+            request.future.set_result(vector.copy())
+
+        with self._metrics_lock:
+            self.total_batches += 1
+            self.total_requests += len(batch)
+            self._batch_sizes.append(len(batch))
+            self._encode_ms.append((finished - started) * 1000)
+            self._queue_delays_ms.extend(
+                (started - request.enqueued_at) * 1000 for request in batch
+            )
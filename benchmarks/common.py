@@ -0,0 +1,86 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+
+import contextlib
+import io
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+
+def latency_summary(seconds):
+    """Mean and p50/p95/p99 of a list of latencies, in milliseconds"""
+    if not seconds:
+        return {"count": 0}
+    ordered = sorted(s * 1000 for s in seconds)
+
+    def pct(p):
+        index = min(len(ordered) - 1, max(0, int(round(p / 100.0 * len(ordered))) - 1))
+        return ordered[index]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1]
+    }
+
+
+def time_calls(fn, args_list):
+    """Call fn once per argument tuple and return the latencies in seconds"""
+    latencies = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the navigator's console output while timing it"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def run_metadata(**extra):
+    """Environment details recorded with every result file"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor()
+    }
+    meta.update(extra)
+    return meta
+
+
+def write_results(results, output_path=None):
+    """Print results as JSON and optionally write them to a file"""
+    text = json.dumps(results, indent=2)
+    if output_path:
+        with open(output_path, 'w') as f:
+            f.write(text)
+    print(text)
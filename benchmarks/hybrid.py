@@ -0,0 +1,113 @@
+"""
+Hybrid (BM25 + dense) versus dense-only search
+
+Ingests a synthetic corpus with its BM25 index, then runs the same queries
+through search_resources with hybrid=False and hybrid=True and reports:
+
+- latency of each mode and the hybrid overhead
+- BM25 index build time and size on disk
+- exact-token precision: for queries naming a program or acronym
+  ("EITC", "GED", ...), the share of top-k results containing that token
+
+    python -m benchmarks.hybrid --rows 100000 --output hybrid.json
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.common import latency_summary, quiet, run_metadata, time_calls, write_results
+from benchmarks.suite import load_encoder
+from benchmarks.synthetic import QUERY_POOL, write_corpus_csv
+
+# Queries whose answer hinges on one exact token
+TOKEN_QUERIES = {
+    "EITC": "free EITC tax filing",
+    "GED": "GED classes",
+    "ESL": "ESL for adults",
+    "MAT": "MAT program for opioid recovery",
+    "PTSD": "PTSD support",
+}
+
+
+def token_precision(nav, top_k, hybrid):
+    """Share of top-k results whose text contains each query's key token"""
+    from sparse_index import sparse_text, tokenize
+
+    precision = {}
+    for token, query in TOKEN_QUERIES.items():
+        results = nav.search_resources(query, top_k=top_k, hybrid=hybrid)
+        hits = sum(token.lower() in tokenize(sparse_text(r.payload)) for r in results)
+        precision[token] = hits / top_k
+    return precision
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare hybrid and dense-only search")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200, help="Timed calls per mode")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--encoder", default="torch",
+                        help="torch, onnx, int8, or hash (model-free)")
+    parser.add_argument("--url", default=None, help="Benchmark against a Qdrant server")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    from embedding_cache import EmbeddingCache
+    from navigator import CommunityNavigator
+    from result_cache import ResultCache
+    from setup_qdrant import create_client, create_resource_collection, ingest_csv
+    from sparse_index import BM25Index
+
+    results = {"meta": run_metadata(benchmark="hybrid", rows=args.rows, encoder=args.encoder,
+                                    url=args.url, top_k=args.top_k, seed=args.seed)}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, "corpus.csv")
+        write_corpus_csv(csv_path, args.rows, seed=args.seed)
+
+        model = load_encoder(args.encoder)
+        client = create_client(url=args.url)
+        create_resource_collection(client)
+
+        sparse_index = BM25Index()
+        with quiet():
+            results["ingest"] = ingest_csv(client, model, csv_path, sparse_index=sparse_index)
+
+        index_path = os.path.join(workdir, "sparse_index.npz")
+        start = time.perf_counter()
+        sparse_index.save(index_path)
+        results["sparse_index"] = {
+            "documents": len(sparse_index),
+            "save_seconds": time.perf_counter() - start,
+            "size_mb": os.path.getsize(index_path) / (1024 * 1024)
+        }
+
+        # Encoding is cached so both modes pay the same (zero) model cost;
+        # results are not, so every call reaches Qdrant
+        nav = CommunityNavigator(client=client, model=model, embedding_cache=EmbeddingCache(),
+                                 result_cache=ResultCache(max_entries=0), sparse_index=sparse_index)
+        queries = [QUERY_POOL[i % len(QUERY_POOL)] for i in range(args.queries)]
+        for query in set(queries):
+            nav.search_resources(query, top_k=args.top_k, hybrid=True)
+
+        for mode, hybrid in (("dense", False), ("hybrid", True)):
+            results[mode] = latency_summary(time_calls(
+                nav.search_resources,
+                [(q, None, args.top_k, None, hybrid) for q in queries]
+            ))
+            results[mode]["token_precision"] = token_precision(nav, args.top_k, hybrid)
+
+        results["hybrid_overhead_ms"] = {
+            key: results["hybrid"][key] - results["dense"][key]
+            for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms")
+        }
+        client.close()
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
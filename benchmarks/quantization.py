@@ -0,0 +1,183 @@
+"""
+Recall versus memory for quantization and HNSW settings
+
+Embeds a synthetic corpus once, loads it into one collection per
+quantization setting and compares each search configuration against exact
+(brute-force) float32 search:
+
+- recall@k against the exact top-k
+- search latency
+- estimated RAM for vectors and the HNSW graph
+
+Quantization and HNSW only exist on a Qdrant server (embedded mode always
+searches exactly), so this benchmark needs --url:
+
+    python -m benchmarks.quantization --url http://localhost:6333 --rows 100000 \\
+        --quantization none scalar binary --hnsw-ef 32 64 128 --output quant.json
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.common import latency_summary, run_metadata, write_results
+from benchmarks.suite import load_encoder
+from benchmarks.synthetic import QUERY_POOL, generate_rows
+
+# Bytes per vector dimension held in RAM for each storage mode
+BYTES_PER_DIMENSION = {"none": 4.0, "scalar": 1.0, "binary": 1.0 / 8}
+
+
+def estimated_ram_mb(n_rows, dimension, quantization, hnsw_m):
+    """
+    Rough RAM needed for the searchable part of a collection
+
+    With quantization the float32 originals live on disk, so only the
+    quantized copy counts. The HNSW base layer keeps up to 2*m links of
+    4 bytes per point; upper layers add little.
+    """
+    vectors = n_rows * dimension * BYTES_PER_DIMENSION[quantization]
+    graph = n_rows * 2 * hnsw_m * 4
+    return {
+        "vectors_mb": vectors / (1024 * 1024),
+        "hnsw_graph_mb": graph / (1024 * 1024),
+        "total_mb": (vectors + graph) / (1024 * 1024)
+    }
+
+
+def search_ids(client, collection_name, vector, top_k, search_params=None):
+    """Point IDs of one search, using the query API when available"""
+    try:
+        points = client.query_points(
+            collection_name=collection_name,
+            query=vector,
+            limit=top_k,
+            search_params=search_params
+        ).points
+    except AttributeError:
+        points = client.search(
+            collection_name=collection_name,
+            query_vector=vector,
+            limit=top_k,
+            search_params=search_params
+        )
+    return [str(point.id) for point in points]
+
+
+def wait_until_indexed(client, collection_name, timeout=3600):
+    """Block until Qdrant's optimizer has finished building the index"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if str(client.get_collection(collection_name=collection_name).status).endswith("green"):
+            return
+        time.sleep(1)
+    raise TimeoutError(f"Collection {collection_name} was not indexed within {timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall vs memory for quantization and HNSW settings")
+    parser.add_argument("--url", required=True, help="Qdrant server URL")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--encoder", default="torch",
+                        help="torch, onnx, int8, or hash (model-free)")
+    parser.add_argument("--quantization", nargs="+", default=["none", "scalar", "binary"],
+                        choices=["none", "scalar", "binary"])
+    parser.add_argument("--hnsw-m", type=int, default=16)
+    parser.add_argument("--hnsw-ef-construct", type=int, default=100)
+    parser.add_argument("--hnsw-ef", type=int, nargs="+", default=[32, 64, 128, 256],
+                        help="Search-time candidate list sizes to try")
+    parser.add_argument("--oversampling", type=float, default=2.0,
+                        help="Candidate multiplier before rescoring quantized results")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    from qdrant_client.models import QuantizationSearchParams, SearchParams
+    from setup_qdrant import VECTOR_SIZE, build_index_config, create_client, create_resource_collection, resource_text
+
+    rows = list(generate_rows(args.rows, seed=args.seed))
+    model = load_encoder(args.encoder)
+
+    start = time.perf_counter()
+    vectors = model.encode([resource_text(row) for row in rows], batch_size=128)
+    encode_seconds = time.perf_counter() - start
+
+    # Hand-written queries plus descriptions drawn from the corpus
+    rng = random.Random(args.seed)
+    query_texts = QUERY_POOL + [rng.choice(rows)["description"] for _ in range(max(0, args.queries - len(QUERY_POOL)))]
+    query_vectors = [v.tolist() for v in model.encode(query_texts[:args.queries])]
+
+    client = create_client(url=args.url)
+    results = {
+        "meta": run_metadata(benchmark="quantization", rows=args.rows, encoder=args.encoder,
+                             top_k=args.top_k, hnsw_m=args.hnsw_m,
+                             hnsw_ef_construct=args.hnsw_ef_construct, seed=args.seed),
+        "encode_seconds": encode_seconds,
+        "configs": []
+    }
+
+    ids = list(range(len(rows)))
+    ground_truth = None
+    for quantization in args.quantization:
+        collection_name = f"bench_quantization_{quantization}"
+        index_config = build_index_config(
+            quantization=None if quantization == "none" else quantization,
+            hnsw_m=args.hnsw_m,
+            hnsw_ef_construct=args.hnsw_ef_construct
+        )
+        create_resource_collection(client, collection_name=collection_name, index_config=index_config)
+
+        start = time.perf_counter()
+        client.upload_collection(collection_name=collection_name, vectors=vectors, ids=ids, batch_size=256)
+        wait_until_indexed(client, collection_name)
+        build_seconds = time.perf_counter() - start
+
+        if ground_truth is None:
+            # Exact search over the float32 originals, whatever the quantization
+            exact = SearchParams(exact=True, quantization=QuantizationSearchParams(ignore=True))
+            ground_truth = [
+                set(search_ids(client, collection_name, vector, args.top_k, exact))
+                for vector in query_vectors
+            ]
+
+        rescore_modes = [None] if quantization == "none" else [True, False]
+        for hnsw_ef in args.hnsw_ef:
+            for rescore in rescore_modes:
+                params = SearchParams(
+                    hnsw_ef=hnsw_ef,
+                    quantization=None if rescore is None else QuantizationSearchParams(
+                        rescore=rescore,
+                        oversampling=args.oversampling if rescore else None
+                    )
+                )
+
+                latencies, recalls = [], []
+                for vector, truth in zip(query_vectors, ground_truth):
+                    mark = time.perf_counter()
+                    found = search_ids(client, collection_name, vector, args.top_k, params)
+                    latencies.append(time.perf_counter() - mark)
+                    recalls.append(len(truth.intersection(found)) / max(len(truth), 1))
+
+                results["configs"].append({
+                    "quantization": quantization,
+                    "rescore": rescore,
+                    "hnsw_ef": hnsw_ef,
+                    "build_seconds": build_seconds,
+                    "recall_at_k": sum(recalls) / len(recalls),
+                    "min_recall_at_k": min(recalls),
+                    "latency": latency_summary(latencies),
+                    "estimated_ram": estimated_ram_mb(len(rows), VECTOR_SIZE, quantization, args.hnsw_m)
+                })
+                print(f"⏱️  {quantization:>6} rescore={rescore!s:>5} ef={hnsw_ef:<4} "
+                      f"recall@{args.top_k}={results['configs'][-1]['recall_at_k']:.3f}", flush=True)
+
+        client.delete_collection(collection_name=collection_name)
+
+    client.close()
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
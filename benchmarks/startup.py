@@ -0,0 +1,176 @@
+"""
+Startup-time benchmark for the navigator and the demo
+
+Each probe runs in a fresh interpreter so import costs are measured cold:
+
+- import: time to import navigator / demo_app (and, with --importtime,
+  the slowest modules pulled in along the way)
+- navigator: import, construction, warmup and time-to-first-query for
+  CommunityNavigator, against an on-disk collection (--storage) or an
+  in-memory one built by setup_qdrant()
+- demo: time-to-first-query and total runtime of demo_app.run_demo
+
+Usage (from the repository root):
+
+    python -m benchmarks.startup --output startup.json
+    python -m benchmarks.startup --storage qdrant_storage --repeat 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import json, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"import_seconds": time.perf_counter() - start}}))
+"""
+
+NAVIGATOR_PROBE = """
+import contextlib, io, json, time
+start = time.perf_counter()
+import navigator
+import setup_qdrant
+timings = {{"import_seconds": time.perf_counter() - start}}
+
+with contextlib.redirect_stdout(io.StringIO()):
+    storage_path = {storage_path!r}
+    mark = time.perf_counter()
+    if storage_path:
+        nav = navigator.CommunityNavigator(storage_path=storage_path)
+    else:
+        client, model = setup_qdrant.setup_qdrant()
+        timings["setup_seconds"] = time.perf_counter() - mark
+        mark = time.perf_counter()
+        nav = navigator.CommunityNavigator(client=client, model=model)
+    timings["construct_seconds"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    nav.warmup()
+    timings["warmup_seconds"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    nav.search_resources("free medical checkup")
+    timings["first_query_seconds"] = time.perf_counter() - mark
+
+timings["time_to_first_query_seconds"] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+DEMO_PROBE = """
+import contextlib, io, json, time
+start = time.perf_counter()
+import demo_app
+import navigator
+timings = {"import_seconds": time.perf_counter() - start}
+
+original = navigator.CommunityNavigator.search_resources
+def timed_search(self, *args, **kwargs):
+    results = original(self, *args, **kwargs)
+    timings.setdefault("time_to_first_query_seconds", time.perf_counter() - start)
+    return results
+navigator.CommunityNavigator.search_resources = timed_search
+
+with contextlib.redirect_stdout(io.StringIO()):
+    demo_app.run_demo()
+timings["total_seconds"] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+def run_probe(code, extra_args=()):
+    """Run a probe in a fresh interpreter and return (timings, stderr)"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+
+    # Probes that build sample data or export memory write into a scratch dir
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, *extra_args, "-c", code],
+            cwd=workdir,
+            env=env,
+            capture_output=True,
+            text=True
+        )
+        wall = time.perf_counter() - start
+
+    if completed.returncode != 0:
+        raise RuntimeError(f"Probe failed:\n{completed.stderr}")
+
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings["process_wall_seconds"] = wall
+    return timings, completed.stderr
+
+
+def slowest_imports(importtime_log, top=10):
+    """Parse ``-X importtime`` output into the slowest cumulative imports"""
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        rows.append((int(fields[1]), fields[2].strip()))
+    rows.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": us / 1000.0} for us, name in rows[:top]]
+
+
+def summarize(samples):
+    """Min/mean/max of each timing across repeats"""
+    summary = {}
+    for key in samples[0]:
+        values = [sample[key] for sample in samples if key in sample]
+        summary[key] = {
+            "min": min(values),
+            "mean": sum(values) / len(values),
+            "max": max(values)
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import and time-to-first-query")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold runs per probe")
+    parser.add_argument("--storage", default=None,
+                        help="On-disk collection for the navigator probe (default: build in memory)")
+    parser.add_argument("--skip-demo", action="store_true", help="Don't run demo_app.run_demo")
+    parser.add_argument("--importtime", action="store_true",
+                        help="Also report the slowest imports of navigator")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {"python": sys.version.split()[0], "repeat": args.repeat}
+
+    for module in ("navigator", "demo_app"):
+        samples = [run_probe(IMPORT_PROBE.format(module=module))[0] for _ in range(args.repeat)]
+        results[f"import_{module}"] = summarize(samples)
+
+    if args.importtime:
+        _, log = run_probe(IMPORT_PROBE.format(module="navigator"), extra_args=("-X", "importtime"))
+        results["slowest_imports"] = slowest_imports(log)
+
+    storage_path = os.path.abspath(args.storage) if args.storage else None
+    samples = [
+        run_probe(NAVIGATOR_PROBE.format(storage_path=storage_path))[0]
+        for _ in range(args.repeat)
+    ]
+    results["navigator"] = summarize(samples)
+
+    if not args.skip_demo:
+        samples = [run_probe(DEMO_PROBE)[0] for _ in range(args.repeat)]
+        results["demo"] = summarize(samples)
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+End-to-end performance benchmark on synthetic corpora
+
+For each corpus size a fresh process generates a synthetic CSV, ingests it
+with setup_qdrant.ingest_csv and measures:
+
+- ingest throughput (rows/sec)
+- search_resources latency, with and without category_filter
+- get_recommendations latency
+- peak RSS of the process
+
+Results are written as JSON so runs can be compared across releases.
+
+    python -m benchmarks.suite --sizes 10000 100000 --output bench.json
+    python -m benchmarks.suite --sizes 1000000 --encoder hash --url http://localhost:6333
+
+``--encoder hash`` swaps the transformer for a hashing encoder to measure
+everything around the model; embedded Qdrant searches by brute force, so
+use ``--url`` for index-accurate latencies at large sizes.
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.common import latency_summary, peak_rss_mb, quiet, run_metadata, time_calls, write_results
+from benchmarks.synthetic import QUERY_POOL, HashingEncoder, write_corpus_csv
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+
+def load_encoder(name):
+    """The hashing stand-in or one of the encoders.py backends"""
+    if name == "hash":
+        return HashingEncoder()
+    from setup_qdrant import load_model
+
+    return load_model(backend=name)
+
+
+def run_size(n_rows, options):
+    """Benchmark one corpus size; runs in its own process so peak RSS is per size"""
+    from embedding_cache import EmbeddingCache
+    from navigator import CommunityNavigator
+    from result_cache import ResultCache
+    from setup_qdrant import create_client, create_resource_collection, ingest_csv, sample_resources
+
+    result = {"rows": n_rows}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, "corpus.csv")
+        start = time.perf_counter()
+        write_corpus_csv(csv_path, n_rows, seed=options["seed"])
+        result["generate_seconds"] = time.perf_counter() - start
+
+        model = load_encoder(options["encoder"])
+        client = create_client(
+            path=os.path.join(workdir, "qdrant") if options["on_disk"] else None,
+            url=options["url"]
+        )
+        create_resource_collection(client)
+
+        with quiet():
+            result["ingest"] = ingest_csv(
+                client, model, csv_path,
+                chunk_size=options["chunk_size"],
+                batch_size=options["batch_size"]
+            )
+        result["peak_rss_mb_after_ingest"] = peak_rss_mb()
+
+        # Without the caches every query pays for encoding and Qdrant, as on a cold process
+        cache = EmbeddingCache() if options["with_cache"] else EmbeddingCache(max_entries=0)
+        result_cache = ResultCache() if options["with_cache"] else ResultCache(max_entries=0)
+        categories = sorted({r["category"] for r in sample_resources()})
+        queries = [QUERY_POOL[i % len(QUERY_POOL)] for i in range(options["queries"])]
+
+        with quiet():
+            nav = CommunityNavigator(client=client, model=model, embedding_cache=cache,
+                                     result_cache=result_cache)
+            nav.search_resources(queries[0])  # warm up model and client
+
+            result["search"] = latency_summary(time_calls(
+                nav.search_resources,
+                [(q, None, options["top_k"]) for q in queries]
+            ))
+            result["search_category_filter"] = latency_summary(time_calls(
+                nav.search_resources,
+                [(q, categories[i % len(categories)], options["top_k"]) for i, q in enumerate(queries)]
+            ))
+            result["recommendations"] = latency_summary(time_calls(
+                nav.get_recommendations,
+                [(options["top_k"],) for _ in queries]
+            ))
+
+        result["peak_rss_mb"] = peak_rss_mb()
+        client.close()
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingest and search on synthetic corpora")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--queries", type=int, default=200, help="Timed calls per measurement")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--encoder", default="torch",
+                        help="torch, onnx, int8, or hash (model-free)")
+    parser.add_argument("--url", default=None, help="Benchmark against a Qdrant server")
+    parser.add_argument("--on-disk", action="store_true",
+                        help="Use embedded on-disk storage instead of :memory:")
+    parser.add_argument("--with-cache", action="store_true",
+                        help="Keep the query embedding and result caches enabled")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    options = {
+        "encoder": args.encoder,
+        "url": args.url,
+        "on_disk": args.on_disk,
+        "with_cache": args.with_cache,
+        "queries": args.queries,
+        "top_k": args.top_k,
+        "chunk_size": args.chunk_size,
+        "batch_size": args.batch_size,
+        "seed": args.seed,
+    }
+
+    results = {"meta": run_metadata(benchmark="suite", **options), "results": []}
+
+    # A fresh process per size keeps peak RSS and import state independent
+    context = multiprocessing.get_context("spawn")
+    for n_rows in args.sizes:
+        print(f"⏱️  Benchmarking {n_rows} rows...", flush=True)
+        with context.Pool(1) as pool:
+            results["results"].append(pool.apply(run_size, (n_rows, options)))
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Synthetic community-resource corpora for benchmarking
+
+Rows follow the schema and categories of setup_qdrant.sample_resources():
+each synthetic resource is a sample resource re-branded for a generated
+neighbourhood, with a new address, phone number and a shuffled subset of
+services. Generation is streamed and seeded, so a 1M-row CSV never sits in
+memory and every run produces the same file.
+
+    python -m benchmarks.synthetic --rows 100000 --output data/synthetic_100k.csv
+"""
+
+import argparse
+import csv
+import hashlib
+import random
+import re
+
+from setup_qdrant import PAYLOAD_FIELDS, VECTOR_SIZE, sample_resources
+
+AREA_PREFIXES = [
+    "North", "South", "East", "West", "Upper", "Lower", "Old", "New",
+    "Central", "Lake", "River", "Hill", "Park", "Harbor", "Valley", "Bay"
+]
+AREA_NAMES = [
+    "Side", "District", "Heights", "Commons", "Village", "Point", "Gardens",
+    "Crossing", "Terrace", "Junction", "Square", "Meadows", "Ridge", "Landing"
+]
+STREET_NAMES = [
+    "Main St", "Oak Ave", "Elm St", "Maple Dr", "Cedar Ln", "Pine St", "Market St",
+    "Church St", "School Rd", "Park Ave", "Lincoln Blvd", "Washington St", "Mill Rd"
+]
+
+# Queries spread over every sample category, for latency measurements
+QUERY_POOL = [
+    "I lost my job and need help feeding my family",
+    "free food pantry open on weekends",
+    "hot meals for homeless",
+    "free medical checkup without insurance",
+    "low cost dentist",
+    "mental health counseling",
+    "crisis hotline suicide prevention",
+    "help with prescriptions I can't afford",
+    "my landlord is trying to evict me",
+    "immigration lawyer free consultation",
+    "get my GED and learn English",
+    "after school tutoring for kids",
+    "affordable childcare for working parents",
+    "emergency shelter tonight",
+    "domestic violence safe housing",
+    "resume help and job interview practice",
+    "help paying my electric bill",
+    "free tax filing EITC",
+    "budgeting and credit repair classes",
+    "bus pass for medical appointments",
+    "veterans PTSD counseling",
+    "disability equipment and benefits",
+    "addiction recovery support group",
+    "senior exercise classes and lunch",
+]
+
+
+def generate_rows(n_rows, seed=0):
+    """Yield n_rows synthetic resources as dicts with the PAYLOAD_FIELDS keys"""
+    rng = random.Random(seed)
+    templates = sample_resources()
+
+    for i in range(n_rows):
+        template = templates[i % len(templates)]
+        area = f"{rng.choice(AREA_PREFIXES)} {rng.choice(AREA_NAMES)}"
+        services = [s.strip() for s in template["services"].split(",")]
+        rng.shuffle(services)
+
+        yield {
+            "name": f"{area} {template['name']} #{i}",
+            "category": template["category"],
+            "description": f"{template['description']} Serving residents of {area}.",
+            "location": f"{rng.randint(1, 9999)} {rng.choice(STREET_NAMES)}, {area}",
+            "contact": f"555-{rng.randint(0, 9999):04d}",
+            "hours": rng.choice(templates)["hours"],
+            "services": ", ".join(services[:rng.randint(1, len(services))])
+        }
+
+
+def write_corpus_csv(csv_path, n_rows, seed=0):
+    """Stream a synthetic corpus to CSV and return the number of rows written"""
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=PAYLOAD_FIELDS)
+        writer.writeheader()
+        for row in generate_rows(n_rows, seed):
+            writer.writerow(row)
+    return n_rows
+
+
+class HashingEncoder:
+    """
+    Model-free stand-in encoder for benchmarking the pipeline around the model
+
+    Tokens are hashed into signed buckets of a VECTOR_SIZE vector and the
+    result is L2-normalized. Texts sharing words get similar vectors, which
+    is enough to exercise Qdrant realistically at 1M rows without spending
+    hours in the transformer.
+    """
+
+    backend = "hash"
+
+    def __init__(self, dimension=VECTOR_SIZE):
+        self.dimension = dimension
+
+    def encode(self, sentences, batch_size=32, **kwargs):
+        import numpy as np
+
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in re.findall(r"\w+", text.lower()):
+                digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dimension
+                vectors[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.clip(norms, 1e-12, None)
+        return vectors[0] if single else vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic resources CSV")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_corpus_csv(args.output, args.rows, args.seed)
+    print(f"✅ Wrote {args.rows} synthetic resources to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
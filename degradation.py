@@ -0,0 +1,165 @@
+"""
+Deadline-aware degradation for navigator requests
+
+A request given ``deadline_ms`` is planned against the navigator's moving
+average of each stage's latency (metrics.EwmaSink). When the full request
+would not fit, it steps down one level at a time:
+
+    full           every stage, as configured
+    reduced_ef     HNSW searched with a small candidate list (DEGRADED_HNSW_EF)
+    skip_optional  also skip optional stages: BM25 fusion for hybrid search,
+                   re-encoding past queries for recommendations
+    fallback       no model or Qdrant call: the most popular recent results
+
+The plan is only an estimate, so the Qdrant query itself is also bounded:
+one still running when the deadline passes is abandoned and the request
+answers at the fallback level. The abandoned query still reports its full
+duration to the estimates once it finishes, and at most
+MAX_DEADLINE_QUERIES run at once; beyond that requests are shed to the
+fallback level instead of piling up behind late queries.
+
+Results are returned as SearchResults, a list that reports the level used:
+
+    results = nav.search_resources("free clinic", deadline_ms=50)
+    results.degradation   # "full", "reduced_ef", "skip_optional" or "fallback"
+
+Only full-quality results are stored in the result cache.
+"""
+
+import threading
+import time
+
+FULL = "full"
+REDUCED_EF = "reduced_ef"
+SKIP_OPTIONAL = "skip_optional"
+FALLBACK = "fallback"
+DEGRADATION_LEVELS = (FULL, REDUCED_EF, SKIP_OPTIONAL, FALLBACK)
+
+# HNSW candidate list used once the budget is tight
+DEGRADED_HNSW_EF = 16
+# Assumed cost of a reduced-ef query relative to a full one
+REDUCED_QUERY_FACTOR = 0.5
+# Deadline-bound Qdrant calls in flight (abandoned ones included) before shedding
+MAX_DEADLINE_QUERIES = 16
+
+
+def worst(*levels):
+    """The most degraded of several levels"""
+    return max(levels, key=DEGRADATION_LEVELS.index)
+
+
+class SearchResults(list):
+    """List of results that also reports the degradation level used"""
+
+    def __init__(self, results=(), degradation=FULL):
+        super().__init__(results)
+        self.degradation = degradation
+
+
+class Deadline:
+    """Time budget of one request"""
+
+    def __init__(self, deadline_ms=None):
+        """
+        Args:
+            deadline_ms: Milliseconds from now, or None for no deadline
+        """
+        self.expires_at = None if deadline_ms is None else time.perf_counter() + deadline_ms / 1000.0
+
+    def remaining(self):
+        """Seconds left (infinite without a deadline, negative once passed)"""
+        if self.expires_at is None:
+            return float("inf")
+        return self.expires_at - time.perf_counter()
+
+    def remaining_ms(self):
+        """Milliseconds left, or None without a deadline"""
+        return None if self.expires_at is None else max(0.0, self.remaining() * 1000)
+
+    def allows(self, seconds):
+        """True if ``seconds`` of work still fits in the budget"""
+        return self.remaining() >= seconds
+
+
+def plan_level(deadline, estimate, optional_stages=()):
+    """
+    Best level whose estimated cost fits the remaining budget
+
+    Args:
+        deadline: Deadline of the request
+        estimate: Callable returning the expected seconds of a stage
+        optional_stages: Stages dropped from skip_optional onwards
+
+    Returns:
+        One of DEGRADATION_LEVELS
+    """
+    if deadline.expires_at is None:
+        return FULL
+
+    required = estimate("encode") + estimate("filter_build")
+    query = estimate("qdrant_query")
+    optional = sum(estimate(stage) for stage in optional_stages)
+
+    if deadline.allows(required + query + optional):
+        return FULL
+    if deadline.allows(required + query * REDUCED_QUERY_FACTOR + optional):
+        return REDUCED_EF
+    if deadline.allows(required + query * REDUCED_QUERY_FACTOR):
+        return SKIP_OPTIONAL
+    return FALLBACK
+
+
+class PopularResults:
+    """
+    Tally of resources returned by full-quality searches
+
+    Serves the fallback level: the resources most often returned recently,
+    still subject to the request's filter and the user's seen set.
+    """
+
+    def __init__(self, max_resources=1000):
+        """
+        Args:
+            max_resources: Resources tracked before the least returned half is dropped
+        """
+        self.max_resources = max_resources
+        self._counts = {}
+        self._points = {}
+        self._lock = threading.Lock()
+
+    def record(self, results):
+        """Count the resources of one result list"""
+        with self._lock:
+            for point in results:
+                key = str(point.id)
+                self._counts[key] = self._counts.get(key, 0) + 1
+                self._points[key] = point
+
+            if len(self._counts) > self.max_resources:
+                keep = sorted(self._counts, key=self._counts.get, reverse=True)[:self.max_resources // 2]
+                self._counts = {key: self._counts[key] for key in keep}
+                self._points = {key: self._points[key] for key in keep}
+
+    def top(self, top_k, resource_filter=None, exclude_ids=()):
+        """
+        Most returned resources
+
+        Args:
+            top_k: Number of results
+            resource_filter: Optional ResourceFilter the payloads must match
+            exclude_ids: Point IDs to leave out (e.g. already seen)
+        """
+        with self._lock:
+            ranked = sorted(self._counts, key=self._counts.get, reverse=True)
+            points = [self._points[key] for key in ranked]
+
+        results = []
+        for point in points:
+            if len(results) == top_k:
+                break
+            if str(point.id) in exclude_ids:
+                continue
+            if resource_filter is not None and not resource_filter.matches(point.payload):
+                continue
+            results.append(point)
+        return results
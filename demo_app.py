@@ -9,6 +9,7 @@ This demo showcases:
 4. Multimodal Data - Text + Structured information
 """
 
+import logging
 import sys
 from setup_qdrant import setup_qdrant
 from navigator import CommunityNavigator
@@ -177,6 +178,10 @@ communities, languages, and service types.
     print("="*70 + "\n")
 
 if __name__ == "__main__":
+    # Show the navigator's per-search progress alongside the demo output
+    logging.basicConfig(stream=sys.stdout, level=logging.INFO, format="%(message)s")
+    logging.getLogger("navigator").setLevel(logging.DEBUG)
+    
     try:
         run_demo()
     except KeyboardInterrupt:
@@ -0,0 +1,256 @@
+"""
+Query embedding cache for the Community Navigator
+
+Most traffic is a few hundred near-identical queries ("food bank near me",
+"free clinic"), so caching their vectors skips the transformer pass for
+the bulk of requests. Keys are normalized query text; entries are evicted
+least-recently-used first once either the entry cap or the byte cap is
+reached, and expire after a TTL.
+
+DiskEmbeddingCache keeps document embeddings across ingests instead, in a
+SQLite file keyed by a hash of the text, so a re-sync only runs the model
+on resources whose embedded text changed. CachedEncoder puts it in front of
+a model.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_query(text):
+    """Normalize query text into a cache key (case and whitespace insensitive)"""
+    return " ".join(text.lower().split())
+
+
+def _vector_nbytes(vector):
+    """Approximate memory held by a cached vector"""
+    nbytes = getattr(vector, "nbytes", None)
+    if nbytes is None:
+        # Plain Python list of floats
+        nbytes = len(vector) * 8
+    return nbytes
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU/TTL cache of query embeddings
+
+    Thread-safe, so one cache can be shared by every request a process
+    serves.
+    """
+
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024, ttl_seconds=3600):
+        """
+        Args:
+            max_entries: Maximum number of cached queries (0 disables caching)
+            max_bytes: Maximum approximate size of keys plus vectors
+            ttl_seconds: Seconds before an entry expires (None for no expiry)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, text):
+        """Return the cached vector for a query, or None on a miss"""
+        key = normalize_query(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            vector, expires_at, _ = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, text, vector):
+        """Cache the vector for a query, evicting old entries as needed"""
+        if self.max_entries <= 0:
+            return
+
+        key = normalize_query(text)
+        size = _vector_nbytes(vector) + len(key)
+        if size > self.max_bytes:
+            return
+
+        # Cached vectors are shared between callers, so make them read-only
+        if hasattr(vector, "setflags"):
+            vector.setflags(write=False)
+
+        expires_at = None
+        if self.ttl_seconds is not None:
+            expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (vector, expires_at, size)
+            self.current_bytes += size
+
+            while (len(self._entries) > self.max_entries
+                   or self.current_bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def _remove(self, key):
+        """Remove an entry; caller must hold the lock"""
+        _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+
+def text_hash(text):
+    """Stable hex digest of a text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DiskEmbeddingCache:
+    """
+    Persistent embedding cache in a SQLite file
+
+    Entries are keyed by the hash of the text within a namespace (the model
+    and backend that produced them), so vectors from another model are
+    never served. Entries are never evicted; delete the file to reset it.
+    """
+
+    def __init__(self, path, namespace=""):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            namespace: Identity of the encoder, e.g. "all-MiniLM-L6-v2:torch"
+        """
+        self.path = path
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _key(self, text):
+        return text_hash(f"{self.namespace}\0{text}")
+
+    def get_many(self, texts):
+        """Cached float32 vectors for texts, None for each miss"""
+        import numpy as np
+
+        keys = [self._key(text) for text in texts]
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                found.update(self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall())
+            vectors = [
+                np.frombuffer(found[key], dtype=np.float32) if key in found else None
+                for key in keys
+            ]
+            hits = len(found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return vectors
+
+    def put_many(self, texts, vectors):
+        """Store the vectors of texts"""
+        import numpy as np
+
+        rows = [
+            (self._key(text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEncoder:
+    """
+    Model wrapper that serves encode() from a DiskEmbeddingCache
+
+    Only texts missing from the cache reach the model, in a single call.
+    """
+
+    def __init__(self, model, cache):
+        """
+        Args:
+            model: Embedding model exposing ``encode(list_of_texts)``
+            cache: DiskEmbeddingCache shared with earlier runs
+        """
+        self.model = model
+        self.cache = cache
+
+    def encode(self, sentences, batch_size=32, **kwargs):
+        """Same contract as the wrapped model's encode"""
+        import numpy as np
+
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        vectors = self.cache.get_many(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            encoded = self.model.encode([texts[i] for i in missing], batch_size=batch_size, **kwargs)
+            self.cache.put_many([texts[i] for i in missing], encoded)
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+
+        if single:
+            return vectors[0]
+        if not vectors:
+            return np.zeros((0, getattr(self.model, "dimension", 0)), dtype=np.float32)
+        return np.stack(vectors)
@@ -0,0 +1,319 @@
+"""
+Pluggable embedding backends for the Community Navigator
+
+Every backend wraps the same sentence-transformers model and honours the
+same contract: ``encode`` returns float32 vectors of VECTOR_SIZE dimensions
+(one vector for a string, a 2-D array for a list), mean-pooled and
+L2-normalized, so collections built with one backend can be queried with
+another.
+
+Backends:
+
+- torch: the SentenceTransformer PyTorch model (default)
+- onnx: the same transformer exported to ONNX and run with ONNX Runtime
+  (needs ``pip install onnxruntime``)
+- int8: the PyTorch model with Linear layers dynamically quantized to int8
+
+The backend is chosen with ``create_encoder(backend=...)`` or the
+NAVIGATOR_ENCODER environment variable. Check ranking parity between
+backends with:
+
+    python encoders.py --parity onnx int8
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from setup_qdrant import MODEL_NAME, VECTOR_SIZE
+
+ENCODER_ENV_VAR = "NAVIGATOR_ENCODER"
+DEFAULT_BACKEND = "torch"
+ONNX_CACHE_DIR = os.path.join("models", "onnx")
+
+
+class Encoder:
+    """Base class: batching and the single/list calling convention"""
+
+    backend = None
+
+    def __init__(self, model_name=MODEL_NAME):
+        self.model_name = model_name
+        self.dimension = VECTOR_SIZE
+
+    def encode(self, sentences, batch_size=32, **kwargs):
+        """
+        Embed one text or a list of texts
+
+        Keyword arguments accepted by SentenceTransformer.encode but not
+        meaningful here (e.g. ``show_progress_bar``) are ignored.
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        vectors = self._encode_texts(texts, batch_size)
+        return vectors[0] if single else vectors
+
+    def _encode_texts(self, texts, batch_size):
+        """Return a (len(texts), dimension) float32 array"""
+        raise NotImplementedError
+
+
+class TorchEncoder(Encoder):
+    """The PyTorch SentenceTransformer model"""
+
+    backend = "torch"
+
+    def __init__(self, model_name=MODEL_NAME):
+        super().__init__(model_name)
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+
+    def _encode_texts(self, texts, batch_size):
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ).astype(np.float32, copy=False)
+
+
+class Int8Encoder(TorchEncoder):
+    """PyTorch model with Linear layers dynamically quantized to int8"""
+
+    backend = "int8"
+
+    def __init__(self, model_name=MODEL_NAME):
+        super().__init__(model_name)
+        import torch
+
+        # Weights are quantized once; activations are quantized per batch
+        torch.quantization.quantize_dynamic(
+            self.model,
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+            inplace=True
+        )
+
+
+class OnnxEncoder(Encoder):
+    """
+    Transformer exported to ONNX and run with ONNX Runtime
+
+    Pooling and normalization mirror the sentence-transformers pipeline of
+    all-MiniLM-L6-v2 (mean pooling over the attention mask, then L2 norm).
+    The ONNX graph is exported on first use and cached under ONNX_CACHE_DIR.
+    """
+
+    backend = "onnx"
+
+    def __init__(self, model_name=MODEL_NAME, onnx_path=None, max_length=256, providers=None):
+        """
+        Args:
+            model_name: sentence-transformers model name
+            onnx_path: Exported graph (exported here on first use if missing)
+            max_length: Token limit, matching the model's max_seq_length
+            providers: ONNX Runtime execution providers
+        """
+        super().__init__(model_name)
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        self.hf_name = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(self.hf_name)
+
+        self.onnx_path = onnx_path or os.path.join(ONNX_CACHE_DIR, f"{model_name.replace('/', '_')}.onnx")
+        if not os.path.exists(self.onnx_path):
+            export_onnx(self.hf_name, self.onnx_path)
+
+        self.session = onnxruntime.InferenceSession(
+            self.onnx_path,
+            providers=providers or ["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _encode_texts(self, texts, batch_size):
+        batches = []
+        for i in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(
+                texts[i:i + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            feeds = {
+                name: array.astype(np.int64)
+                for name, array in tokens.items()
+                if name in self.input_names
+            }
+            hidden = self.session.run(None, feeds)[0]
+
+            mask = tokens["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+
+        return np.vstack(batches)
+
+
+def export_onnx(hf_name, onnx_path, opset_version=14):
+    """Export a Hugging Face transformer to ONNX with dynamic batch and sequence axes"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    print(f"📦 Exporting {hf_name} to ONNX at {onnx_path}...")
+    os.makedirs(os.path.dirname(onnx_path) or '.', exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(hf_name)
+    model = AutoModel.from_pretrained(hf_name)
+    model.eval()
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            onnx_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset_version
+        )
+
+
+ENCODER_BACKENDS = {
+    "torch": TorchEncoder,
+    "onnx": OnnxEncoder,
+    "int8": Int8Encoder,
+}
+
+
+def check_output_contract(encoder):
+    """
+    Verify an encoder returns finite float32 vectors of VECTOR_SIZE dimensions
+
+    Raises:
+        ValueError: if the single or batched output has the wrong shape
+    """
+    single = np.asarray(encoder.encode("contract check"))
+    batch = np.asarray(encoder.encode(["contract check", "another sentence"]))
+
+    if single.shape != (VECTOR_SIZE,) or batch.shape != (2, VECTOR_SIZE):
+        raise ValueError(
+            f"Encoder '{encoder.backend}' returned shapes {single.shape} and {batch.shape}, "
+            f"expected ({VECTOR_SIZE},) and (2, {VECTOR_SIZE})"
+        )
+    if not np.all(np.isfinite(batch)):
+        raise ValueError(f"Encoder '{encoder.backend}' returned non-finite values")
+
+
+def create_encoder(backend=None, model_name=MODEL_NAME, **options):
+    """
+    Create and validate an encoder
+
+    Args:
+        backend: "torch", "onnx" or "int8" (default: NAVIGATOR_ENCODER or torch)
+        model_name: sentence-transformers model name
+        **options: Backend-specific options (e.g. onnx_path)
+    """
+    backend = backend or os.environ.get(ENCODER_ENV_VAR, DEFAULT_BACKEND)
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(
+            f"Unknown encoder backend '{backend}', choose from {', '.join(ENCODER_BACKENDS)}"
+        )
+
+    encoder = ENCODER_BACKENDS[backend](model_name, **options)
+    check_output_contract(encoder)
+    return encoder
+
+
+def check_ranking_parity(reference, candidate, queries, documents, top_k=5):
+    """
+    Compare the document rankings two encoders produce for the same queries
+
+    Returns:
+        Dict with top-1 agreement, mean/min top-k overlap and the largest
+        cosine difference between the two encoders' document vectors
+    """
+    ref_docs = np.asarray(reference.encode(documents))
+    cand_docs = np.asarray(candidate.encode(documents))
+    ref_queries = np.asarray(reference.encode(queries))
+    cand_queries = np.asarray(candidate.encode(queries))
+
+    ref_rank = np.argsort(-(ref_queries @ ref_docs.T), axis=1)[:, :top_k]
+    cand_rank = np.argsort(-(cand_queries @ cand_docs.T), axis=1)[:, :top_k]
+
+    overlaps = [
+        len(set(ref_row) & set(cand_row)) / top_k
+        for ref_row, cand_row in zip(ref_rank, cand_rank)
+    ]
+    vector_cosines = np.sum(ref_docs * cand_docs, axis=1) / (
+        np.linalg.norm(ref_docs, axis=1) * np.linalg.norm(cand_docs, axis=1)
+    )
+
+    return {
+        "reference": reference.backend,
+        "candidate": candidate.backend,
+        "queries": len(queries),
+        "top1_agreement": float(np.mean(ref_rank[:, 0] == cand_rank[:, 0])),
+        "mean_overlap_at_k": float(np.mean(overlaps)),
+        "min_overlap_at_k": float(np.min(overlaps)),
+        "max_cosine_drift": float(1.0 - np.min(vector_cosines))
+    }
+
+
+PARITY_QUERIES = [
+    "I lost my job and need help feeding my family",
+    "Free medical checkup without insurance",
+    "My landlord is trying to evict me unfairly",
+    "Want to get my GED and learn English",
+    "Struggling with depression and anxiety",
+    "help paying my electric bill",
+    "dentist for low income",
+    "childcare while I work",
+    "help with taxes EITC",
+    "bus pass for doctor appointment",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check encoder backends against the torch reference")
+    parser.add_argument("--parity", nargs="+", default=["onnx", "int8"], metavar="BACKEND",
+                        help="Backends to compare with the torch reference")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--min-overlap", type=float, default=0.8,
+                        help="Fail if mean top-k overlap drops below this")
+    args = parser.parse_args()
+
+    from setup_qdrant import resource_text, sample_resources
+
+    documents = [resource_text(row) for row in sample_resources()]
+    reference = create_encoder("torch")
+
+    failed = False
+    for backend in args.parity:
+        report = check_ranking_parity(
+            reference, create_encoder(backend), PARITY_QUERIES, documents, top_k=args.top_k
+        )
+        ok = report["mean_overlap_at_k"] >= args.min_overlap
+        failed = failed or not ok
+        print(f"{'✅' if ok else '❌'} {backend}: top-1 agreement {report['top1_agreement']:.2f}, "
+              f"overlap@{args.top_k} {report['mean_overlap_at_k']:.2f} "
+              f"(min {report['min_overlap_at_k']:.2f}), "
+              f"max cosine drift {report['max_cosine_drift']:.4f}")
+
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
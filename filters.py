@@ -0,0 +1,268 @@
+"""
+Multi-criteria resource filters for the Community Navigator
+
+A ResourceFilter combines any number of categories, services, districts and
+regions to require or exclude. Each field maps to a keyword payload index created
+by setup_qdrant.create_payload_indexes, so Qdrant resolves the filter from
+the index instead of scanning payloads:
+
+    ResourceFilter(
+        categories=["Healthcare", "Mental Health"],
+        services=["Vaccinations"],
+        exclude_districts=["Downtown"]
+    )
+
+Values within a field are OR-ed (any listed category matches); fields are
+AND-ed together; any excluded value removes a resource.
+
+``open_at`` keeps only resources open at a given time. It matches the
+integer ``open_slots`` and ``open_months`` payload indexes written from the
+parsed opening hours (see hours.py), so it is also resolved inside Qdrant:
+
+    ResourceFilter(categories=["Crisis Support"], open_at="now")
+
+``near``/``radius_km`` and ``bounding_box`` restrict results to an area
+through the geo payload index (see geo.py); ``decay_km`` does not filter
+but has the navigator blend proximity to ``near`` into the scores:
+
+    ResourceFilter(near=(41.881, -87.627), radius_km=3, decay_km=1.5)
+"""
+
+from datetime import datetime
+
+from geo import GEO_FIELD, check_geo_filtering, distance_km, in_bounding_box
+
+# Filter field -> payload key it matches against
+FILTER_FIELDS = {
+    "categories": "category",
+    "services": "service_tags",
+    "districts": "district",
+    "regions": "region",
+}
+
+
+def _as_list(values):
+    """Accept a single value or an iterable of values"""
+    if values is None:
+        return []
+    if isinstance(values, str):
+        return [values]
+    return list(values)
+
+
+def parse_open_at(value):
+    """
+    Accept None, a datetime, an ISO 8601 string, or "now"/True for the current time
+
+    Returns:
+        datetime in the resources' local time (see hours.resource_timezone)
+    """
+    from hours import resource_timezone, to_resource_time
+
+    if value is None or value is False:
+        return None
+    if value is True or value == "now":
+        return datetime.now(resource_timezone())
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return to_resource_time(value)
+
+
+def _as_floats(values):
+    """Accept None or a sequence of numbers (e.g. a JSON list) as a tuple of floats"""
+    if values is None:
+        return None
+    return tuple(float(value) for value in values)
+
+
+class ResourceFilter:
+    """Required and excluded categories, services, districts and regions, opening time and area"""
+
+    def __init__(self, categories=None, services=None, districts=None,
+                 exclude_categories=None, exclude_services=None, exclude_districts=None,
+                 regions=None, exclude_regions=None, open_at=None,
+                 near=None, radius_km=None, bounding_box=None, decay_km=None):
+        """
+        Args:
+            categories: Resource must be in one of these categories
+            services: Resource must offer at least one of these services
+            districts: Resource must be in one of these districts
+            exclude_categories: Drop resources in any of these categories
+            exclude_services: Drop resources offering any of these services
+            exclude_districts: Drop resources in any of these districts
+            regions: Resource must be in one of these regions; a navigator
+                with regional collections only searches their collections
+            exclude_regions: Drop resources in any of these regions
+            open_at: Resource must be open at this datetime, ISO 8601 string,
+                or "now"; times without an offset are the resources' local time
+            near: (lat, lon) the radius and distance decay are measured from
+            radius_km: Resource must lie within this distance of near
+            bounding_box: Resource must lie in (min_lat, min_lon, max_lat, max_lon)
+            decay_km: Rank nearer resources higher, with this decay length;
+                does not filter
+        """
+        self.include = {
+            "categories": _as_list(categories),
+            "services": _as_list(services),
+            "districts": _as_list(districts),
+            "regions": _as_list(regions),
+        }
+        self.exclude = {
+            "categories": _as_list(exclude_categories),
+            "services": _as_list(exclude_services),
+            "districts": _as_list(exclude_districts),
+            "regions": _as_list(exclude_regions),
+        }
+        self.open_at = parse_open_at(open_at)
+        self.near = _as_floats(near)
+        self.radius_km = None if radius_km is None else float(radius_km)
+        self.bounding_box = _as_floats(bounding_box)
+        self.decay_km = None if decay_km is None else float(decay_km)
+
+        if self.near is None and (self.radius_km is not None or self.decay_km is not None):
+            raise ValueError("radius_km and decay_km need a near=(lat, lon) point")
+        if self.near is not None and len(self.near) != 2:
+            raise ValueError("near must be (lat, lon)")
+        if self.bounding_box is not None and len(self.bounding_box) != 4:
+            raise ValueError("bounding_box must be (min_lat, min_lon, max_lat, max_lon)")
+
+    @classmethod
+    def coerce(cls, value):
+        """
+        Normalize the filter forms accepted by the navigator
+
+        Args:
+            value: None, a category name, a list of category names, a dict
+                of ResourceFilter keyword arguments, or a ResourceFilter
+
+        Returns:
+            ResourceFilter, or None when nothing is filtered
+        """
+        if value is None or isinstance(value, cls):
+            resource_filter = value
+        elif isinstance(value, dict):
+            resource_filter = cls(**value)
+        else:
+            resource_filter = cls(categories=value)
+
+        if resource_filter is None or resource_filter.is_empty():
+            return None
+        return resource_filter
+
+    def is_empty(self):
+        """True if the filter matches every resource"""
+        return (not any(self.include.values()) and not any(self.exclude.values())
+                and self.open_at is None and not self._geo_arguments())
+
+    def to_dict(self):
+        """Non-empty fields as ResourceFilter keyword arguments (JSON-friendly)"""
+        data = {field: values for field, values in self.include.items() if values}
+        data.update({f"exclude_{field}": values for field, values in self.exclude.items() if values})
+        if self.open_at is not None:
+            data["open_at"] = self.open_at.isoformat()
+        data.update({name: list(value) if isinstance(value, tuple) else value
+                     for name, value in self._geo_arguments().items()})
+        return data
+
+    def without_geo(self):
+        """The same filter minus its area and distance conditions"""
+        arguments = self.to_dict()
+        for name in self._geo_arguments():
+            arguments.pop(name)
+        return ResourceFilter(**arguments)
+
+    def _geo_arguments(self):
+        """Geo keyword arguments that are set"""
+        arguments = {
+            "near": self.near,
+            "radius_km": self.radius_km,
+            "bounding_box": self.bounding_box,
+            "decay_km": self.decay_km,
+        }
+        return {name: value for name, value in arguments.items() if value is not None}
+
+    def open_slot(self):
+        """(weekly slot, month) that open_at falls in, or None"""
+        from hours import slot_of
+
+        if self.open_at is None:
+            return None
+        return slot_of(self.open_at), self.open_at.month
+
+    def cache_key(self):
+        """Hashable, order-insensitive identity of the filter"""
+        data = self.to_dict()
+        for name in ("open_at", *self._geo_arguments()):
+            data.pop(name, None)
+        key = tuple(sorted((field, tuple(sorted(values))) for field, values in data.items()))
+        # Every time within one 15-minute slot filters identically
+        if self.open_at is not None:
+            key += (("open_at", self.open_slot()),)
+        return key + tuple(sorted(self._geo_arguments().items()))
+
+    def matches(self, payload):
+        """Evaluate the filter against a payload locally, as Qdrant would"""
+        for field, key in FILTER_FIELDS.items():
+            value = payload.get(key)
+            if value is None:
+                present = set()
+            elif isinstance(value, list):
+                present = set(value)
+            else:
+                present = {value}
+
+            if self.include[field] and not present.intersection(self.include[field]):
+                return False
+            if present.intersection(self.exclude[field]):
+                return False
+
+        if self.open_at is not None:
+            slot, month = self.open_slot()
+            if slot not in payload.get("open_slots", ()) or month not in payload.get("open_months", ()):
+                return False
+
+        if self.radius_km is not None:
+            distance = distance_km(payload, self.near)
+            if distance is None or distance > self.radius_km:
+                return False
+        if self.bounding_box is not None and not in_bounding_box(payload, self.bounding_box):
+            return False
+        return True
+
+    def to_qdrant(self):
+        """Build the equivalent qdrant_client Filter"""
+        from qdrant_client.models import (FieldCondition, Filter, GeoBoundingBox, GeoPoint, GeoRadius, MatchAny,
+                                          MatchValue)
+
+        def condition(field, values):
+            key = FILTER_FIELDS[field]
+            if len(values) == 1:
+                return FieldCondition(key=key, match=MatchValue(value=values[0]))
+            return FieldCondition(key=key, match=MatchAny(any=values))
+
+        must = [condition(field, values) for field, values in self.include.items() if values]
+        must_not = [condition(field, values) for field, values in self.exclude.items() if values]
+
+        if self.open_at is not None:
+            slot, month = self.open_slot()
+            must.append(FieldCondition(key="open_slots", match=MatchValue(value=slot)))
+            must.append(FieldCondition(key="open_months", match=MatchValue(value=month)))
+
+        if self.radius_km is not None or self.bounding_box is not None:
+            check_geo_filtering()
+        if self.radius_km is not None:
+            center = GeoPoint(lat=self.near[0], lon=self.near[1])
+            radius = GeoRadius(center=center, radius=self.radius_km * 1000)
+            must.append(FieldCondition(key=GEO_FIELD, geo_radius=radius))
+        if self.bounding_box is not None:
+            min_lat, min_lon, max_lat, max_lon = self.bounding_box
+            must.append(FieldCondition(key=GEO_FIELD, geo_bounding_box=GeoBoundingBox(
+                top_left=GeoPoint(lat=max_lat, lon=min_lon),
+                bottom_right=GeoPoint(lat=min_lat, lon=max_lon)
+            )))
+
+        return Filter(must=must or None, must_not=must_not or None)
+
+    def __repr__(self):
+        args = ", ".join(f"{key}={value!r}" for key, value in self.to_dict().items())
+        return f"ResourceFilter({args})"
@@ -0,0 +1,151 @@
+"""
+Offline geocoding and distance helpers for resource locations
+
+Locations are free text ("123 Main St, Downtown", "Various locations (call
+for schedule)"). A local gazetteer CSV (place,lat,lon) resolves them to
+coordinates without any network call: the full street address is tried
+first, then the district after the last comma. Locations it cannot place,
+including "Confidential Location" shelters, get no coordinates and never
+match a radius or bounding-box filter.
+
+build_payload stores the result as the ``geo`` payload ({"lat", "lon"}),
+which setup_qdrant indexes with Qdrant's geo index. ResourceFilter turns
+``near``/``radius_km`` and ``bounding_box`` into geo conditions evaluated
+inside Qdrant, and ``decay_km`` blends proximity into the ranking:
+
+    nav.search_resources("food pantry", category_filter=ResourceFilter(
+        near=(41.881, -87.627), radius_km=3, decay_km=1.5
+    ))
+"""
+
+import csv
+import functools
+import logging
+import math
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+# Next to the code rather than the working directory, so ingest from any directory geocodes
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.csv")
+GEO_FIELD = "geo"
+EARTH_RADIUS_KM = 6371.0088
+# Share of a decayed score that depends on proximity (the rest is semantic)
+DISTANCE_DECAY_WEIGHT = 0.5
+
+
+def normalize_place(text):
+    """Lower-case a place name and drop punctuation and notes in parentheses"""
+    text = re.sub(r"\(.*?\)", " ", text.lower())
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+class Gazetteer:
+    """Place name -> (lat, lon) lookup for resource locations"""
+
+    def __init__(self, places=None):
+        """
+        Args:
+            places: Mapping of place names to (lat, lon)
+        """
+        self.places = {normalize_place(name): (float(lat), float(lon)) for name, (lat, lon) in (places or {}).items()}
+
+    @classmethod
+    def load(cls, path=GAZETTEER_PATH):
+        """Read a place,lat,lon CSV"""
+        with open(path, newline="", encoding="utf-8") as f:
+            return cls({row["place"]: (row["lat"], row["lon"]) for row in csv.DictReader(f)})
+
+    def __len__(self):
+        return len(self.places)
+
+    def resolve(self, location):
+        """
+        Coordinates of a location string
+
+        Returns:
+            (lat, lon) of the street address if listed, else of the
+            district, else None
+        """
+        location = re.sub(r"\(.*?\)", " ", location or "")
+        street, _, district = location.rpartition(",")
+        for candidate in (location, street, district):
+            coordinates = self.places.get(normalize_place(candidate))
+            if coordinates is not None:
+                return coordinates
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def load_gazetteer(path=GAZETTEER_PATH):
+    """Gazetteer at path, loaded once per process (empty if the file is missing)"""
+    if not os.path.exists(path):
+        logger.warning("⚠️ No gazetteer at %s; resources will have no coordinates", path)
+        return Gazetteer()
+    gazetteer = Gazetteer.load(path)
+    if not gazetteer:
+        logger.warning("⚠️ Gazetteer at %s lists no places; resources will have no coordinates", path)
+    return gazetteer
+
+
+@functools.lru_cache(maxsize=None)
+def check_geo_filtering(path=GAZETTEER_PATH):
+    """
+    Warn (once per path) that geo filters are requested without a gazetteer
+
+    Radius and bounding-box conditions only match resources that were
+    geocoded at ingest, so with no gazetteer they silently match nothing.
+
+    Returns:
+        True if the gazetteer at path lists any places
+    """
+    if load_gazetteer(path):
+        return True
+    logger.warning("⚠️ Geo filter requested but no gazetteer at %s; only resources geocoded elsewhere can match", path)
+    return False
+
+
+def geo_payload(location, gazetteer=None):
+    """``geo`` payload value of a location: {"lat", "lon"}, or None if unresolved"""
+    coordinates = (gazetteer or load_gazetteer()).resolve(location)
+    if coordinates is None:
+        return None
+    return {"lat": coordinates[0], "lon": coordinates[1]}
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in kilometres"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def distance_km(payload, center):
+    """Distance from center (lat, lon) to a resource, or None without coordinates"""
+    point = payload.get(GEO_FIELD)
+    if not point:
+        return None
+    return haversine_km(center[0], center[1], point["lat"], point["lon"])
+
+
+def in_bounding_box(payload, bounding_box):
+    """True if a resource lies in (min_lat, min_lon, max_lat, max_lon)"""
+    point = payload.get(GEO_FIELD)
+    if not point:
+        return False
+    min_lat, min_lon, max_lat, max_lon = bounding_box
+    return min_lat <= point["lat"] <= max_lat and min_lon <= point["lon"] <= max_lon
+
+
+def decayed_score(score, payload, center, decay_km, weight=DISTANCE_DECAY_WEIGHT):
+    """
+    Blend a relevance score with exponential distance decay
+
+    The score is scaled rather than summed with a proximity term, so the
+    blend works the same on cosine and fused (RRF) scores. Resources
+    without coordinates keep only the semantic share.
+    """
+    distance = distance_km(payload, center)
+    proximity = 0.0 if distance is None else math.exp(-distance / decay_km)
+    return score * ((1 - weight) + weight * proximity)
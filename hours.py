@@ -0,0 +1,173 @@
+"""
+Opening-hours parsing for "open now" filtering
+
+Resource hours are free text ("Mon-Fri 9AM-5PM", "24/7",
+"Jan-Apr: Mon-Sat 10AM-6PM"). parse_hours turns them into a weekly bitmap
+with one bit per 15-minute slot (672 slots, Monday 00:00 first) plus the
+months the schedule applies to.
+
+Qdrant cannot test bits, so build_payload stores the set slots as the
+integer list ``open_slots`` and the months as ``open_months``, both with
+integer payload indexes. "Open at t" is then two indexed match conditions
+(filters.ResourceFilter(open_at=t)) evaluated inside Qdrant. The bitmap
+itself is kept as ``hours_bitmap`` (168 hex digits) for display and
+offline checks.
+
+Text that cannot be parsed ("Flexible scheduling", "Daily dawn to dusk")
+yields no slots, so such resources never match an open_at filter.
+
+Hours are wall-clock times where the resources are. Set NAVIGATOR_TIMEZONE
+(e.g. "America/Chicago") when that differs from the server's time zone;
+"now" and timestamps with an offset are converted to it before lookup.
+"""
+
+import os
+import re
+from zoneinfo import ZoneInfo
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+ALL_MONTHS = list(range(1, 13))
+TIMEZONE_ENV_VAR = "NAVIGATOR_TIMEZONE"
+
+_DAY = r"(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*"
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*"
+_SEASON_RE = re.compile(rf"^\s*({_MONTH})(?:\s*-\s*({_MONTH}))?\s*:\s*(.*)$")
+_DAYS_RE = re.compile(rf"^\s*(daily|every ?day|weekdays|weekends|(?:weekly\s+)?{_DAY}(?:\s*-\s*{_DAY})*)\b")
+_TIME = r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)|noon|midnight"
+_RANGE_RE = re.compile(rf"({_TIME})\s*(?:-|to)\s*({_TIME})")
+_CLOCK_RE = re.compile(_TIME)
+
+
+def _minutes(text):
+    """Minutes after midnight of "9AM", "5:30pm", "noon" or "midnight" """
+    match = _CLOCK_RE.fullmatch(text.strip())
+    if match.group(0) == "noon":
+        return 12 * 60
+    if match.group(0) == "midnight":
+        return 0
+    hour, minute, meridiem = int(match.group(1)) % 12, int(match.group(2) or 0), match.group(3)
+    return (hour + (12 if meridiem == "pm" else 0)) * 60 + minute
+
+
+def _day_index(name):
+    return DAYS.index(name.strip()[:3])
+
+
+def _parse_days(spec):
+    """Weekday indexes (Monday = 0) of "Mon-Fri", "Mon-Wed-Fri", "Daily", ..."""
+    spec = spec.strip()
+    if spec in ("daily", "everyday", "every day"):
+        return list(range(7))
+    if spec == "weekdays":
+        return list(range(5))
+    if spec == "weekends":
+        return [5, 6]
+
+    names = [name for name in re.split(r"\s*-\s*", spec.replace("weekly", "").strip()) if name]
+    if len(names) == 2:
+        # A range, wrapping past Sunday ("Fri-Mon")
+        start, end = _day_index(names[0]), _day_index(names[1])
+        return [(start + i) % 7 for i in range((end - start) % 7 + 1)]
+    # One day, or a list written with dashes ("Mon-Wed-Fri")
+    return [_day_index(name) for name in names]
+
+
+def _parse_months(start, end):
+    """Month numbers (1-12) of a season such as "Jan-Apr" """
+    first = MONTHS.index(start[:3])
+    last = MONTHS.index(end[:3]) if end else first
+    return [(first + i) % 12 + 1 for i in range((last - first) % 12 + 1)]
+
+
+def parse_hours(text):
+    """
+    Parse free-text opening hours
+
+    Returns:
+        (slots, months): sorted open slot indexes of the week (Monday
+        00:00 = 0, 15 minutes each) and the months (1-12) they apply to;
+        slots is empty when the text cannot be parsed
+    """
+    text = (text or "").strip().lower()
+    if "24/7" in text or "24 hours" in text:
+        return list(range(SLOTS_PER_WEEK)), ALL_MONTHS
+
+    months = ALL_MONTHS
+    season = _SEASON_RE.match(text)
+    if season:
+        months = _parse_months(season.group(1), season.group(2))
+        text = season.group(3)
+
+    slots = set()
+    days = None
+    for segment in text.split(","):
+        day_match = _DAYS_RE.match(segment)
+        if day_match:
+            days = _parse_days(day_match.group(1))
+            segment = segment[day_match.end():]
+
+        range_match = _RANGE_RE.search(segment)
+        if range_match is None:
+            continue
+
+        start = _minutes(range_match.group(1)) // SLOT_MINUTES
+        end = -(-_minutes(range_match.group(5)) // SLOT_MINUTES)
+        if end <= start:
+            # Closes after midnight ("10PM-2AM") or at midnight ("6PM-12AM")
+            end += SLOTS_PER_DAY
+        for day in (days if days is not None else range(7)):
+            for slot in range(start, end):
+                slots.add((day * SLOTS_PER_DAY + slot) % SLOTS_PER_WEEK)
+
+    return sorted(slots), months
+
+
+def resource_timezone():
+    """Time zone of the resources' hours (NAVIGATOR_TIMEZONE), or None for the server's"""
+    name = os.environ.get(TIMEZONE_ENV_VAR)
+    return ZoneInfo(name) if name else None
+
+
+def to_resource_time(moment):
+    """
+    Express a datetime in the resources' local time
+
+    Naive datetimes are taken to be resource-local already; aware ones are
+    converted, so "2025-03-10T15:00Z" means 10:00 in Chicago.
+    """
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(resource_timezone())
+
+
+def slot_of(moment):
+    """Weekly slot index of a datetime (in the resources' local time)"""
+    return moment.weekday() * SLOTS_PER_DAY + (moment.hour * 60 + moment.minute) // SLOT_MINUTES
+
+
+def bitmap_hex(slots):
+    """Weekly bitmap as hex, bit i set when slot i is open"""
+    bits = 0
+    for slot in slots:
+        bits |= 1 << slot
+    return format(bits, f"0{SLOTS_PER_WEEK // 4}x")
+
+
+def is_open(slots, months, moment):
+    """True if a parsed schedule is open at a datetime"""
+    return moment.month in months and slot_of(moment) in set(slots)
+
+
+def hours_payload(text):
+    """Payload fields derived from an hours string (see build_payload)"""
+    slots, months = parse_hours(text)
+    return {
+        "open_slots": slots,
+        "open_months": months,
+        "hours_bitmap": bitmap_hex(slots) if slots else None
+    }
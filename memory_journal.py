@@ -0,0 +1,180 @@
+"""
+Append-only JSONL journal of navigator memory
+
+Exporting memory as one JSON document rewrites the whole history on every
+call. A journal instead appends only what changed since the last flush:
+
+    {"type": "entry", "user_id": "...", "entry": {...}}      one per new search
+    {"type": "profile", "user_id": "...", "profile": {...}}  latest counters
+
+so a flush costs O(new entries), not O(history). Seen resources are
+rebuilt from the entries' ``top_result_id``. Once ``compact_every`` records
+have been appended the journal is rewritten with one profile record (with
+the full seen set) and at most ``max_history`` entries per user.
+
+replay_journal streams the file line by line and keeps only a bounded
+history per user, so importing a long journal never loads it whole.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+
+JOURNAL_SUFFIX = ".jsonl"
+COMPACT_EVERY = 10000
+
+
+def is_journal_path(path):
+    """True for paths that export_memory/import_memory treat as journals"""
+    return str(path).endswith(JOURNAL_SUFFIX)
+
+
+def iter_records(path):
+    """Yield journal records in order, skipping torn or corrupt lines"""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # A crash mid-write can leave a partial last line
+                continue
+
+
+def replay_journal(path, max_history=100):
+    """
+    Rebuild per-user memory from a journal
+
+    Returns:
+        Dict of user_id -> {"history": [...], "profile": dict or None,
+        "seen": set}, keeping the last max_history entries per user
+    """
+    users = {}
+    for record in iter_records(path):
+        state = users.get(record["user_id"])
+        if state is None:
+            state = users[record["user_id"]] = {
+                "history": deque(maxlen=max_history),
+                "profile": None,
+                "seen": set()
+            }
+
+        if record["type"] == "entry":
+            entry = record["entry"]
+            state["history"].append(entry)
+            if entry.get("top_result_id") is not None:
+                state["seen"].add(entry["top_result_id"])
+        elif record["type"] == "profile":
+            state["profile"] = record["profile"]
+            state["seen"].update(record.get("seen", ()))
+
+    for state in users.values():
+        state["history"] = list(state["history"])
+    return users
+
+
+class MemoryJournal:
+    """Incremental, compacting JSONL export of a memory store"""
+
+    def __init__(self, path, max_history=100, compact_every=COMPACT_EVERY, fsync=False):
+        """
+        Args:
+            path: Journal file (created on the first flush)
+            max_history: Entries per user kept by compaction
+            compact_every: Appended records that trigger a compaction
+            fsync: fsync after every flush for crash durability
+        """
+        self.path = path
+        self.max_history = max_history
+        self.compact_every = compact_every
+        self.fsync = fsync
+
+        # search_count per user already covered by the journal
+        self._flushed = {}
+        self._records = 0
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            # Resume an existing journal without re-appending its entries
+            for record in iter_records(path):
+                self._records += 1
+                if record["type"] == "profile":
+                    self._flushed[record["user_id"]] = record["profile"]["search_count"]
+
+    def flush(self, store, user_ids=None):
+        """
+        Append the entries recorded since the last flush
+
+        Args:
+            store: MemoryStore to read from
+            user_ids: Users to flush (default: every user in the store)
+
+        Returns:
+            Number of records appended
+        """
+        with self._lock:
+            lines = []
+            for user_id in (user_ids if user_ids is not None else store.users()):
+                history, profile, _ = store.snapshot(user_id)
+                new = profile["search_count"] - self._flushed.get(user_id, 0)
+                if new <= 0:
+                    continue
+
+                # Entries already compacted out of the store live on in the profile
+                for entry in history[-new:]:
+                    lines.append(json.dumps({"type": "entry", "user_id": user_id, "entry": entry}))
+                lines.append(json.dumps({"type": "profile", "user_id": user_id, "profile": profile}))
+                self._flushed[user_id] = profile["search_count"]
+
+            if lines:
+                self._append(lines)
+                if self._records >= self.compact_every:
+                    self._compact()
+            return len(lines)
+
+    def compact(self):
+        """Rewrite the journal with one profile and the retained history per user"""
+        with self._lock:
+            self._compact()
+
+    def _append(self, lines):
+        """Write records in a single call so a flush is never interleaved"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._records += len(lines)
+
+    def _compact(self):
+        if not os.path.exists(self.path):
+            return
+
+        users = replay_journal(self.path, self.max_history)
+        tmp_path = self.path + ".tmp"
+        records = 0
+        with open(tmp_path, 'w') as f:
+            for user_id, state in users.items():
+                if state["profile"] is None:
+                    continue
+                # Profile first: replay takes counters from the profile and
+                # only appends the entries that follow it
+                f.write(json.dumps({
+                    "type": "profile",
+                    "user_id": user_id,
+                    "profile": state["profile"],
+                    "seen": sorted(state["seen"])
+                }) + "\n")
+                for entry in state["history"]:
+                    f.write(json.dumps({"type": "entry", "user_id": user_id, "entry": entry}) + "\n")
+                records += 1 + len(state["history"])
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Readers see either the old or the new journal, never a partial one
+        os.replace(tmp_path, self.path)
+        self._records = records
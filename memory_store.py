@@ -0,0 +1,433 @@
+"""
+Pluggable per-user memory backends for the Community Navigator
+
+A store keeps, for every user ID, a bounded search history plus a profile
+of aggregate counters. When a user's history exceeds ``max_history`` the
+oldest entries are compacted into the profile's ``archived`` counters, so
+memory per user stays constant however long the user stays active.
+
+Each profile also carries an interest vector, an exponential moving average
+of the user's query embeddings, and the store tracks the resource IDs
+already shown to the user (the ``max_history`` most recent, so this too
+stays bounded). Both are updated on insert, so recommendations never need
+to re-scan or re-encode the history.
+
+Two backends are provided:
+
+- InMemoryStore: ring buffer per user, for a single process
+- SQLiteMemoryStore: durable store, with profiles loaded lazily on first
+  access and a bounded cache of recently active users
+"""
+
+import array
+import copy
+import json
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+
+DEFAULT_USER = "default"
+
+
+def new_profile():
+    """Profile for a user seen for the first time"""
+    return {
+        "frequent_categories": {},
+        "search_count": 0,
+        "first_interaction": datetime.now().isoformat(),
+        "interest_vector": None,
+        "archived": {
+            "count": 0,
+            "categories": {},
+            "first_timestamp": None,
+            "last_timestamp": None
+        }
+    }
+
+
+class MemoryStore:
+    """
+    Base class for memory backends
+
+    Subclasses implement history(), profile() and append(); the profile
+    bookkeeping shared by every backend lives here.
+    """
+
+    def __init__(self, max_history=100, interest_alpha=0.3):
+        """
+        Args:
+            max_history: Entries kept verbatim per user before compaction
+            interest_alpha: Weight of the newest query in the interest vector
+        """
+        self.max_history = max_history
+        self.interest_alpha = interest_alpha
+
+    def history(self, user_id):
+        """Return the user's retained history entries, oldest first"""
+        raise NotImplementedError
+
+    def profile(self, user_id):
+        """Return a copy of the user's profile"""
+        raise NotImplementedError
+
+    def append(self, user_id, entry, query_vector=None):
+        """Record a search entry (and optionally its query embedding) for the user"""
+        raise NotImplementedError
+
+    def users(self):
+        """Return the IDs of every user with stored memory"""
+        raise NotImplementedError
+
+    def interest_vector(self, user_id):
+        """Return the user's interest vector, or None before any embedded query"""
+        raise NotImplementedError
+
+    def seen_resources(self, user_id):
+        """Return the set of resource IDs already shown to the user"""
+        raise NotImplementedError
+
+    def snapshot(self, user_id):
+        """Return a consistent (history, profile, seen) copy for the user"""
+        raise NotImplementedError
+
+    def restore(self, user_id, history, profile, seen=()):
+        """Replace the user's memory, e.g. when importing an export"""
+        raise NotImplementedError
+
+    def _remember_seen(self, seen, resource_id):
+        """
+        Mark a resource as shown in an insertion-ordered dict of IDs
+
+        Returns:
+            The least recently shown ID, dropped once more than max_history
+            are tracked, or None
+        """
+        seen.pop(resource_id, None)
+        seen[resource_id] = None
+        if len(seen) > self.max_history:
+            dropped = next(iter(seen))
+            del seen[dropped]
+            return dropped
+        return None
+
+    def _restored_seen(self, seen):
+        """Imported seen IDs as an ordered dict, trimmed to max_history"""
+        return dict.fromkeys(list(seen)[-self.max_history:] if self.max_history else [])
+
+    def _restored_history(self, history, profile):
+        """Trim an imported history to max_history, archiving the overflow"""
+        history = list(history)
+        overflow = max(0, len(history) - self.max_history)
+        for entry in history[:overflow]:
+            self._archive(profile, entry)
+        return history[overflow:]
+
+    def _apply_entry(self, profile, entry, query_vector=None):
+        """Update profile counters for a new history entry"""
+        profile["search_count"] += 1
+
+        # Track frequent categories
+        category = entry.get("top_category")
+        if category:
+            profile["frequent_categories"][category] = \
+                profile["frequent_categories"].get(category, 0) + 1
+
+        if query_vector is not None:
+            profile["interest_vector"] = self._blend_interest(
+                profile.get("interest_vector"), query_vector
+            )
+
+    def _blend_interest(self, interest, query_vector):
+        """Exponential moving average of query embeddings"""
+        query_vector = [float(x) for x in query_vector]
+        if interest is None:
+            return query_vector
+        alpha = self.interest_alpha
+        return [(1 - alpha) * old + alpha * new for old, new in zip(interest, query_vector)]
+
+    def _archive(self, profile, entry):
+        """Fold an entry dropped from the history into aggregate counters"""
+        archived = profile["archived"]
+        archived["count"] += 1
+
+        category = entry.get("top_category")
+        if category:
+            archived["categories"][category] = archived["categories"].get(category, 0) + 1
+
+        if archived["first_timestamp"] is None:
+            archived["first_timestamp"] = entry["timestamp"]
+        archived["last_timestamp"] = entry["timestamp"]
+
+
+class InMemoryStore(MemoryStore):
+    """Per-user ring buffers held in process memory"""
+
+    def __init__(self, max_history=100, interest_alpha=0.3):
+        super().__init__(max_history, interest_alpha)
+        self._histories = {}
+        self._profiles = {}
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def history(self, user_id):
+        with self._lock:
+            return list(self._histories.get(user_id, ()))
+
+    def profile(self, user_id):
+        with self._lock:
+            return copy.deepcopy(self._load(user_id)[1])
+
+    def append(self, user_id, entry, query_vector=None):
+        with self._lock:
+            history, profile = self._load(user_id)
+            if len(history) == history.maxlen:
+                # The deque is about to drop its oldest entry
+                self._archive(profile, history[0])
+            history.append(entry)
+            self._apply_entry(profile, entry, query_vector)
+
+            if entry.get("top_result_id") is not None:
+                self._remember_seen(self._seen[user_id], entry["top_result_id"])
+
+    def users(self):
+        with self._lock:
+            return list(self._profiles)
+
+    def interest_vector(self, user_id):
+        with self._lock:
+            vector = self._load(user_id)[1]["interest_vector"]
+            return list(vector) if vector is not None else None
+
+    def seen_resources(self, user_id):
+        with self._lock:
+            self._load(user_id)
+            return set(self._seen[user_id])
+
+    def snapshot(self, user_id):
+        with self._lock:
+            history, profile = self._load(user_id)
+            return list(history), copy.deepcopy(profile), set(self._seen[user_id])
+
+    def restore(self, user_id, history, profile, seen=()):
+        profile = copy.deepcopy(profile)
+        history = self._restored_history(history, profile)
+        with self._lock:
+            self._histories[user_id] = deque(history, maxlen=self.max_history)
+            self._profiles[user_id] = profile
+            self._seen[user_id] = self._restored_seen(seen)
+
+    def _load(self, user_id):
+        """Create the user's buffer and profile on first access"""
+        if user_id not in self._profiles:
+            self._histories[user_id] = deque(maxlen=self.max_history)
+            self._profiles[user_id] = new_profile()
+            self._seen[user_id] = {}
+        return self._histories[user_id], self._profiles[user_id]
+
+
+class SQLiteMemoryStore(MemoryStore):
+    """
+    Durable per-user memory in a SQLite database
+
+    Profiles and seen-resource sets are read from disk the first time a
+    user is seen and kept in an LRU cache of ``cache_size`` users; history
+    is read on demand. The interest vector is stored as float32 bytes in its
+    own table, so the profile JSON rewritten on every search stays small.
+    """
+
+    def __init__(self, path="navigator_memory.db", max_history=100, cache_size=1024,
+                 interest_alpha=0.3):
+        """
+        Args:
+            path: SQLite database file
+            max_history: Entries kept verbatim per user before compaction
+            cache_size: Profiles of recently active users kept in memory
+            interest_alpha: Weight of the newest query in the interest vector
+        """
+        super().__init__(max_history, interest_alpha)
+        self.path = path
+        self.cache_size = cache_size
+
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                user_id TEXT PRIMARY KEY,
+                profile TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                entry TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS history_user ON history (user_id, id);
+            CREATE TABLE IF NOT EXISTS seen (
+                user_id TEXT NOT NULL,
+                resource_id TEXT NOT NULL,
+                PRIMARY KEY (user_id, resource_id)
+            );
+            CREATE TABLE IF NOT EXISTS interests (
+                user_id TEXT PRIMARY KEY,
+                vector BLOB NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def history(self, user_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entry FROM history WHERE user_id = ? ORDER BY id",
+                (user_id,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def profile(self, user_id):
+        with self._lock:
+            return copy.deepcopy(self._load(user_id)[0])
+
+    def append(self, user_id, entry, query_vector=None):
+        with self._lock:
+            profile, seen = self._load(user_id)
+            self._apply_entry(profile, entry, query_vector)
+
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO history (user_id, entry) VALUES (?, ?)",
+                    (user_id, json.dumps(entry))
+                )
+
+                resource_id = entry.get("top_result_id")
+                if resource_id is not None:
+                    dropped = self._remember_seen(seen, resource_id)
+                    # Replacing the row gives it the newest rowid, which orders seen IDs by recency
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO seen (user_id, resource_id) VALUES (?, ?)",
+                        (user_id, resource_id)
+                    )
+                    if dropped is not None:
+                        self._conn.execute(
+                            "DELETE FROM seen WHERE user_id = ? AND resource_id = ?",
+                            (user_id, dropped)
+                        )
+
+                overflow = self._conn.execute(
+                    "SELECT id, entry FROM history WHERE user_id = ? ORDER BY id DESC LIMIT -1 OFFSET ?",
+                    (user_id, self.max_history)
+                ).fetchall()
+                if overflow:
+                    for _, old_entry in reversed(overflow):
+                        self._archive(profile, json.loads(old_entry))
+                    self._conn.executemany(
+                        "DELETE FROM history WHERE id = ?",
+                        [(row_id,) for row_id, _ in overflow]
+                    )
+
+                self._write_profile(user_id, profile, interest_changed=query_vector is not None)
+
+    def users(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT user_id FROM profiles").fetchall()
+        return [row[0] for row in rows]
+
+    def interest_vector(self, user_id):
+        with self._lock:
+            vector = self._load(user_id)[0].get("interest_vector")
+            return list(vector) if vector is not None else None
+
+    def seen_resources(self, user_id):
+        with self._lock:
+            return set(self._load(user_id)[1])
+
+    def snapshot(self, user_id):
+        with self._lock:
+            profile, seen = self._load(user_id)
+            rows = self._conn.execute(
+                "SELECT entry FROM history WHERE user_id = ? ORDER BY id",
+                (user_id,)
+            ).fetchall()
+            return [json.loads(row[0]) for row in rows], copy.deepcopy(profile), set(seen)
+
+    def restore(self, user_id, history, profile, seen=()):
+        profile = copy.deepcopy(profile)
+        history = self._restored_history(history, profile)
+        seen = self._restored_seen(seen)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM history WHERE user_id = ?", (user_id,))
+            self._conn.execute("DELETE FROM seen WHERE user_id = ?", (user_id,))
+            self._conn.executemany(
+                "INSERT INTO history (user_id, entry) VALUES (?, ?)",
+                [(user_id, json.dumps(entry)) for entry in history]
+            )
+            self._conn.executemany(
+                "INSERT INTO seen (user_id, resource_id) VALUES (?, ?)",
+                [(user_id, resource_id) for resource_id in seen]
+            )
+            self._conn.execute("DELETE FROM interests WHERE user_id = ?", (user_id,))
+            self._write_profile(user_id, profile, interest_changed=True)
+
+            self._profiles[user_id] = (profile, seen)
+            self._profiles.move_to_end(user_id)
+            if len(self._profiles) > self.cache_size:
+                self._profiles.popitem(last=False)
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _write_profile(self, user_id, profile, interest_changed=False):
+        """Persist a profile, and its interest vector only when it changed"""
+        stored = dict(profile, interest_vector=None)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO profiles (user_id, profile) VALUES (?, ?)",
+            (user_id, json.dumps(stored))
+        )
+        if interest_changed and profile.get("interest_vector") is not None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO interests (user_id, vector) VALUES (?, ?)",
+                (user_id, array.array("f", profile["interest_vector"]).tobytes())
+            )
+
+    def _load(self, user_id):
+        """Return the cached (profile, ordered seen IDs), reading them from disk on first access"""
+        state = self._profiles.get(user_id)
+        if state is not None:
+            self._profiles.move_to_end(user_id)
+            return state
+
+        row = self._conn.execute(
+            "SELECT profile FROM profiles WHERE user_id = ?",
+            (user_id,)
+        ).fetchone()
+        profile = json.loads(row[0]) if row else new_profile()
+        # Databases written before the interests table keep the vector in the profile JSON
+        interest = self._conn.execute(
+            "SELECT vector FROM interests WHERE user_id = ?",
+            (user_id,)
+        ).fetchone()
+        if interest is not None:
+            profile["interest_vector"] = array.array("f", interest[0]).tolist()
+
+        seen = dict.fromkeys(
+            r[0] for r in self._conn.execute(
+                "SELECT resource_id FROM seen WHERE user_id = ? ORDER BY rowid",
+                (user_id,)
+            )
+        )
+        if len(seen) > self.max_history:
+            # Sets recorded before seen IDs were bounded
+            seen = self._restored_seen(seen)
+            with self._conn:
+                self._conn.execute("DELETE FROM seen WHERE user_id = ?", (user_id,))
+                self._conn.executemany(
+                    "INSERT INTO seen (user_id, resource_id) VALUES (?, ?)",
+                    [(user_id, resource_id) for resource_id in seen]
+                )
+
+        state = (profile, seen)
+        self._profiles[user_id] = state
+        if len(self._profiles) > self.cache_size:
+            self._profiles.popitem(last=False)
+        return state
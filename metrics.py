@@ -0,0 +1,195 @@
+"""
+Per-stage timing instrumentation for the Community Navigator
+
+The navigator times each stage of a request (encode, filter build, Qdrant
+query, sparse query and fusion for hybrid search, distance decay, memory
+update, recommendation filtering) and reports the duration to a metrics sink:
+
+- NullSink: discards everything (the default, near-zero overhead)
+- HistogramSink: keeps a rolling window per stage for percentile summaries
+- PrometheusTextSink: cumulative histogram buckets rendered in the
+  Prometheus text exposition format
+- EwmaSink: a moving average per stage, which the navigator keeps alongside
+  the configured sink to estimate whether a request fits its deadline
+
+    sink = HistogramSink()
+    nav = CommunityNavigator(client=client, model=model, metrics=sink)
+    nav.search_resources("free clinic")
+    print(sink.summary()["encode"]["p95_ms"])
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class MetricsSink:
+    """Interface for receiving stage timings"""
+
+    def observe(self, stage, seconds):
+        """Record that a stage took ``seconds``"""
+        raise NotImplementedError
+
+    @contextmanager
+    def time(self, stage):
+        """Context manager that times its block as ``stage``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+
+class NullSink(MetricsSink):
+    """Sink that drops every observation"""
+
+    def observe(self, stage, seconds):
+        pass
+
+    @contextmanager
+    def time(self, stage):
+        yield
+
+
+class HistogramSink(MetricsSink):
+    """In-memory rolling window of timings per stage"""
+
+    def __init__(self, window=10000):
+        """
+        Args:
+            window: Most recent observations kept per stage for percentiles
+        """
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+                self._counts[stage] = 0
+                self._totals[stage] = 0.0
+            samples.append(seconds)
+            self._counts[stage] += 1
+            self._totals[stage] += seconds
+
+    def summary(self):
+        """Count, mean and p50/p95/p99 per stage, in milliseconds"""
+        with self._lock:
+            snapshot = {
+                stage: (sorted(samples), self._counts[stage], self._totals[stage])
+                for stage, samples in self._samples.items()
+            }
+
+        summary = {}
+        for stage, (ordered, count, total) in snapshot.items():
+            def pct(p):
+                index = min(len(ordered) - 1, max(0, int(round(p / 100.0 * len(ordered))) - 1))
+                return ordered[index] * 1000
+
+            summary[stage] = {
+                "count": count,
+                "mean_ms": total / count * 1000,
+                "p50_ms": pct(50),
+                "p95_ms": pct(95),
+                "p99_ms": pct(99),
+                "max_ms": ordered[-1] * 1000
+            }
+        return summary
+
+    def reset(self):
+        """Forget every observation"""
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._totals.clear()
+
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class PrometheusTextSink(MetricsSink):
+    """Cumulative histogram per stage, rendered as Prometheus text"""
+
+    def __init__(self, name="navigator_stage_seconds", buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            name: Metric name in the exposition output
+            buckets: Upper bounds of the histogram buckets, in seconds
+        """
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self._bucket_counts = {}
+        self._counts = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            counts = self._bucket_counts.get(stage)
+            if counts is None:
+                counts = self._bucket_counts[stage] = [0] * len(self.buckets)
+                self._counts[stage] = 0
+                self._totals[stage] = 0.0
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            self._counts[stage] += 1
+            self._totals[stage] += seconds
+
+    def render(self):
+        """Return the histograms in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {self.name} Time spent in each navigator request stage.",
+            f"# TYPE {self.name} histogram"
+        ]
+        with self._lock:
+            for stage in sorted(self._bucket_counts):
+                for bound, count in zip(self.buckets, self._bucket_counts[stage]):
+                    lines.append(f'{self.name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{self.name}_bucket{{stage="{stage}",le="+Inf"}} {self._counts[stage]}')
+                lines.append(f'{self.name}_sum{{stage="{stage}"}} {self._totals[stage]}')
+                lines.append(f'{self.name}_count{{stage="{stage}"}} {self._counts[stage]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, filepath):
+        """Write the exposition text to a file (e.g. for a node-exporter textfile collector)"""
+        with open(filepath, 'w') as f:
+            f.write(self.render())
+
+
+class EwmaSink(MetricsSink):
+    """Exponentially weighted moving average of each stage's duration"""
+
+    def __init__(self, alpha=0.2):
+        """
+        Args:
+            alpha: Weight of the newest observation
+        """
+        self.alpha = alpha
+        self._averages = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            average = self._averages.get(stage)
+            self._averages[stage] = seconds if average is None else average + self.alpha * (seconds - average)
+
+    def estimate(self, stage, default=0.0):
+        """Expected seconds for a stage (default until it has been observed)"""
+        return self._averages.get(stage, default)
+
+
+class FanoutSink(MetricsSink):
+    """Forward every observation to several sinks"""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def observe(self, stage, seconds):
+        for sink in self.sinks:
+            sink.observe(stage, seconds)
@@ -1,9 +1,24 @@
-from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue
-from sentence_transformers import SentenceTransformer
+# qdrant_client and sentence_transformers (torch) are imported on first use,
+# so importing the navigator is cheap for CLI tools and health checks
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+from degradation import (DEGRADED_HNSW_EF, FALLBACK, FULL, MAX_DEADLINE_QUERIES, REDUCED_EF, REDUCED_QUERY_FACTOR,
+                         SKIP_OPTIONAL, Deadline, PopularResults, SearchResults, plan_level, worst)
+from embedding_cache import EmbeddingCache, normalize_query
+from filters import ResourceFilter, parse_open_at
+from geo import decayed_score
+from memory_journal import MemoryJournal, is_journal_path, replay_journal
+from memory_store import DEFAULT_USER, InMemoryStore, new_profile
+from metrics import EwmaSink, FanoutSink, NullSink
+from result_cache import ResultCache
+from setup_qdrant import COLLECTION_NAME, collection_version, create_client, load_model, region_collection
 import json
+import logging
 import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 class CommunityNavigator:
     """
@@ -17,83 +32,951 @@ class CommunityNavigator:
     - Multi-criteria filtering
     """
     
-    def __init__(self, client=None, model=None):
-        """Initialize the navigator"""
-        # Use provided client or create new one
-        self.client = client if client else QdrantClient(":memory:")
+    def __init__(self, client=None, model=None, embedding_cache=None, storage_path=None, url=None,
+                 memory_store=None, user_id=DEFAULT_USER, encoder_backend=None, metrics=None,
+                 exact_search_threshold=1000, sparse_index=None, hnsw_ef=None,
+                 quantization_rescore=None, quantization_oversampling=None, result_cache=None,
+                 regions=None, shard_timeout_ms=None):
+        """
+        Initialize the navigator
         
-        # Load embedding model
-        self.model = model if model else SentenceTransformer('all-MiniLM-L6-v2')
+        Without a client, storage_path opens a collection persisted by
+        setup_qdrant(storage_path=...) and url connects to a Qdrant server,
+        so no re-embedding is needed at startup. A numpy_engine.NumpyEngine
+        can stand in for the client on small corpora.
         
-        # Memory storage (simulates persistent user session)
-        self.memory = []
-        self.user_profile = {
-            "frequent_categories": {},
-            "search_count": 0,
-            "first_interaction": datetime.now().isoformat()
-        }
+        The client and model are created on first use; call warmup() to
+        pay that cost up front instead of on the first query. Without a
+        model, encoder_backend picks the embedding backend (see encoders.py).
+        
+        Memory is kept per user in memory_store (an in-process ring buffer
+        by default). Methods that read or write memory take an optional
+        user_id and fall back to the navigator's default user_id.
+        
+        Each request stage (encode, filter_build, qdrant_query,
+        memory_update, recommendation_filter) is timed into metrics, a
+        sink from metrics.py; timings are discarded by default. Progress
+        is reported through the "navigator" logger: per-request messages
+        at DEBUG, lifecycle events at INFO.
+        
+        Filtered searches whose filter matches at most
+        exact_search_threshold resources skip the HNSW graph and score the
+        matching points exactly (0 disables this).
+        
+        With a sparse_index (a sparse_index.BM25Index or the path of one
+        saved by setup_qdrant), searches are hybrid: the BM25 and dense
+        rankings are merged with reciprocal rank fusion, and result scores
+        are the fused scores. Regional navigators keep the index but always
+        search densely, since it only covers the single collection.
+        
+        hnsw_ef sets the default search-time HNSW candidate list (larger is
+        more accurate and slower). On a quantized collection,
+        quantization_rescore re-ranks candidates with the original vectors
+        and quantization_oversampling fetches that many times top_k
+        candidates first; None leaves Qdrant's defaults.
+        
+        Identical searches are answered from result_cache (a
+        result_cache.ResultCache; pass ResultCache(max_entries=0) to
+        disable it). Cache hits are still recorded in memory.
+        
+        Searches and recommendations accept a deadline_ms budget and step
+        down through the levels in degradation.py when the moving average
+        of past stage timings says the full request would not fit. A Qdrant
+        query still running when the deadline passes is abandoned for the
+        fallback results. Results are SearchResults lists reporting the
+        level in .degradation.
+        
+        With regions (collections built by setup_qdrant.setup_regions), a
+        search goes to the collections of the regions its filter names
+        (ResourceFilter(regions=...)), or to every region in parallel; the
+        shards' results are merged by score. A shard that fails or misses
+        shard_timeout_ms is left out of the merge. Hybrid search needs the
+        single collection.
+        """
+        # Use provided client or create one lazily
+        self._client = client
+        self._storage_path = storage_path
+        self._url = url
+        
+        # Use provided embedding model or load one lazily
+        self._model = model
+        self._encoder_backend = encoder_backend
+        self._init_lock = threading.Lock()
+        
+        # Query embeddings are cached so repeated queries skip the model
+        self.embedding_cache = embedding_cache if embedding_cache is not None else EmbeddingCache()
+        
+        # Search results are cached per query, filter, options and collection version
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
         
-        print("✅ Community Navigator initialized")
+        # Per-user memory storage (bounded history + aggregate profile)
+        self.memory_store = memory_store if memory_store is not None else InMemoryStore()
+        self.user_id = user_id
+        
+        # Open memory journals by path, so each export appends only new entries
+        self._journals = {}
+        self._journal_lock = threading.Lock()
+        
+        # Moving average of each stage, for planning requests with a deadline
+        self.stage_latency = EwmaSink()
+        # Most returned resources, served when a deadline leaves no time to search
+        self.popular_results = PopularResults()
+        
+        # Per-stage timings (NullSink drops them)
+        self.metrics = metrics if metrics is not None else NullSink()
+        
+        # Estimated number of matches per filter, for exact-search planning
+        self.exact_search_threshold = exact_search_threshold
+        self._filter_cardinality = {}
+        
+        # HNSW and quantization search defaults (None: Qdrant's own)
+        self.hnsw_ef = hnsw_ef
+        self.quantization_rescore = quantization_rescore
+        self.quantization_oversampling = quantization_oversampling
+        
+        # The BM25 index covers the single collection; regional searches stay dense
+        if regions and sparse_index is not None:
+            logger.warning("sparse_index is ignored across regional collections; searches stay dense")
+        
+        # Lexical index for hybrid search (None means dense-only)
+        if isinstance(sparse_index, str):
+            from sparse_index import BM25Index
+            sparse_index = BM25Index.load(sparse_index)
+        self.sparse_index = sparse_index
+        
+        # Regional collections searched instead of the single one (see _collections)
+        self.regions = list(regions or [])
+        self.shard_timeout_ms = shard_timeout_ms
+        self._shard_executor = None
+        self._deadline_executor = None
+        self._deadline_slots = threading.BoundedSemaphore(MAX_DEADLINE_QUERIES)
+        
+        logger.info("✅ Community Navigator initialized")
+    
+    @property
+    def metrics(self):
+        """Sink receiving per-stage timings"""
+        return self._metrics
+    
+    @metrics.setter
+    def metrics(self, sink):
+        self._metrics = sink
+        # Stages are timed into the configured sink and the latency estimates
+        self._stage_timer = FanoutSink(sink, self.stage_latency)
+    
+    @property
+    def client(self):
+        """Qdrant client, created on first access"""
+        if self._client is None:
+            with self._init_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+    
+    @property
+    def model(self):
+        """Embedding model, loaded on first access"""
+        if self._model is None:
+            with self._init_lock:
+                if self._model is None:
+                    self._model = load_model(backend=self._encoder_backend)
+        return self._model
+    
+    def _create_client(self):
+        """Create the Qdrant client for the configured storage mode"""
+        return create_client(path=self._storage_path, url=self._url)
     
-    def search_resources(self, query, category_filter=None, top_k=5):
+    def warmup(self):
+        """
+        Load the model and open the collection ahead of the first query
+        
+        Returns:
+            Dict with the seconds spent on each step
+        """
+        timings = {}
+        
+        start = time.perf_counter()
+        self.model.encode("warmup")
+        timings["model_seconds"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for collection_name in self._collections():
+            self.client.get_collection(collection_name=collection_name)
+        timings["client_seconds"] = time.perf_counter() - start
+        
+        logger.info("✅ Navigator warmed up in %.2fs", sum(timings.values()))
+        return timings
+    
+    @property
+    def memory(self):
+        """Search history of the default user"""
+        return self.memory_store.history(self.user_id)
+    
+    @property
+    def user_profile(self):
+        """Profile of the default user"""
+        return self.memory_store.profile(self.user_id)
+    
+    def search_resources(self, query, category_filter=None, top_k=5, user_id=None, hybrid=None,
+                         hnsw_ef=None, deadline_ms=None, open_at=None):
         """
         Search for relevant community resources using semantic similarity
         
         Args:
             query: Natural language search query
-            category_filter: Optional category to filter by
+            category_filter: Optional category, list of categories, dict of
+                ResourceFilter arguments or ResourceFilter
             top_k: Number of results to return
+            user_id: User whose memory records the search
+            hybrid: Fuse BM25 and dense rankings (default: whenever the
+                navigator has a sparse_index; regional searches are dense)
+            hnsw_ef: HNSW candidate list for this query (default: the
+                navigator's hnsw_ef)
+            deadline_ms: Time budget; degrade rather than exceed it (see
+                degradation.py)
+            open_at: Only resources open at this datetime, ISO 8601 string
+                or "now" (filtered inside Qdrant, see hours.py)
+            
+        Returns:
+            SearchResults list of matching resources with relevance scores
+        """
+        category_filter = self._with_open_at(category_filter, parse_open_at(open_at))
+        logger.debug("🔍 Searching for: '%s'", query)
+        if category_filter:
+            logger.debug("   Filtering by: %s", category_filter)
+        
+        deadline = Deadline(deadline_ms)
+        hybrid = self._use_hybrid(hybrid)
+        cache_key = self._result_key(query, category_filter, top_k, hybrid, hnsw_ef)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            query_vector, results = cached
+            degradation = FULL
+        else:
+            query_vector, results, degradation = self._search_uncached(
+                query, category_filter, top_k, hybrid, hnsw_ef, deadline
+            )
+            if degradation == FULL:
+                self.result_cache.put(cache_key, query_vector, results)
+        
+        # Update memory (cache hits included)
+        self._add_to_memory(query, results, category_filter, user_id=user_id, query_vector=query_vector)
+        
+        logger.debug("   Found %d relevant resources (%s)", len(results), degradation)
+        
+        return SearchResults(results, degradation)
+    
+    def search_resources_batch(self, queries, category_filters=None, top_k=5, user_id=None, hybrid=None,
+                               hnsw_ef=None, deadline_ms=None, open_at=None):
+        """
+        Search for several queries at once
+        
+        All uncached queries are embedded in a single model call and sent
+        to Qdrant as one batched request, which is far cheaper than calling
+        search_resources once per query.
+        
+        Args:
+            queries: List of natural language search queries
+            category_filters: None, a single category or ResourceFilter
+                applied to every query, or a list with one filter (or None)
+                per query
+            top_k: Number of results to return per query
+            user_id: User whose memory records the searches
+            hybrid: Fuse BM25 and dense rankings (see search_resources)
+            hnsw_ef: HNSW candidate list for these queries
+            deadline_ms: Time budget of the whole batch
+            open_at: Only resources open at this time, for every query
             
         Returns:
-            List of matching resources with relevance scores
+            List of SearchResults, in the same order as queries
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+        
+        # "now" is resolved once so every query filters on the same slot
+        open_at = parse_open_at(open_at)
+        category_filters = [
+            self._with_open_at(category_filter, open_at)
+            for category_filter in self._per_query_filters(queries, category_filters)
+        ]
+        
+        logger.debug("🔍 Batch searching %d queries", len(queries))
+        
+        deadline = Deadline(deadline_ms)
+        hybrid = self._use_hybrid(hybrid)
+        cache_keys = [
+            self._result_key(query, category_filter, top_k, hybrid, hnsw_ef)
+            for query, category_filter in zip(queries, category_filters)
+        ]
+        outcomes = [self.result_cache.get(key) for key in cache_keys]
+        
+        # Only cache misses are encoded and sent to Qdrant
+        misses = [i for i, outcome in enumerate(outcomes) if outcome is None]
+        degradations = [FULL] * len(queries)
+        if misses:
+            miss_vectors, miss_results, degradation = self._search_batch_uncached(
+                [queries[i] for i in misses], [category_filters[i] for i in misses], top_k, hybrid, hnsw_ef,
+                deadline
+            )
+            for i, query_vector, results in zip(misses, miss_vectors, miss_results):
+                outcomes[i] = (query_vector, results)
+                degradations[i] = degradation
+                if degradation == FULL:
+                    self.result_cache.put(cache_keys[i], query_vector, results)
+        
+        query_vectors = [query_vector for query_vector, _ in outcomes]
+        batch_results = [
+            SearchResults(results, degradation) for (_, results), degradation in zip(outcomes, degradations)
+        ]
+        
+        # Record every query in memory, in submission order
+        for query, results, category_filter, query_vector in zip(
+                queries, batch_results, category_filters, query_vectors):
+            self._add_to_memory(query, results, category_filter, user_id=user_id, query_vector=query_vector)
+        
+        logger.debug("   Found %d resources across %d queries",
+                     sum(len(r) for r in batch_results), len(queries))
+        
+        return batch_results
+    
+    def _search_uncached(self, query, category_filter, top_k, hybrid, hnsw_ef, deadline=None):
+        """
+        Run one search against Qdrant (and the sparse index when hybrid)
+        
+        Returns:
+            (query_vector, results, degradation); query_vector is None when
+            the deadline left no time to encode
         """
-        print(f"\n🔍 Searching for: '{query}'")
+        deadline = deadline or Deadline()
+        level = self._plan_level(deadline, hybrid)
+        if level == FALLBACK:
+            return None, self._fallback_results(category_filter, top_k), FALLBACK
         
-        # Generate query embedding
-        query_vector = self.model.encode(query).tolist()
+        # Generate query embedding (served from cache for repeated queries)
+        with self._stage_timer.time("encode"):
+            query_vector = self._encode_query(query)
+        if not deadline.allows(0):
+            return query_vector, self._fallback_results(category_filter, top_k), FALLBACK
         
         # Build filter if category specified
-        search_filter = None
-        if category_filter:
-            search_filter = Filter(
-                must=[
-                    FieldCondition(
-                        key="category",
-                        match=MatchValue(value=category_filter)
-                    )
+        with self._stage_timer.time("filter_build"):
+            search_filter = self._build_filter(category_filter)
+            search_params = self._plan_search(category_filter, search_filter, self._degraded_ef(level, hnsw_ef),
+                                              deadline)
+        
+        # Search in Qdrant
+        limit = self._candidate_limit(top_k, hybrid, self._decays(category_filter))
+        results = self._query_by_deadline(deadline, self._query, query_vector, search_filter, limit,
+                                          search_params, self._collections(category_filter), stage="qdrant_query")
+        if results is None:
+            return query_vector, self._fallback_results(category_filter, top_k), FALLBACK
+        
+        # Distance decay re-orders the dense candidates (before fusion when hybrid)
+        results = self._distance_ranked(results, category_filter)
+        if hybrid:
+            level = self._hybrid_level(level, deadline)
+            if level == SKIP_OPTIONAL:
+                results = results[:top_k]
+            else:
+                results = self._hybrid_results(query, results, category_filter, top_k)
+        else:
+            results = results[:top_k]
+        
+        if level == FULL:
+            self.popular_results.record(results)
+        return query_vector, results, level
+    
+    def _search_batch_uncached(self, queries, category_filters, top_k, hybrid, hnsw_ef, deadline=None):
+        """
+        Run several searches in one model call and one Qdrant round trip
+        
+        Returns:
+            (query_vectors, batch_results, degradation), in the order of
+            queries; the whole batch shares one degradation level
+        """
+        deadline = deadline or Deadline()
+        level = self._plan_level(deadline, hybrid)
+        if level == FALLBACK:
+            return self._fallback_batch(queries, category_filters, top_k)
+        
+        with self._stage_timer.time("encode"):
+            query_vectors = self._encode_queries(queries)
+        if not deadline.allows(0):
+            return self._fallback_batch(queries, category_filters, top_k, query_vectors)
+        
+        with self._stage_timer.time("filter_build"):
+            search_filters = [self._build_filter(c) for c in category_filters]
+            search_params = [
+                self._plan_search(c, f, self._degraded_ef(level, hnsw_ef), deadline)
+                for c, f in zip(category_filters, search_filters)
+            ]
+        
+        limit = self._candidate_limit(top_k, hybrid, any(self._decays(c) for c in category_filters))
+        batch_results = self._query_by_deadline(deadline, self._query_batch, query_vectors, search_filters,
+                                                limit, search_params, [self._collections(c) for c in category_filters],
+                                                stage="qdrant_query")
+        if batch_results is None:
+            return self._fallback_batch(queries, category_filters, top_k, query_vectors)
+        
+        batch_results = [
+            self._distance_ranked(results, category_filter)
+            for results, category_filter in zip(batch_results, category_filters)
+        ]
+        if hybrid:
+            level = self._hybrid_level(level, deadline, len(queries))
+            if level == SKIP_OPTIONAL:
+                batch_results = [results[:top_k] for results in batch_results]
+            else:
+                batch_results = [
+                    self._hybrid_results(query, results, category_filter, top_k)
+                    for query, results, category_filter in zip(queries, batch_results, category_filters)
                 ]
+        else:
+            batch_results = [results[:top_k] for results in batch_results]
+        
+        if level == FULL:
+            for results in batch_results:
+                self.popular_results.record(results)
+        return query_vectors, batch_results, level
+    
+    def _plan_level(self, deadline, hybrid=False):
+        """Degradation level a request starts at, given its deadline"""
+        return plan_level(
+            deadline,
+            self.stage_latency.estimate,
+            optional_stages=("sparse_query", "fusion") if hybrid else ()
+        )
+    
+    def _degraded_ef(self, level, hnsw_ef):
+        """HNSW candidate list for a level (unchanged at full quality)"""
+        if level == FULL:
+            return hnsw_ef
+        configured = hnsw_ef if hnsw_ef is not None else self.hnsw_ef
+        return DEGRADED_HNSW_EF if configured is None else min(configured, DEGRADED_HNSW_EF)
+    
+    def _hybrid_level(self, level, deadline, n_queries=1):
+        """Drop BM25 fusion (an optional stage) when it no longer fits the deadline"""
+        cost = n_queries * (self.stage_latency.estimate("sparse_query") + self.stage_latency.estimate("fusion"))
+        if level == SKIP_OPTIONAL or not deadline.allows(cost):
+            return worst(level, SKIP_OPTIONAL)
+        return level
+    
+    def _fallback_results(self, category_filter, top_k, exclude_ids=()):
+        """Popular results for a request with no time left to search"""
+        return self.popular_results.top(top_k, ResourceFilter.coerce(category_filter), exclude_ids)
+    
+    def _fallback_batch(self, queries, category_filters, top_k, query_vectors=None):
+        """_search_batch_uncached's outcome at the fallback level"""
+        return (
+            query_vectors or [None] * len(queries),
+            [self._fallback_results(c, top_k) for c in category_filters],
+            FALLBACK
+        )
+    
+    def _result_key(self, query, category_filter, top_k, hybrid, hnsw_ef):
+        """Result cache key; the collection version retires keys after every write"""
+        resource_filter = ResourceFilter.coerce(category_filter)
+        return (
+            normalize_query(query),
+            resource_filter.cache_key() if resource_filter is not None else None,
+            top_k,
+            hybrid,
+            hnsw_ef,
+            self._collections_version(category_filter)
+        )
+    
+    def _use_hybrid(self, hybrid):
+        """Resolve the per-call hybrid flag against the configured sparse index"""
+        if self.regions:
+            # The index covers the single collection, so regional fan-out is dense
+            return False
+        if hybrid is None:
+            return self.sparse_index is not None
+        if hybrid and self.sparse_index is None:
+            raise ValueError("Hybrid search needs a sparse_index")
+        return hybrid
+    
+    def _candidate_limit(self, top_k, hybrid=True, rerank=False):
+        """Results fetched from each ranking before fusion or distance decay"""
+        # Fusion and distance decay can only promote what was returned, so
+        # the rankings go deeper than the final top_k
+        return max(top_k * 4, 20) if hybrid or rerank else top_k
+    
+    def _decays(self, category_filter):
+        """True if a filter asks for distance-decayed ranking"""
+        resource_filter = ResourceFilter.coerce(category_filter)
+        return resource_filter is not None and resource_filter.decay_km is not None
+    
+    def _distance_ranked(self, results, category_filter):
+        """Re-score results with the filter's distance decay (unchanged without one)"""
+        if not self._decays(category_filter):
+            return results
+        
+        from qdrant_client.models import ScoredPoint
+        
+        resource_filter = ResourceFilter.coerce(category_filter)
+        with self._stage_timer.time("distance_decay"):
+            decayed = [
+                ScoredPoint(
+                    id=point.id,
+                    version=getattr(point, "version", 0),
+                    score=decayed_score(point.score, point.payload, resource_filter.near, resource_filter.decay_km),
+                    payload=point.payload
+                )
+                for point in results
+            ]
+            return sorted(decayed, key=lambda point: point.score, reverse=True)
+    
+    def _hybrid_results(self, query, dense_results, category_filter, top_k):
+        """Fuse dense results with the BM25 ranking for the same query"""
+        with self._stage_timer.time("sparse_query"):
+            sparse_ids = self._sparse_ranking(query, top_k)
+            missing = self._missing_ids(dense_results, sparse_ids)
+            records = self.client.retrieve(
+                collection_name=COLLECTION_NAME,
+                ids=missing,
+                with_payload=True
+            ) if missing else []
+        
+        with self._stage_timer.time("fusion"):
+            return self._fuse(dense_results, sparse_ids, records, category_filter, top_k)
+    
+    def _sparse_ranking(self, query, top_k):
+        """Point IDs ranked by BM25, best first"""
+        return [point_id for point_id, _ in self.sparse_index.search(query, self._candidate_limit(top_k))]
+    
+    def _missing_ids(self, dense_results, sparse_ids):
+        """Sparse hits whose payload the dense search did not return"""
+        dense_ids = {str(point.id) for point in dense_results}
+        return [point_id for point_id in sparse_ids if point_id not in dense_ids]
+    
+    def _fuse(self, dense_results, sparse_ids, records, category_filter, top_k):
+        """
+        Merge dense and sparse rankings with reciprocal rank fusion
+        
+        Dense hits already satisfy the Qdrant filter; sparse hits are
+        checked against their payload here. IDs missing from the collection
+        (a stale index) are dropped.
+        
+        Returns:
+            Up to top_k ScoredPoints carrying the fused score
+        """
+        from qdrant_client.models import ScoredPoint
+        from sparse_index import reciprocal_rank_fusion
+        
+        points = {str(point.id): point for point in records}
+        points.update({str(point.id): point for point in dense_results})
+        
+        resource_filter = ResourceFilter.coerce(category_filter)
+        sparse_ids = [
+            point_id for point_id in sparse_ids
+            if point_id in points and (resource_filter is None or resource_filter.matches(points[point_id].payload))
+        ]
+        fused = reciprocal_rank_fusion([[str(point.id) for point in dense_results], sparse_ids])
+        
+        return [
+            ScoredPoint(
+                id=points[point_id].id,
+                version=getattr(points[point_id], "version", 0),
+                score=score,
+                payload=points[point_id].payload
             )
-            print(f"   Filtering by category: {category_filter}")
+            for point_id, score in fused[:top_k]
+        ]
+    
+    def _per_query_filters(self, queries, category_filters):
+        """Expand category_filters into one entry per query"""
+        if category_filters is None or isinstance(category_filters, (str, dict, ResourceFilter)):
+            return [category_filters] * len(queries)
         
+        category_filters = list(category_filters)
+        if len(category_filters) != len(queries):
+            raise ValueError(
+                f"Got {len(category_filters)} category filters for {len(queries)} queries"
+            )
+        return category_filters
+    
+    def _with_open_at(self, category_filter, open_at):
+        """Add an opening-time condition to any form ResourceFilter.coerce accepts"""
+        if open_at is None:
+            return category_filter
+        resource_filter = ResourceFilter.coerce(category_filter)
+        arguments = resource_filter.to_dict() if resource_filter is not None else {}
+        arguments["open_at"] = open_at
+        return ResourceFilter(**arguments)
+    
+    def _build_filter(self, category_filter):
+        """Build a Qdrant filter from any form ResourceFilter.coerce accepts"""
+        resource_filter = ResourceFilter.coerce(category_filter)
+        if resource_filter is None:
+            return None
+        return resource_filter.to_qdrant()
+    
+    def _plan_search(self, category_filter, search_filter, hnsw_ef=None, deadline=None):
+        """
+        Choose search params for a filter
+        
+        The count behind the choice is a Qdrant round trip, so it is bound
+        by the deadline like the query; if it runs out the default params
+        are used (and the query itself degrades to the fallback).
+        
+        Returns:
+            SearchParams with exact=True when the filter matches at most
+            exact_search_threshold resources, otherwise HNSW/quantization
+            params (None when everything is left at Qdrant's defaults)
+        """
+        plan = self._cardinality_plan(category_filter, search_filter)
+        if plan is None:
+            return self._search_params(hnsw_ef=hnsw_ef)
+        
+        key, count_filter = plan
+        matches = self._filter_cardinality.get(key)
+        if matches is None:
+            matches = self._query_by_deadline(deadline or Deadline(), self._count_matches,
+                                              category_filter, count_filter)
+            if matches is None:
+                return self._search_params(hnsw_ef=hnsw_ef)
+            self._remember_cardinality(key, matches)
+        return self._search_params(matches, hnsw_ef)
+    
+    def _count_matches(self, category_filter, count_filter):
+        """Estimated resources matching a filter across its routed collections"""
+        # Summed over shards: one params object serves every routed collection
+        return sum(
+            self.client.count(
+                collection_name=collection_name,
+                count_filter=count_filter,
+                exact=False
+            ).count
+            for collection_name in self._collections(category_filter)
+        )
+    
+    def _cardinality_plan(self, category_filter, search_filter):
+        """
+        Cache key of a filter's match count and the Qdrant filter to count
+        
+        Geo conditions are left out of both and treated as non-selective:
+        their raw coordinates would give almost every request its own key,
+        and so its own count round trip.
+        
+        Returns:
+            (key, count_filter), or None if no planning is needed
+        """
+        if search_filter is None or not self.exact_search_threshold:
+            return None
+        resource_filter = ResourceFilter.coerce(ResourceFilter.coerce(category_filter).without_geo())
+        if resource_filter is None:
+            return None
+        # Counts go stale when the collection changes
+        key = resource_filter.cache_key(), self._collections_version(category_filter)
+        return key, resource_filter.to_qdrant()
+    
+    def _remember_cardinality(self, key, matches):
+        """Cache a filter's estimated match count"""
+        # Filters repeat heavily in practice; start over if that assumption fails
+        if len(self._filter_cardinality) >= 4096:
+            self._filter_cardinality.clear()
+        self._filter_cardinality[key] = matches
+    
+    def _search_params(self, matches=None, hnsw_ef=None):
+        """
+        Build SearchParams for a query
+        
+        Args:
+            matches: Estimated resources matching the filter (None if unfiltered)
+            hnsw_ef: Per-query override of the navigator's hnsw_ef
+        """
+        # Scoring a few hundred points directly beats walking a graph
+        # whose neighbours are mostly filtered out
+        exact = matches is not None and matches <= self.exact_search_threshold
+        hnsw_ef = hnsw_ef if hnsw_ef is not None else self.hnsw_ef
+        quantized = self.quantization_rescore is not None or self.quantization_oversampling is not None
+        
+        if not exact and hnsw_ef is None and not quantized:
+            return None
+        
+        from qdrant_client.models import QuantizationSearchParams, SearchParams
+        
+        return SearchParams(
+            exact=exact,
+            hnsw_ef=None if exact else hnsw_ef,
+            quantization=QuantizationSearchParams(
+                rescore=self.quantization_rescore,
+                oversampling=self.quantization_oversampling
+            ) if quantized else None
+        )
+    
+    def _collections(self, category_filter=None):
+        """Collections a request is routed to: its filter's regions, else all of them"""
+        if not self.regions:
+            return [COLLECTION_NAME]
+        
+        resource_filter = ResourceFilter.coerce(category_filter)
+        requested, excluded = [], []
+        if resource_filter is not None:
+            requested, excluded = resource_filter.include["regions"], resource_filter.exclude["regions"]
+        unknown = set(requested) - set(self.regions)
+        if unknown:
+            raise ValueError(f"Unknown regions: {', '.join(sorted(unknown))}")
+        return [region_collection(region) for region in requested or self.regions if region not in excluded]
+    
+    def _collections_version(self, category_filter=None):
+        """Versions of the collections a request reads, for cache keys"""
+        return tuple(collection_version(collection_name) for collection_name in self._collections(category_filter))
+    
+    @property
+    def shard_executor(self):
+        """Threads querying regional collections in parallel, created on first fan-out"""
+        if self._shard_executor is None:
+            with self._init_lock:
+                if self._shard_executor is None:
+                    self._shard_executor = ThreadPoolExecutor(
+                        max_workers=max(len(self.regions), 1),
+                        thread_name_prefix="navigator-shard"
+                    )
+        return self._shard_executor
+    
+    @property
+    def deadline_executor(self):
+        """Threads running Qdrant queries that must answer within a deadline, created on first use"""
+        if self._deadline_executor is None:
+            with self._init_lock:
+                if self._deadline_executor is None:
+                    self._deadline_executor = ThreadPoolExecutor(
+                        max_workers=MAX_DEADLINE_QUERIES,
+                        thread_name_prefix="navigator-deadline"
+                    )
+        return self._deadline_executor
+    
+    def _query_by_deadline(self, deadline, query, *args, stage=None):
+        """
+        Run query(*args), giving up when the deadline passes
+        
+        The query is timed as stage until it really finishes, so one that is
+        abandoned still reports its full duration to the latency estimates
+        rather than the truncated wait. With MAX_DEADLINE_QUERIES already in
+        flight the request is shed instead of queueing behind them.
+        
+        Returns:
+            The query's results, or None if it did not answer in time
+        """
+        if deadline.expires_at is None:
+            if stage is None:
+                return query(*args)
+            with self._stage_timer.time(stage):
+                return query(*args)
+        
+        if not deadline.allows(0):
+            return None
+        if not self._deadline_slots.acquire(blocking=False):
+            logger.warning("⚠️ %d Qdrant queries in flight; serving fallback results", MAX_DEADLINE_QUERIES)
+            return None
+        
+        # A late query keeps its thread until Qdrant answers; only its result is dropped
+        started = time.perf_counter()
+        future = self.deadline_executor.submit(query, *args)
+        future.add_done_callback(lambda _: self._finish_deadline_query(stage, started))
+        done, _ = wait([future], timeout=max(deadline.remaining(), 0))
+        if future not in done:
+            logger.warning("⚠️ Qdrant query missed the deadline; serving fallback results")
+            return None
+        return future.result()
+    
+    def _finish_deadline_query(self, stage, started):
+        """Free a deadline slot and time the query that held it"""
+        self._deadline_slots.release()
+        if stage is not None:
+            self._stage_timer.observe(stage, time.perf_counter() - started)
+    
+    def _fan_out(self, collections, search):
+        """
+        Run search(collection_name) on several collections in parallel
+        
+        Returns:
+            Results of the shards that answered within shard_timeout_ms
+        """
+        if len(collections) == 1:
+            return [search(collections[0])]
+        if not collections:
+            return []
+        
+        # A late shard keeps its thread until Qdrant answers; only its result is dropped
+        shards = {self.shard_executor.submit(search, collection_name): collection_name
+                  for collection_name in collections}
+        timeout = None if self.shard_timeout_ms is None else self.shard_timeout_ms / 1000.0
+        done, _ = wait(shards, timeout=timeout)
+        return self._shard_results(shards, done)
+    
+    def _shard_results(self, shards, done):
+        """
+        Results of the finished shards (futures or tasks), in submission order
+        
+        Late or failed shards are logged and skipped; an error is raised
+        only when no shard answered.
+        """
+        results, errors = [], []
+        for shard, collection_name in shards.items():
+            if shard not in done:
+                shard.cancel()
+                logger.warning("⚠️ Shard %s missed the %sms timeout", collection_name, self.shard_timeout_ms)
+            elif shard.exception() is not None:
+                errors.append(shard.exception())
+                logger.warning("⚠️ Shard %s failed: %s", collection_name, shard.exception())
+            else:
+                results.append(shard.result())
+        
+        if shards and not results:
+            if errors:
+                raise errors[0]
+            raise TimeoutError(f"No regional collection answered within {self.shard_timeout_ms}ms")
+        return results
+    
+    @staticmethod
+    def _merge_shards(shard_results, top_k):
+        """Best top_k results across shards (cosine scores are comparable between them)"""
+        if len(shard_results) == 1:
+            return shard_results[0]
+        merged = [point for results in shard_results for point in results]
+        return sorted(merged, key=lambda point: point.score, reverse=True)[:top_k]
+    
+    def _query(self, query_vector, search_filter, top_k, search_params=None, collections=None):
+        """Run a single vector search, fanned out when routed to several collections"""
+        shard_results = self._fan_out(
+            collections if collections is not None else self._collections(),
+            lambda collection_name: self._query_collection(
+                collection_name, query_vector, search_filter, top_k, search_params
+            )
+        )
+        return self._merge_shards(shard_results, top_k)
+    
+    def _query_collection(self, collection_name, query_vector, search_filter, top_k, search_params=None):
+        """Run a single vector search against one collection"""
         # Search in Qdrant - Using UPDATED API for v1.16+
         try:
             # New API (v1.16+)
             search_result = self.client.query_points(
-                collection_name="community_resources",
+                collection_name=collection_name,
                 query=query_vector,
                 limit=top_k,
                 query_filter=search_filter,
+                search_params=search_params,
                 with_payload=True
             )
-            results = search_result.points
+            return search_result.points
         except AttributeError:
             # Fallback for older versions
-            results = self.client.search(
-                collection_name="community_resources",
+            return self.client.search(
+                collection_name=collection_name,
                 query_vector=query_vector,
                 query_filter=search_filter,
+                search_params=search_params,
                 limit=top_k,
                 with_payload=True
             )
+    
+    def _query_batch(self, query_vectors, search_filters, top_k, search_params=None, routes=None):
+        """
+        Run several vector searches in one Qdrant round trip per collection
+        
+        Args:
+            routes: Collections of each query (default: the navigator's
+                collections for all); each collection gets one batch of the
+                queries routed to it, and the collections run in parallel
+        """
+        if search_params is None:
+            search_params = [None] * len(query_vectors)
+        if routes is None:
+            routes = [self._collections()] * len(query_vectors)
         
-        # Update memory
-        self._add_to_memory(query, results, category_filter)
+        def search(collection_name):
+            indexes = [i for i, route in enumerate(routes) if collection_name in route]
+            return indexes, self._query_batch_collection(
+                collection_name,
+                [query_vectors[i] for i in indexes],
+                [search_filters[i] for i in indexes],
+                top_k,
+                [search_params[i] for i in indexes]
+            )
         
-        print(f"   Found {len(results)} relevant resources")
+        collections = list(dict.fromkeys(collection_name for route in routes for collection_name in route))
+        shard_results = [[] for _ in query_vectors]
+        for indexes, batch_results in self._fan_out(collections, search):
+            for i, results in zip(indexes, batch_results):
+                shard_results[i].append(results)
+        return [self._merge_shards(results, top_k) if results else [] for results in shard_results]
+    
+    def _query_batch_collection(self, collection_name, query_vectors, search_filters, top_k, search_params=None):
+        """Run several vector searches against one collection in one round trip"""
+        use_query_api, requests = self._batch_requests(query_vectors, search_filters, top_k, search_params)
+        if use_query_api:
+            # New API (v1.16+)
+            responses = self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=requests
+            )
+            return [response.points for response in responses]
         
-        return results
+        # Fallback for older versions
+        return self.client.search_batch(
+            collection_name=collection_name,
+            requests=requests
+        )
+    
+    def _batch_requests(self, query_vectors, search_filters, top_k, search_params=None):
+        """
+        Build batched search requests for the installed client version
+        
+        Returns:
+            (use_query_api, requests) - QueryRequests for query_batch_points
+            when available, otherwise SearchRequests for search_batch
+        """
+        try:
+            # Batched universal query API (qdrant-client v1.10+)
+            from qdrant_client.models import QueryRequest
+        except ImportError:
+            QueryRequest = None
+        
+        if search_params is None:
+            search_params = [None] * len(query_vectors)
+        
+        if QueryRequest is not None and hasattr(self.client, "query_batch_points"):
+            return True, [
+                QueryRequest(query=vector, filter=search_filter, params=params, limit=top_k, with_payload=True)
+                for vector, search_filter, params in zip(query_vectors, search_filters, search_params)
+            ]
+        
+        from qdrant_client.models import SearchRequest
+        
+        return False, [
+            SearchRequest(vector=vector, filter=search_filter, params=params, limit=top_k, with_payload=True)
+            for vector, search_filter, params in zip(query_vectors, search_filters, search_params)
+        ]
     
-    def _add_to_memory(self, query, results, category_filter=None):
+    def _encode_query(self, query):
+        """Embed a query, reusing the cached vector when available"""
+        vector = self.embedding_cache.get(query)
+        if vector is None:
+            vector = self.model.encode(query)
+            self.embedding_cache.put(query, vector)
+        return vector.tolist()
+    
+    def _encode_queries(self, queries):
+        """Embed several queries, encoding all cache misses in one model call"""
+        vectors = [self.embedding_cache.get(q) for q in queries]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        
+        if missing:
+            encoded = self.model.encode([queries[i] for i in missing])
+            for i, vector in zip(missing, encoded):
+                # Copy the row so the cache does not pin the whole batch array
+                vector = vector.copy()
+                self.embedding_cache.put(queries[i], vector)
+                vectors[i] = vector
+        
+        return [vector.tolist() for vector in vectors]
+    
+    def _add_to_memory(self, query, results, category_filter=None, user_id=None, query_vector=None):
         """
         Store search interaction in memory for personalization
         This demonstrates the MEMORY capability required by the challenge
@@ -101,114 +984,233 @@ class CommunityNavigator:
         memory_entry = {
             "timestamp": datetime.now().isoformat(),
             "query": query,
-            "category_filter": category_filter,
+            "category_filter": (category_filter.to_dict()
+                                if isinstance(category_filter, ResourceFilter) else category_filter),
             "num_results": len(results),
             "top_result": results[0].payload['name'] if results else None,
+            "top_result_id": str(results[0].id) if results else None,
             "top_category": results[0].payload['category'] if results else None
         }
         
-        self.memory.append(memory_entry)
-        self.user_profile["search_count"] += 1
-        
-        # Track frequent categories
-        if results:
-            cat = results[0].payload['category']
-            self.user_profile["frequent_categories"][cat] = \
-                self.user_profile["frequent_categories"].get(cat, 0) + 1
+        # The store updates the profile counters, the interest vector and
+        # the seen-resource set, and compacts old entries
+        with self._stage_timer.time("memory_update"):
+            self.memory_store.append(self._user(user_id), memory_entry, query_vector)
     
-    def get_recommendations(self, top_k=3):
+    def _user(self, user_id):
+        """Resolve an optional user_id to the navigator's default user"""
+        return user_id if user_id is not None else self.user_id
+    
+    def get_recommendations(self, top_k=3, user_id=None, deadline_ms=None):
         """
         Generate personalized recommendations based on search history
         This demonstrates the RECOMMENDATION capability
         
+        Args:
+            top_k: Number of recommendations
+            user_id: User to recommend for
+            deadline_ms: Time budget; degrade rather than exceed it
+        
         Returns:
-            List of recommended resources based on user patterns
+            SearchResults list of recommended resources based on user patterns
         """
-        if not self.memory:
-            print("\n💡 No search history yet. Showing popular resources...")
-            # Return general popular resources
-            return self.search_resources("community services", top_k=top_k)
-        
-        print("\n💡 Generating personalized recommendations...")
+        user_id = self._user(user_id)
+        deadline = Deadline(deadline_ms)
         
-        # Analyze past queries to understand user needs
-        past_queries = [m['query'] for m in self.memory[-5:]]
+        # The interest vector is kept up to date on every search, so no
+        # re-encoding is needed here
+        interest_vector = self.memory_store.interest_vector(user_id)
+        if interest_vector is None:
+            history = self.memory_store.history(user_id)
+            if not history:
+                logger.debug("💡 No search history yet. Showing popular resources...")
+                # Return general popular resources
+                return self.search_resources("community services", top_k=top_k, user_id=user_id,
+                                             deadline_ms=deadline.remaining_ms())
+            
+            # Re-encoding past queries is an optional stage under a deadline
+            level = self._plan_level(deadline)
+            if level != FULL:
+                return self._fallback_recommendations(user_id, top_k)
+            
+            # History recorded without embeddings: derive interests from recent queries
+            with self._stage_timer.time("encode"):
+                interest_vector = self._encode_query(self._recent_interest_query(history))
         
-        # Create a combined query from recent searches
-        combined_query = " ".join(past_queries)
-        print(f"   Based on your recent interests: {', '.join(past_queries[:3])}...")
+        level = self._recommendation_level(deadline)
+        if level == FALLBACK:
+            return self._fallback_recommendations(user_id, top_k)
         
-        # Find related resources
-        recommendations = self.search_resources(
-            combined_query, 
-            top_k=top_k * 2  # Get more to filter out already seen
-        )
+        logger.debug("💡 Generating personalized recommendations...")
         
-        # Filter out resources already seen
-        seen_resources = set()
-        for m in self.memory:
-            if m['top_result']:
-                seen_resources.add(m['top_result'])
+        # Qdrant excludes resources the user has already seen
+        with self._stage_timer.time("recommendation_filter"):
+            unseen_filter = self._unseen_filter(user_id)
+        results = self._query_by_deadline(deadline, self._query, interest_vector, unseen_filter, top_k,
+                                          self._search_params(hnsw_ef=self._degraded_ef(level, None)),
+                                          self._collections(), stage="qdrant_query")
+        if results is None:
+            return self._fallback_recommendations(user_id, top_k)
+        return SearchResults(results, level)
+    
+    def _recommendation_level(self, deadline):
+        """Level of the recommendation query itself (its interest vector is already known)"""
+        if deadline.expires_at is None:
+            return FULL
+        query = self.stage_latency.estimate("recommendation_filter") + self.stage_latency.estimate("qdrant_query")
+        if deadline.allows(query):
+            return FULL
+        if deadline.allows(query * REDUCED_QUERY_FACTOR):
+            return REDUCED_EF
+        return FALLBACK
+    
+    def _fallback_recommendations(self, user_id, top_k):
+        """Popular resources the user has not seen yet"""
+        seen = {str(resource_id) for resource_id in self.memory_store.seen_resources(user_id)}
+        return SearchResults(self._fallback_results(None, top_k, exclude_ids=seen), FALLBACK)
+    
+    def _recent_interest_query(self, history):
+        """Combine the most recent queries into one recommendation query"""
+        # Analyze past queries to understand user needs
+        past_queries = [m['query'] for m in history[-5:]]
+        logger.debug("   Based on your recent interests: %s...", ', '.join(past_queries[:3]))
+        return " ".join(past_queries)
+    
+    def _unseen_filter(self, user_id):
+        """Filter out resources the user has already been shown"""
+        seen_resources = self.memory_store.seen_resources(user_id)
+        if not seen_resources:
+            return None
         
-        # Return unseen recommendations
-        new_recommendations = [
-            r for r in recommendations 
-            if r.payload['name'] not in seen_resources
-        ][:top_k]
+        from qdrant_client.models import Filter, HasIdCondition
         
-        return new_recommendations
+        return Filter(must_not=[HasIdCondition(has_id=list(seen_resources))])
     
-    def get_user_history(self):
+    def get_user_history(self, user_id=None):
         """
         Retrieve user's search history
         Demonstrates long-term memory capability
         """
+        user_id = self._user(user_id)
         return {
-            "memory": self.memory,
-            "profile": self.user_profile
+            "memory": self.memory_store.history(user_id),
+            "profile": self.memory_store.profile(user_id)
         }
     
-    def analyze_user_patterns(self):
+    def analyze_user_patterns(self, user_id=None):
         """
         Analyze user search patterns for insights
         Shows how memory enables intelligent personalization
         """
-        if not self.memory:
+        user_id = self._user(user_id)
+        history = self.memory_store.history(user_id)
+        if not history:
             return "No search history available yet."
         
+        profile = self.memory_store.profile(user_id)
+        
         analysis = []
-        analysis.append(f"Total searches: {len(self.memory)}")
+        # History is capped, so the total comes from the profile counters
+        analysis.append(f"Total searches: {profile['search_count']}")
         
         # Most frequent category
-        if self.user_profile["frequent_categories"]:
+        if profile["frequent_categories"]:
             top_category = max(
-                self.user_profile["frequent_categories"].items(),
+                profile["frequent_categories"].items(),
                 key=lambda x: x[1]
             )
             analysis.append(f"Most searched category: {top_category[0]} ({top_category[1]} times)")
         
         # Recent focus
-        recent_categories = [m['top_category'] for m in self.memory[-3:] if m['top_category']]
+        recent_categories = [m['top_category'] for m in history[-3:] if m['top_category']]
         if recent_categories:
             analysis.append(f"Recent focus areas: {', '.join(set(recent_categories))}")
         
         return "\n".join(analysis)
     
-    def export_memory(self, filepath='memory_export.json'):
+    def export_memory(self, filepath='memory_export.json', user_id=None):
         """
         Export user memory for persistence
-        In production, this would save to a database
+        
+        A .json path writes a snapshot of one user (the default user unless
+        user_id is given). A .jsonl path appends to a journal only the
+        entries recorded since the previous export, for user_id or for
+        every user, and compacts it periodically (see memory_journal.py).
+        Either can be loaded back with import_memory.
+        """
+        if is_journal_path(filepath):
+            self._flush_journal(filepath, user_id)
+            return
+        self._write_memory_export(filepath, self._memory_snapshot(user_id))
+    
+    def import_memory(self, filepath, user_id=None):
+        """
+        Load memory written by export_memory into the memory store
+        
+        Journals are streamed line by line, holding at most max_history
+        entries per user. A journal restores every user it contains (or
+        only user_id); a .json export restores its own user, or user_id.
+        
+        Returns:
+            List of restored user IDs
         """
-        memory_data = {
-            "history": self.memory,
-            "profile": self.user_profile,
+        if is_journal_path(filepath):
+            users = replay_journal(filepath, self.memory_store.max_history)
+            if user_id is not None:
+                users = {user_id: users[user_id]} if user_id in users else {}
+            
+            restored = []
+            for journal_user, state in users.items():
+                if state["profile"] is None:
+                    continue
+                self.memory_store.restore(journal_user, state["history"], state["profile"], state["seen"])
+                restored.append(journal_user)
+        else:
+            with open(filepath) as f:
+                memory_data = json.load(f)
+            
+            target = user_id if user_id is not None else memory_data.get("user_id", self.user_id)
+            # Exports from older versions lack the newer profile fields
+            profile = {**new_profile(), **memory_data["profile"]}
+            seen = {
+                entry["top_result_id"] for entry in memory_data["history"]
+                if entry.get("top_result_id") is not None
+            }
+            self.memory_store.restore(target, memory_data["history"], profile, seen)
+            restored = [target]
+        
+        logger.info("✅ Imported memory of %d user(s) from %s", len(restored), filepath)
+        return restored
+    
+    def _memory_snapshot(self, user_id=None):
+        """Collect everything export_memory writes"""
+        user_id = self._user(user_id)
+        history, profile, _ = self.memory_store.snapshot(user_id)
+        return {
+            "user_id": user_id,
+            "history": history,
+            "profile": profile,
             "export_time": datetime.now().isoformat()
         }
+    
+    def _flush_journal(self, filepath, user_id=None):
+        """Append new memory records to the journal at filepath"""
+        with self._journal_lock:
+            journal = self._journals.get(filepath)
+            if journal is None:
+                journal = self._journals[filepath] = MemoryJournal(
+                    filepath, max_history=self.memory_store.max_history
+                )
         
+        written = journal.flush(self.memory_store, None if user_id is None else [user_id])
+        logger.info("✅ Appended %d memory records to %s", written, filepath)
+    
+    def _write_memory_export(self, filepath, memory_data):
+        """Write a memory snapshot to disk"""
         with open(filepath, 'w') as f:
             json.dump(memory_data, f, indent=2)
         
-        print(f"✅ Memory exported to {filepath}")
+        logger.info("✅ Memory exported to %s", filepath)
     
     def display_result(self, result, rank=1):
         """Pretty print a search result"""
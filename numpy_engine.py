@@ -0,0 +1,471 @@
+"""
+Memory-mapped brute-force search engine for small and medium corpora
+
+Below roughly 100k resources, an exact dot product over every vector takes
+well under a millisecond; the round trip to Qdrant costs more than the
+search itself. NumpyEngine answers the navigator's queries in-process from
+files exported out of a Qdrant collection:
+
+    vectors.npy            L2-normalized embeddings (float16 or float32)
+    ids.npy                Qdrant point ID of each row
+    payloads.jsonl         One JSON payload per row ...
+    payload_offsets.npy    ... and the byte offset where each row starts
+    masks_<field>.npy      Bit-packed row mask per value of each indexed field
+    geo.npy                Latitude/longitude of each row (NaN when unknown)
+    meta.json              Dimension, dtype and the values behind each mask
+
+Everything is opened with mmap, so worker processes serving the same
+directory share one copy of the pages through the OS page cache.
+
+NumpyEngine implements the subset of the QdrantClient API the navigator
+uses (query_points, search, count, retrieve, ...), so it drops in as the
+client:
+
+    export_collection(client, "numpy_engine")   # once, after setup_qdrant
+    nav = CommunityNavigator(client=NumpyEngine("numpy_engine"), model=model)
+
+Searches are always exact; SearchParams (HNSW ef, quantization) are
+ignored. The engine is read-only: re-export it after re-ingesting.
+"""
+
+import json
+import mmap
+import os
+
+import numpy as np
+
+from geo import EARTH_RADIUS_KM, GEO_FIELD
+from setup_qdrant import COLLECTION_NAME, INDEXED_FIELDS
+
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+# Rows scored per matrix product; bounds the float32 copy of float16 vectors
+CHUNK_ROWS = 16384
+
+
+class EnginePoint:
+    """Search result or retrieved record, shaped like qdrant's ScoredPoint"""
+
+    __slots__ = ("id", "version", "score", "payload")
+
+    def __init__(self, id, score, payload):
+        self.id = id
+        self.version = 0
+        self.score = score
+        self.payload = payload
+
+    def __repr__(self):
+        return f"EnginePoint(id={self.id!r}, score={self.score!r})"
+
+
+class _QueryResponse:
+    """Return value of query_points"""
+
+    def __init__(self, points):
+        self.points = points
+
+
+class _CountResult:
+    """Return value of count"""
+
+    def __init__(self, count):
+        self.count = count
+
+
+class _CollectionInfo:
+    """Return value of get_collection"""
+
+    def __init__(self, name, points_count):
+        self.name = name
+        self.points_count = points_count
+        self.vectors_count = points_count
+        self.status = "green"
+
+
+class _CollectionsResponse:
+    """Return value of get_collections"""
+
+    def __init__(self, collections):
+        self.collections = collections
+
+
+def _normalize(vectors):
+    """L2-normalize rows so dot products are cosine similarities"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _payload_values(payload, key):
+    """Keyword values of a payload field, as Qdrant indexes them"""
+    value = payload.get(key)
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def write_engine(path, ids, vectors, payloads, collection_name=COLLECTION_NAME, dtype="float16"):
+    """
+    Write engine files for in-memory arrays
+
+    Args:
+        path: Output directory
+        ids: Point ID per row
+        vectors: 2-D array of embeddings (normalized here)
+        payloads: Payload dict per row
+        collection_name: Collection the engine stands in for
+        dtype: "float16" (half the memory) or "float32"
+
+    Returns:
+        Number of rows written
+    """
+    payloads = list(payloads)
+    _start_engine(path)
+    _write_payloads(path, payloads)
+    return _finish_engine(path, list(ids), _normalize(vectors), payloads, collection_name, dtype)
+
+
+def export_collection(client, path, collection_name=COLLECTION_NAME, dtype="float16", batch_size=1024):
+    """
+    Export a Qdrant collection (vectors and payloads) as engine files
+
+    Points are scrolled batch by batch; payloads are streamed to disk and
+    vectors collected into one preallocated array.
+
+    Returns:
+        Number of rows written
+    """
+    total = client.count(collection_name=collection_name, exact=True).count
+    dimension = None
+    vectors = None
+    ids = []
+    payloads = []
+
+    _start_engine(path)
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        for record in records:
+            if vectors is None:
+                dimension = len(record.vector)
+                vectors = np.empty((total, dimension), dtype=np.float32)
+            vectors[len(ids)] = record.vector
+            ids.append(str(record.id))
+            payloads.append(record.payload)
+        if offset is None:
+            break
+
+    if vectors is None:
+        raise ValueError(f"Collection {collection_name} is empty")
+
+    _write_payloads(path, payloads)
+    return _finish_engine(path, ids, _normalize(vectors[:len(ids)]), payloads, collection_name, dtype)
+
+
+def _start_engine(path):
+    """Create the directory and retire the meta file of any previous export"""
+    os.makedirs(path, exist_ok=True)
+    # Until the new meta file is written the directory cannot be opened half-written
+    if os.path.exists(os.path.join(path, META_FILE)):
+        os.remove(os.path.join(path, META_FILE))
+
+
+def _write_payloads(path, payloads):
+    """Write payloads.jsonl and the byte offset of every row"""
+    offsets = np.zeros(len(payloads) + 1, dtype=np.int64)
+    with open(os.path.join(path, "payloads.jsonl"), "wb") as f:
+        for i, payload in enumerate(payloads):
+            line = json.dumps(payload).encode() + b"\n"
+            f.write(line)
+            offsets[i + 1] = offsets[i] + len(line)
+    np.save(os.path.join(path, "payload_offsets.npy"), offsets)
+
+
+def _finish_engine(path, ids, vectors, payloads, collection_name, dtype):
+    """Write vectors, IDs and filter masks, then the meta file that marks completion"""
+    if dtype not in ("float16", "float32"):
+        raise ValueError(f"Unsupported engine dtype: {dtype}")
+
+    np.save(os.path.join(path, "vectors.npy"), vectors.astype(dtype))
+    np.save(os.path.join(path, "ids.npy"), np.array(ids, dtype=str))
+
+    fields = {}
+    for key in INDEXED_FIELDS:
+        rows_by_value = {}
+        for row, payload in enumerate(payloads):
+            for value in _payload_values(payload, key):
+                rows_by_value.setdefault(value, []).append(row)
+
+        values = sorted(rows_by_value)
+        # One bit per row keeps masks for many values (e.g. the 672 weekly
+        # open_slots) cheap to build and map
+        masks = np.zeros((len(values), (len(ids) + 7) // 8), dtype=np.uint8)
+        for i, value in enumerate(values):
+            row_mask = np.zeros(len(ids), dtype=bool)
+            row_mask[rows_by_value[value]] = True
+            masks[i] = np.packbits(row_mask)
+        np.save(os.path.join(path, f"masks_{key}.npy"), masks)
+        fields[key] = values
+
+    geo = np.full((len(ids), 2), np.nan)
+    for row, payload in enumerate(payloads):
+        point = payload.get(GEO_FIELD)
+        if point:
+            geo[row] = point["lat"], point["lon"]
+    np.save(os.path.join(path, "geo.npy"), geo)
+
+    with open(os.path.join(path, META_FILE), "w") as f:
+        json.dump({
+            "format_version": FORMAT_VERSION,
+            "collection_name": collection_name,
+            "count": len(ids),
+            "dimension": int(vectors.shape[1]),
+            "dtype": dtype,
+            "fields": fields
+        }, f)
+    return len(ids)
+
+
+class NumpyEngine:
+    """
+    Exact in-process search over memory-mapped engine files
+
+    Qdrant filters built by ResourceFilter.to_qdrant (geo radius and
+    bounding box included) and the navigator's seen-resource exclusion are
+    evaluated as boolean row masks; any other condition raises ValueError.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Directory written by write_engine or export_collection
+        """
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        if self.meta["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported engine format {self.meta['format_version']} in {path}")
+
+        self.path = path
+        self.collection_name = self.meta["collection_name"]
+        self._vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self._ids = np.load(os.path.join(path, "ids.npy"), mmap_mode="r")
+        self._offsets = np.load(os.path.join(path, "payload_offsets.npy"), mmap_mode="r")
+        self._masks = {
+            key: np.load(os.path.join(path, f"masks_{key}.npy"), mmap_mode="r")
+            for key in self.meta["fields"]
+        }
+        self._value_rows = {
+            key: {value: i for i, value in enumerate(values)}
+            for key, values in self.meta["fields"].items()
+        }
+
+        # Engines exported before geo payloads existed have no coordinates
+        geo_path = os.path.join(path, "geo.npy")
+        self._geo = np.load(geo_path, mmap_mode="r") if os.path.exists(geo_path) else None
+
+        self._payload_file = open(os.path.join(path, "payloads.jsonl"), "rb")
+        self._payloads = mmap.mmap(self._payload_file.fileno(), 0, access=mmap.ACCESS_READ)
+        # Point ID -> row, built on the first ID lookup
+        self._rows_by_id = None
+
+    def __len__(self):
+        return len(self._vectors)
+
+    # -- QdrantClient-compatible API ---------------------------------------
+
+    def query_points(self, collection_name, query, limit=10, query_filter=None,
+                     search_params=None, with_payload=True, **kwargs):
+        """Exact top-k search for one vector"""
+        self._check_collection(collection_name)
+        return _QueryResponse(self._search([query], [query_filter], [limit])[0])
+
+    def query_batch_points(self, collection_name, requests, **kwargs):
+        """Exact top-k search for several QueryRequests"""
+        self._check_collection(collection_name)
+        batch = self._search(
+            [r.query for r in requests],
+            [r.filter for r in requests],
+            [r.limit for r in requests]
+        )
+        return [_QueryResponse(points) for points in batch]
+
+    def search(self, collection_name, query_vector, query_filter=None, search_params=None,
+               limit=10, with_payload=True, **kwargs):
+        """Exact top-k search for one vector (legacy client API)"""
+        self._check_collection(collection_name)
+        return self._search([query_vector], [query_filter], [limit])[0]
+
+    def search_batch(self, collection_name, requests, **kwargs):
+        """Exact top-k search for several SearchRequests (legacy client API)"""
+        self._check_collection(collection_name)
+        return self._search(
+            [r.vector for r in requests],
+            [r.filter for r in requests],
+            [r.limit for r in requests]
+        )
+
+    def count(self, collection_name, count_filter=None, exact=True, **kwargs):
+        """Number of rows matching a filter (always exact)"""
+        self._check_collection(collection_name)
+        mask = self._filter_mask(count_filter)
+        return _CountResult(len(self) if mask is None else int(np.count_nonzero(mask)))
+
+    def retrieve(self, collection_name, ids, with_payload=True, **kwargs):
+        """Records for point IDs; unknown IDs are skipped"""
+        self._check_collection(collection_name)
+        rows_by_id = self._row_index()
+        rows = [rows_by_id[str(point_id)] for point_id in ids if str(point_id) in rows_by_id]
+        return [EnginePoint(str(self._ids[row]), None, self._payload(row)) for row in rows]
+
+    def get_collection(self, collection_name):
+        self._check_collection(collection_name)
+        return _CollectionInfo(self.collection_name, len(self))
+
+    def get_collections(self):
+        return _CollectionsResponse([_CollectionInfo(self.collection_name, len(self))])
+
+    def close(self):
+        """Release the payload mapping (vector maps close with the arrays)"""
+        self._payloads.close()
+        self._payload_file.close()
+
+    # -- Search --------------------------------------------------------------
+
+    def _search(self, query_vectors, query_filters, limits):
+        """
+        Top-k rows for each query
+
+        Unfiltered queries are scored together in one pass over the
+        vectors; filtered queries only score their matching rows.
+        """
+        if not query_vectors:
+            return []
+        queries = _normalize(query_vectors)
+        results = [None] * len(queries)
+
+        masks = [self._filter_mask(query_filter) for query_filter in query_filters]
+        unfiltered = [i for i, mask in enumerate(masks) if mask is None]
+        if unfiltered:
+            scores = self._scores(queries[unfiltered])
+            for column, i in enumerate(unfiltered):
+                results[i] = self._top_k(scores[:, column], None, limits[i])
+
+        for i, mask in enumerate(masks):
+            if mask is not None:
+                rows = np.flatnonzero(mask)
+                results[i] = self._top_k(self._scores(queries[i:i + 1], rows)[:, 0], rows, limits[i])
+        return results
+
+    def _scores(self, queries, rows=None):
+        """
+        Dot products of queries (q, d) with all rows, or the given rows
+
+        Returns:
+            float32 array of shape (rows, q)
+        """
+        n_rows = len(self._vectors) if rows is None else len(rows)
+        scores = np.empty((n_rows, len(queries)), dtype=np.float32)
+        for start in range(0, n_rows, CHUNK_ROWS):
+            end = min(start + CHUNK_ROWS, n_rows)
+            block = self._vectors[start:end] if rows is None else self._vectors[rows[start:end]]
+            # float16 has no BLAS path; upcasting a chunk keeps the copy small
+            scores[start:end] = block.astype(np.float32, copy=False) @ queries.T
+        return scores
+
+    def _top_k(self, scores, rows, limit):
+        """Best rows of one query's scores, as EnginePoints"""
+        if limit <= 0 or len(scores) == 0:
+            return []
+        if limit < len(scores):
+            best = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best])]
+
+        points = []
+        for i in best:
+            row = int(i) if rows is None else int(rows[i])
+            points.append(EnginePoint(str(self._ids[row]), float(scores[i]), self._payload(row)))
+        return points
+
+    def _payload(self, row):
+        return json.loads(self._payloads[self._offsets[row]:self._offsets[row + 1]])
+
+    # -- Filters -------------------------------------------------------------
+
+    def _filter_mask(self, query_filter):
+        """Boolean row mask of a Qdrant Filter, or None when unfiltered"""
+        if query_filter is None:
+            return None
+        if getattr(query_filter, "should", None):
+            raise ValueError("NumpyEngine does not support 'should' filters")
+
+        mask = None
+        for condition in query_filter.must or ():
+            condition_mask = self._condition_mask(condition)
+            mask = condition_mask if mask is None else mask & condition_mask
+        for condition in query_filter.must_not or ():
+            condition_mask = ~self._condition_mask(condition)
+            mask = condition_mask if mask is None else mask & condition_mask
+        return mask
+
+    def _condition_mask(self, condition):
+        """Rows satisfying one FieldCondition or HasIdCondition"""
+        mask = np.zeros(len(self), dtype=bool)
+
+        if hasattr(condition, "has_id"):
+            rows_by_id = self._row_index()
+            rows = [rows_by_id[str(point_id)] for point_id in condition.has_id if str(point_id) in rows_by_id]
+            mask[rows] = True
+            return mask
+
+        if any(getattr(condition, name, None) is not None for name in ("geo_radius", "geo_bounding_box")):
+            return self._geo_mask(condition)
+
+        key = getattr(condition, "key", None)
+        match = getattr(condition, "match", None)
+        if key not in self._masks or not (hasattr(match, "any") or hasattr(match, "value")):
+            raise ValueError(f"NumpyEngine cannot filter on {condition!r}")
+
+        values = match.any if hasattr(match, "any") else [match.value]
+        for value in values:
+            i = self._value_rows[key].get(value)
+            if i is not None:
+                mask |= np.unpackbits(self._masks[key][i], count=len(self)).astype(bool)
+        return mask
+
+    def _geo_mask(self, condition):
+        """Rows inside a geo_radius or geo_bounding_box condition"""
+        if self._geo is None:
+            raise ValueError(f"NumpyEngine at {self.path} has no coordinates; re-export it")
+        lat, lon = self._geo[:, 0], self._geo[:, 1]
+
+        # NaN coordinates compare False, so unplaced resources never match
+        if getattr(condition, "geo_radius", None) is not None:
+            center = condition.geo_radius.center
+            lat, lon = np.radians(lat), np.radians(lon)
+            center_lat, center_lon = np.radians(center.lat), np.radians(center.lon)
+            a = (np.sin((lat - center_lat) / 2) ** 2
+                 + np.cos(lat) * np.cos(center_lat) * np.sin((lon - center_lon) / 2) ** 2)
+            meters = 2 * EARTH_RADIUS_KM * 1000 * np.arcsin(np.sqrt(a))
+            return meters <= condition.geo_radius.radius
+
+        box = condition.geo_bounding_box
+        return ((lat <= box.top_left.lat) & (lat >= box.bottom_right.lat)
+                & (lon >= box.top_left.lon) & (lon <= box.bottom_right.lon))
+
+    def _row_index(self):
+        """Point ID -> row mapping"""
+        if self._rows_by_id is None:
+            self._rows_by_id = {str(point_id): row for row, point_id in enumerate(self._ids)}
+        return self._rows_by_id
+
+    def _check_collection(self, collection_name):
+        if collection_name != self.collection_name:
+            raise ValueError(f"NumpyEngine at {self.path} serves {self.collection_name}, not {collection_name}")
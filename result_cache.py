@@ -0,0 +1,97 @@
+"""
+Search result cache for the Community Navigator
+
+Identical searches (same normalized query, filter, top_k and search
+options) are common: popular queries, retries, and the "community services"
+cold-start fallback of get_recommendations. ResultCache keeps their Qdrant
+results, least-recently-used first eviction with a TTL.
+
+Keys include the collection version from setup_qdrant.collection_version,
+which every upsert bumps, so entries computed before the collection changed
+are never served again. Changes made by another process are only picked
+up when entries expire, so keep the TTL short against a shared server.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Bounded LRU/TTL cache of (query vector, results) per search key
+
+    The query vector is kept with the results so a cache hit can still
+    update the user's interest vector without re-encoding the query.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=300):
+        """
+        Args:
+            max_entries: Maximum number of cached searches (0 disables caching)
+            ttl_seconds: Seconds before an entry expires (None for no expiry)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached (query_vector, results), or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            query_vector, results, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return query_vector, list(results)
+
+    def put(self, key, query_vector, results):
+        """Cache the outcome of a search, evicting old entries as needed"""
+        if self.max_entries <= 0:
+            return
+
+        expires_at = None
+        if self.ttl_seconds is not None:
+            expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            self._entries.pop(key, None)
+            # Stored as a tuple so callers can't mutate the cached ranking
+            self._entries[key] = (query_vector, tuple(results), expires_at)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,388 @@
+"""
+HTTP/JSON service for the Community Navigator
+
+One process loads the embedding model and opens the Qdrant client once,
+then serves any number of front ends over plain HTTP:
+
+    POST /search            {"query", "filter", "top_k", "user_id", "hybrid", "hnsw_ef", "deadline_ms", "open_at"}
+    POST /search/batch      {"queries", "filters", "top_k", "user_id", "hybrid", "hnsw_ef", "deadline_ms", "open_at"}
+    GET  /recommendations   ?user_id=...&top_k=3&deadline_ms=...
+    GET  /history           ?user_id=...
+    GET  /healthz           the process is up
+    GET  /readyz            the model and collection are loaded (503 until then)
+    GET  /metrics           stage timings, when the navigator has a PrometheusTextSink
+
+Requests run on a thread each (ThreadingHTTPServer) against one shared
+CommunityNavigator, whose caches and memory store are thread-safe.
+Connections are HTTP/1.1 keep-alive, so a front end reuses one socket for
+many requests. Concurrent queries are coalesced into batched model calls by
+batching.MicroBatchEncoder. With regional collections, a "filter" of
+{"regions": [...]} routes a search; without one it fans out to every region.
+top_k defaults to 5 (3 for recommendations) and must be 1..MAX_TOP_K.
+
+    python server.py --storage qdrant_storage --port 8080
+    curl -s localhost:8080/search -d '{"query": "free clinic", "filter": "Healthcare"}'
+"""
+
+import argparse
+import functools
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from navigator import CommunityNavigator
+
+logger = logging.getLogger(__name__)
+
+# Larger request bodies are rejected with 413
+MAX_BODY_BYTES = 1024 * 1024
+MAX_TOP_K = 100
+
+
+class HTTPError(Exception):
+    """Error reported to the client with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def result_to_dict(point):
+    """JSON form of a search result"""
+    return {"id": str(point.id), "score": point.score, "payload": point.payload}
+
+
+def _optional_number(value, name):
+    """Parse an optional numeric request field"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"{name} must be a number")
+
+
+def _optional_int(value, name):
+    """Parse an optional integer request field"""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"{name} must be an integer")
+
+
+def _top_k(value, default):
+    """Parse the top_k request field: default when absent, 400 outside 1..MAX_TOP_K"""
+    top_k = _optional_int(value, "top_k")
+    if top_k is None:
+        return default
+    if not 1 <= top_k <= MAX_TOP_K:
+        raise HTTPError(400, f"top_k must be between 1 and {MAX_TOP_K}")
+    return top_k
+
+
+class NavigatorHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer sharing one CommunityNavigator across requests"""
+
+    # Handler threads must not keep the process alive on shutdown
+    daemon_threads = True
+
+    def __init__(self, address, navigator, idle_timeout=30):
+        """
+        Args:
+            address: (host, port) to listen on
+            navigator: CommunityNavigator used by every request
+            idle_timeout: Seconds a keep-alive connection may stay idle
+        """
+        super().__init__(address, NavigatorRequestHandler)
+        self.navigator = navigator
+        self.idle_timeout = idle_timeout
+        self.started_at = time.monotonic()
+        self.ready = threading.Event()
+        self.warmup_error = None
+
+    def warmup(self):
+        """Load the model and collection, then report ready"""
+        try:
+            self.navigator.warmup()
+        except Exception as exc:
+            # /readyz keeps failing and says why
+            self.warmup_error = str(exc)
+            logger.exception("❌ Navigator warmup failed")
+            return
+        self.ready.set()
+        logger.info("✅ Navigator ready on %s:%d", *self.server_address[:2])
+
+
+class NavigatorRequestHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the server's navigator"""
+
+    # HTTP/1.1 keeps connections open between requests
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        # Applies to each read, so idle keep-alive sockets are closed
+        self.timeout = self.server.idle_timeout
+        super().setup()
+
+    def do_GET(self):
+        self._dispatch({
+            "/healthz": self._health,
+            "/readyz": self._readiness,
+            "/metrics": self._metrics,
+            "/recommendations": self._recommendations,
+            "/history": self._history,
+        })
+
+    def do_POST(self):
+        self._dispatch({
+            "/search": self._search,
+            "/search/batch": self._search_batch,
+        })
+
+    def _dispatch(self, routes):
+        """Run the route for the request path and write its response"""
+        url = urlsplit(self.path)
+        route = routes.get(url.path.rstrip("/") or "/")
+        start = time.perf_counter()
+        try:
+            # POST bodies are read first so the connection stays usable
+            # whatever the route answers
+            request_body = self._json_body() if self.command == "POST" else None
+            if route is None:
+                raise HTTPError(404, f"No route for {self.command} {url.path}")
+            status, body = route({k: v[-1] for k, v in parse_qs(url.query).items()}, request_body)
+        except HTTPError as exc:
+            status, body = exc.status, {"error": str(exc)}
+        except (ValueError, KeyError, TypeError) as exc:
+            status, body = 400, {"error": f"Invalid request: {exc}"}
+        except Exception:
+            logger.exception("❌ %s %s failed", self.command, url.path)
+            status, body = 500, {"error": "Internal server error"}
+
+        self._send(status, body)
+        logger.debug("%s %s -> %d in %.1fms", self.command, url.path, status,
+                     (time.perf_counter() - start) * 1000)
+
+    def _send(self, status, body):
+        """Write a JSON (or, for str bodies, plain text) response"""
+        if isinstance(body, str):
+            data, content_type = body.encode(), "text/plain; version=0.0.4"
+        else:
+            data, content_type = json.dumps(body).encode(), "application/json"
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        # Keep-alive needs an exact length to find the next request
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json_body(self):
+        """Parse the request body as a JSON object"""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            # Drop the connection rather than drain an oversized body
+            self.close_connection = True
+            raise HTTPError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return body
+
+    def _require_ready(self):
+        """Reject work until warmup has finished"""
+        if not self.server.ready.is_set():
+            raise HTTPError(503, "Navigator is still loading")
+
+    def _health(self, params, body):
+        return 200, {"status": "ok", "uptime_seconds": time.monotonic() - self.server.started_at}
+
+    def _readiness(self, params, body):
+        if self.server.ready.is_set():
+            return 200, {"status": "ready"}
+        if self.server.warmup_error is not None:
+            return 503, {"status": "failed", "error": self.server.warmup_error}
+        return 503, {"status": "loading"}
+
+    def _metrics(self, params, body):
+        render = getattr(self.server.navigator.metrics, "render", None)
+        if render is None:
+            raise HTTPError(404, "The navigator's metrics sink cannot be rendered")
+        return 200, render()
+
+    def _search(self, params, body):
+        self._require_ready()
+        if not isinstance(body.get("query"), str) or not body["query"].strip():
+            raise HTTPError(400, "query must be a non-empty string")
+
+        results = self.server.navigator.search_resources(
+            body["query"],
+            category_filter=body.get("filter"),
+            top_k=_top_k(body.get("top_k"), 5),
+            user_id=body.get("user_id"),
+            hybrid=body.get("hybrid"),
+            hnsw_ef=_optional_int(body.get("hnsw_ef"), "hnsw_ef"),
+            deadline_ms=_optional_number(body.get("deadline_ms"), "deadline_ms"),
+            open_at=body.get("open_at")
+        )
+        return 200, {
+            "results": [result_to_dict(point) for point in results],
+            "degradation": results.degradation
+        }
+
+    def _search_batch(self, params, body):
+        self._require_ready()
+        queries = body.get("queries")
+        if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+            raise HTTPError(400, "queries must be a list of strings")
+
+        batch_results = self.server.navigator.search_resources_batch(
+            queries,
+            category_filters=body.get("filters"),
+            top_k=_top_k(body.get("top_k"), 5),
+            user_id=body.get("user_id"),
+            hybrid=body.get("hybrid"),
+            hnsw_ef=_optional_int(body.get("hnsw_ef"), "hnsw_ef"),
+            deadline_ms=_optional_number(body.get("deadline_ms"), "deadline_ms"),
+            open_at=body.get("open_at")
+        )
+        return 200, {
+            "results": [[result_to_dict(point) for point in results] for results in batch_results],
+            "degradation": [results.degradation for results in batch_results]
+        }
+
+    def _recommendations(self, params, body):
+        self._require_ready()
+        results = self.server.navigator.get_recommendations(
+            top_k=_top_k(params.get("top_k"), 3),
+            user_id=params.get("user_id"),
+            deadline_ms=_optional_number(params.get("deadline_ms"), "deadline_ms")
+        )
+        return 200, {
+            "results": [result_to_dict(point) for point in results],
+            "degradation": results.degradation
+        }
+
+    def _history(self, params, body):
+        history = self.server.navigator.get_user_history(user_id=params.get("user_id"))
+        # The interest vector is an internal embedding, not history
+        history["profile"].pop("interest_vector", None)
+        return 200, history
+
+    def log_message(self, format, *args):
+        # Route http.server's access log through logging instead of stderr
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def serve(navigator, host="127.0.0.1", port=8080, idle_timeout=30):
+    """
+    Serve a navigator until interrupted
+
+    The socket is bound immediately and /healthz answers while the
+    navigator warms up in the background; /readyz and the query endpoints
+    report 503 until it is done.
+
+    Args:
+        navigator: CommunityNavigator shared by every request
+        host: Interface to bind
+        port: Port to listen on
+        idle_timeout: Seconds a keep-alive connection may stay idle
+    """
+    server = NavigatorHTTPServer((host, port), navigator, idle_timeout=idle_timeout)
+    threading.Thread(target=server.warmup, name="navigator-warmup", daemon=True).start()
+
+    logger.info("🌐 Serving Community Navigator on http://%s:%d", host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve the Community Navigator over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--storage", dest="storage_path", default=None,
+                        help="Directory of a collection built by setup_qdrant.py --storage")
+    parser.add_argument("--url", default=None, help="Qdrant server URL")
+    parser.add_argument("--numpy-engine", default=None,
+                        help="Serve from engine files written by numpy_engine.export_collection")
+    parser.add_argument("--sparse-index", default=None,
+                        help="BM25 index saved by setup_qdrant, enabling hybrid search")
+    parser.add_argument("--encoder", dest="encoder_backend", default=None,
+                        choices=["torch", "onnx", "int8"],
+                        help="Embedding backend (default: $NAVIGATOR_ENCODER or torch)")
+    parser.add_argument("--regions", default=None,
+                        help="Comma-separated regional collections (default: those recorded in --storage)")
+    parser.add_argument("--shard-timeout-ms", type=float, default=None,
+                        help="Leave out regional collections that take longer to answer")
+    parser.add_argument("--batch-wait-ms", type=float, default=2.0,
+                        help="Wait for concurrent queries to batch encoding (0 disables)")
+    parser.add_argument("--idle-timeout", type=float, default=30,
+                        help="Seconds before an idle keep-alive connection is closed")
+    parser.add_argument("--log-level", default="INFO")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s %(message)s")
+
+    if not (args.storage_path or args.url or args.numpy_engine):
+        raise SystemExit("Pass --storage, --url or --numpy-engine: an in-memory collection would be empty")
+
+    from metrics import PrometheusTextSink
+
+    model = None
+    if args.batch_wait_ms > 0:
+        from batching import MicroBatchEncoder
+        from setup_qdrant import load_model
+
+        # Loaded by the warmup thread once the socket is bound, so /readyz reports 503 meanwhile
+        model = MicroBatchEncoder(
+            model_factory=functools.partial(load_model, backend=args.encoder_backend),
+            max_wait_ms=args.batch_wait_ms
+        )
+
+    regions = args.regions.split(",") if args.regions else None
+    if regions is None and args.storage_path:
+        from setup_qdrant import load_regions
+
+        regions = load_regions(args.storage_path)
+
+    client = None
+    if args.numpy_engine:
+        from numpy_engine import NumpyEngine
+
+        client = NumpyEngine(args.numpy_engine)
+
+    navigator = CommunityNavigator(
+        client=client,
+        model=model,
+        storage_path=args.storage_path,
+        url=args.url,
+        encoder_backend=args.encoder_backend,
+        sparse_index=args.sparse_index,
+        metrics=PrometheusTextSink(),
+        regions=regions,
+        shard_timeout_ms=args.shard_timeout_ms
+    )
+    try:
+        serve(navigator, host=args.host, port=args.port, idle_timeout=args.idle_timeout)
+    finally:
+        if model is not None:
+            model.close()
+
+
+if __name__ == "__main__":
+    main()
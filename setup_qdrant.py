@@ -1,12 +1,46 @@
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
-from sentence_transformers import SentenceTransformer
-import pandas as pd
+# qdrant_client, sentence_transformers (torch) and pandas are imported
+# inside the functions that need them, so importing this module stays cheap
+import argparse
+import csv
+import hashlib
+import json
+import queue
+import shutil
+import tarfile
+import threading
+import time
 import uuid
 import os
+import re
 
-def create_sample_data():
-    """Create sample community resources dataset"""
+COLLECTION_NAME = "community_resources"
+MODEL_NAME = 'all-MiniLM-L6-v2'
+VECTOR_SIZE = 384
+DEFAULT_CSV_PATH = 'data/community_resources.csv'
+PAYLOAD_FIELDS = ["name", "category", "description", "location", "contact", "hours", "services"]
+MANIFEST_FILE = "navigator_manifest.json"
+SPARSE_INDEX_FILE = "sparse_index.npz"
+EMBEDDING_CACHE_FILE = "embedding_cache.db"
+REGIONS_FILE = "regions.json"
+# Optional CSV column naming the region (community) a resource belongs to
+REGION_COLUMN = "region"
+# Payload indexes backing filters.ResourceFilter
+INDEXED_FIELDS = ["category", "service_tags", "district", "region", "open_slots", "open_months"]
+# Indexed fields holding integers (hours.hours_payload); the rest are keywords
+INTEGER_FIELDS = ["open_slots", "open_months"]
+# Bump when build_payload or point IDs change so older collections are rebuilt
+PAYLOAD_SCHEMA_VERSION = 6
+QUANTIZATION_KINDS = ["scalar", "binary"]
+# Namespace of the deterministic point IDs assigned by point_id()
+POINT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "community-navigator/resources")
+
+# In-process version counter per collection, bumped by every write so
+# result caches keyed on it never serve results from before the change
+_collection_versions = {}
+_versions_lock = threading.Lock()
+
+def sample_resources():
+    """Sample community resources as a list of dicts"""
     resources = [
         {
             "name": "City Community Health Clinic",
@@ -235,69 +269,1146 @@ def create_sample_data():
         }
     ]
     
-    df = pd.DataFrame(resources)
+    return resources
+
+def create_sample_data():
+    """Create sample community resources dataset"""
+    import pandas as pd
+    
+    df = pd.DataFrame(sample_resources())
     return df
 
-def setup_qdrant():
-    """Initialize Qdrant and load data"""
+def write_sample_csv(csv_path=DEFAULT_CSV_PATH):
+    """Write the sample resources to CSV without loading pandas"""
+    resources = sample_resources()
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=PAYLOAD_FIELDS)
+        writer.writeheader()
+        writer.writerows(resources)
+    return len(resources)
+
+def load_model(model_name=MODEL_NAME, backend=None):
+    """
+    Load the embedding model for the configured encoder backend
+    
+    backend is "torch", "onnx" or "int8" (default: the NAVIGATOR_ENCODER
+    environment variable, else torch); see encoders.py.
+    """
+    from encoders import create_encoder
+    
+    return create_encoder(backend, model_name)
+
+def resource_text(row):
+    """Combine text fields for rich embedding"""
+    return f"{row['name']} {row['category']} {row['description']} {row['services']}"
+
+def split_services(services):
+    """Split a comma-separated services string into individual service tags"""
+    return [s.strip() for s in services.split(",") if s.strip()]
+
+def location_district(location):
+    """District part of a "street, district" location (empty if missing)"""
+    _, comma, district = location.rpartition(",")
+    return district.strip() if comma else ""
+
+def build_payload(row):
+    """
+    Build the Qdrant payload stored alongside a resource vector
+
+    Besides the CSV columns, the payload carries the derived keyword
+    fields ``service_tags``, ``district`` and ``region`` (from an optional
+    REGION_COLUMN) that ResourceFilter matches on,
+    the parsed opening hours (``open_slots``, ``open_months`` and
+    ``hours_bitmap``, see hours.hours_payload), the ``geo`` coordinates of
+    the location from the local gazetteer (see geo.py), and the hashes
+    sync_csv compares: ``content_hash`` of the embedded text and
+    ``payload_hash`` of everything else.
+    """
+    from embedding_cache import text_hash
+    from geo import GEO_FIELD, geo_payload
+    from hours import hours_payload
+
+    payload = {field: row[field] for field in PAYLOAD_FIELDS}
+    payload["service_tags"] = split_services(row["services"])
+    payload["district"] = location_district(row["location"])
+    payload["region"] = (row.get(REGION_COLUMN) or "").strip()
+    payload.update(hours_payload(row["hours"]))
+    payload[GEO_FIELD] = geo_payload(row["location"])
+    payload["payload_hash"] = text_hash(json.dumps(payload, sort_keys=True))
+    payload["content_hash"] = text_hash(resource_text(row))
+    return payload
+
+def resource_key(row):
+    """
+    Stable identity of a resource across CSV revisions
+
+    An explicit ``resource_id`` column wins; otherwise the resource is
+    identified by its name and location, so edits to any other field keep
+    its point ID.
+    """
+    if row.get("resource_id"):
+        return str(row["resource_id"])
+    return " ".join(f"{row['name']}|{row['location']}".lower().split())
+
+def region_collection(region):
+    """Collection holding one region's resources when collections are sharded by region"""
+    slug = re.sub(r"[^a-z0-9]+", "_", region.lower()).strip("_")
+    if not slug:
+        raise ValueError(f"Region {region!r} has no usable collection name")
+    return f"{COLLECTION_NAME}_{slug}"
+
+def split_csv_by_region(csv_path, output_dir, region_column=REGION_COLUMN):
+    """
+    Write the rows of each region to a CSV of their own
+    
+    The region is stored under REGION_COLUMN whatever its source column is
+    called, so build_payload records it. Rows without a region are skipped.
+    
+    Returns:
+        Dict of region -> CSV path
+    """
+    paths, writers, files = {}, {}, []
+    regions_by_collection = {}
+    skipped = 0
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        if region_column not in (reader.fieldnames or []):
+            raise ValueError(f"{csv_path} has no {region_column!r} column")
+        fieldnames = [name for name in reader.fieldnames if name not in (region_column, REGION_COLUMN)]
+        fieldnames.append(REGION_COLUMN)
+        
+        try:
+            for row in reader:
+                region = (row.pop(region_column) or "").strip()
+                if not region:
+                    skipped += 1
+                    continue
+                row[REGION_COLUMN] = region
+                
+                writer = writers.get(region)
+                if writer is None:
+                    collection_name = region_collection(region)
+                    if collection_name in regions_by_collection:
+                        raise ValueError(f"Regions {regions_by_collection[collection_name]!r} and {region!r} "
+                                         f"map to the same collection {collection_name}")
+                    regions_by_collection[collection_name] = region
+                    
+                    paths[region] = os.path.join(output_dir, f"{collection_name}.csv")
+                    out = open(paths[region], 'w', newline='', encoding='utf-8')
+                    files.append(out)
+                    writer = writers[region] = csv.DictWriter(out, fieldnames=fieldnames)
+                    writer.writeheader()
+                writer.writerow(row)
+        finally:
+            for out in files:
+                out.close()
+    
+    if skipped:
+        print(f"⚠️  Skipped {skipped} rows without a {region_column}")
+    return paths
+
+def regions_path_for(storage_path):
+    """Where setup_regions records the regions of a storage directory"""
+    return os.path.join(storage_path, REGIONS_FILE)
+
+def load_regions(storage_path):
+    """Regions built into storage_path by setup_regions, or None for a single collection"""
+    path = regions_path_for(storage_path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["regions"]
+
+def collection_version(collection_name=COLLECTION_NAME):
+    """Current version of a collection (changes whenever this process writes to it)"""
+    return _collection_versions.get(collection_name, 0)
+
+def bump_collection_version(collection_name=COLLECTION_NAME):
+    """Record a write to a collection; returns the new version"""
+    with _versions_lock:
+        version = _collection_versions.get(collection_name, 0) + 1
+        _collection_versions[collection_name] = version
+    return version
+
+def _upsert_writer(client, collection_name, buffer, state):
+    """
+    Drain point batches from the in-flight buffer into Qdrant
+
+    Runs on a background thread so encoding the next batch overlaps with
+    the upsert of the previous one. After a failure the writer keeps
+    draining (and discarding) so the producer never blocks on a full buffer.
+
+    An item is a list of points to upsert, or a (write, items) pair for any
+    other update, called as write(client, collection_name, items). Writes
+    are therefore applied one at a time in the order they were queued.
+    """
+    while True:
+        points = buffer.get()
+        if points is None:
+            return
+        if state["error"] is not None:
+            continue
+        try:
+            if isinstance(points, tuple):
+                write, items = points
+                write(client, collection_name, items)
+                continue
+            client.upsert(collection_name=collection_name, points=points)
+            bump_collection_version(collection_name)
+            state["uploaded"] += len(points)
+        except Exception as e:
+            state["error"] = e
+
+def point_id(key):
+    """
+    Deterministic point ID of a resource key (see resource_key)
+
+    The same resource keeps its ID across ingests, so re-ingesting or
+    syncing overwrites points instead of duplicating them.
+    """
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, key))
+
+def _read_batches(csv_path, chunk_size, batch_size):
+    """Yield (keys, rows, ends_chunk) for consecutive batches of the CSV"""
+    import pandas as pd
+
+    # Repeated keys get an occurrence suffix so no row overwrites another
+    occurrences = {}
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+        records = chunk.to_dict('records')
+        for i in range(0, len(records), batch_size):
+            batch = records[i:i + batch_size]
+            keys = []
+            for row in batch:
+                key = resource_key(row)
+                count = occurrences[key] = occurrences.get(key, 0) + 1
+                keys.append(key if count == 1 else f"{key}#{count}")
+            yield keys, batch, i + batch_size >= len(records)
+
+def _build_points(keys, batch, vectors):
+    """Qdrant points for a batch of CSV rows and their vectors"""
+    from qdrant_client.models import PointStruct
+
+    return [
+        PointStruct(id=point_id(key), vector=vector.tolist(), payload=build_payload(row))
+        for key, row, vector in zip(keys, batch, vectors)
+    ]
+
+def _write_encoded_batches(client, collection_name, encoded_batches, max_in_flight, sparse_index):
+    """
+    Upload encoded batches through one writer thread
+
+    Args:
+        encoded_batches: Iterable of (keys, rows, vectors, ends_chunk) in
+            CSV order
+
+    Returns:
+        Dict with ``rows``, ``seconds`` and ``rows_per_sec``
+    """
+    buffer = queue.Queue(maxsize=max_in_flight)
+    state = {"uploaded": 0, "error": None}
+    writer = threading.Thread(
+        target=_upsert_writer,
+        args=(client, collection_name, buffer, state),
+        daemon=True
+    )
+    writer.start()
+
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for keys, batch, vectors, ends_chunk in encoded_batches:
+            points = _build_points(keys, batch, vectors)
+            buffer.put(points)
+            if sparse_index is not None:
+                from sparse_index import sparse_text
+
+                for point, row in zip(points, batch):
+                    sparse_index.add(point.id, sparse_text(row))
+            if state["error"] is not None:
+                raise state["error"]
+            rows += len(points)
+
+            if ends_chunk:
+                elapsed = time.perf_counter() - start
+                print(f"   ...{rows} rows encoded ({rows / elapsed:.1f} rows/sec)")
+    finally:
+        buffer.put(None)
+        writer.join()
+
+    if state["error"] is not None:
+        raise state["error"]
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": state["uploaded"],
+        "seconds": seconds,
+        "rows_per_sec": state["uploaded"] / seconds if seconds > 0 else 0.0
+    }
+
+def ingest_csv(client, model, csv_path, collection_name=COLLECTION_NAME,
+               chunk_size=1000, batch_size=64, max_in_flight=4, sparse_index=None):
+    """
+    Stream a resources CSV into Qdrant without holding the corpus in memory
+
+    The CSV is read ``chunk_size`` rows at a time, each chunk is encoded in
+    batches of ``batch_size`` and handed to a writer thread as soon as it is
+    ready. At most ``max_in_flight`` encoded batches wait for upload, which
+    bounds memory no matter how large the file is.
+
+    Args:
+        client: QdrantClient with the target collection already created
+        model: Embedding model exposing ``encode(list_of_texts)``
+        csv_path: Path to a CSV with the PAYLOAD_FIELDS columns
+        collection_name: Target collection
+        chunk_size: Rows read from disk per chunk
+        batch_size: Texts per ``model.encode`` call and per upsert
+        max_in_flight: Encoded batches allowed to wait for upload
+        sparse_index: Optional sparse_index.BM25Index that every row is
+            added to under its point ID, for hybrid search
+
+    Returns:
+        Dict with ``rows``, ``seconds`` and ``rows_per_sec``
+    """
+    encoded_batches = (
+        (keys, batch, model.encode([resource_text(row) for row in batch], batch_size=batch_size), ends_chunk)
+        for keys, batch, ends_chunk in _read_batches(csv_path, chunk_size, batch_size)
+    )
+    return _write_encoded_batches(client, collection_name, encoded_batches, max_in_flight, sparse_index)
+
+def _existing_hashes(client, collection_name, batch_size=1024):
+    """Point ID -> (content_hash, payload_hash) of every point in a collection"""
+    hashes = {}
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=["content_hash", "payload_hash"],
+            with_vectors=False
+        )
+        for record in records:
+            payload = record.payload or {}
+            hashes[str(record.id)] = (payload.get("content_hash"), payload.get("payload_hash"))
+        if offset is None:
+            return hashes
+
+def _overwrite_payloads(client, collection_name, points):
+    """Replace the payloads of existing points in one request"""
+    from qdrant_client.models import OverwritePayloadOperation, SetPayload
+
+    client.batch_update_points(
+        collection_name=collection_name,
+        update_operations=[
+            OverwritePayloadOperation(overwrite_payload=SetPayload(payload=payload, points=[pid]))
+            for pid, payload in points
+        ]
+    )
+    bump_collection_version(collection_name)
+
+def _delete_points(client, collection_name, point_ids, batch_size=1024):
+    """Delete points by ID"""
+    from qdrant_client.models import PointIdsList
+
+    for i in range(0, len(point_ids), batch_size):
+        client.delete(
+            collection_name=collection_name,
+            points_selector=PointIdsList(points=point_ids[i:i + batch_size])
+        )
+        bump_collection_version(collection_name)
+
+def sync_csv(client, model, csv_path, collection_name=COLLECTION_NAME,
+             chunk_size=1000, batch_size=64, max_in_flight=4, sparse_index=None):
+    """
+    Bring an existing collection in line with a revised CSV
+
+    Points are matched by resource_key and compared by hash:
+
+    - new rows and rows whose embedded text changed are encoded and upserted
+    - rows where only other fields (hours, contact, ...) changed get their
+      payload overwritten in place, without touching the model
+    - unchanged rows are skipped
+    - points whose resource is no longer in the CSV are deleted
+
+    Args:
+        client: QdrantClient holding a collection built by ingest_csv
+        model: Embedding model (ideally an embedding_cache.CachedEncoder)
+        csv_path: Revised resources CSV
+        collection_name: Collection to update
+        chunk_size: Rows read from disk per chunk
+        batch_size: Rows per encode call, upsert and payload update
+        max_in_flight: Encoded batches allowed to wait for upload
+        sparse_index: Optional empty BM25Index rebuilt from every row, since
+            payload-only changes alter the lexical text too
+
+    Returns:
+        Dict with ``rows``, ``encoded``, ``payload_updated``, ``unchanged``,
+        ``deleted`` and ``seconds``
+    """
+    start = time.perf_counter()
+    existing = _existing_hashes(client, collection_name)
+    stats = {"rows": 0, "encoded": 0, "payload_updated": 0, "unchanged": 0, "deleted": 0}
+
+    buffer = queue.Queue(maxsize=max_in_flight)
+    state = {"uploaded": 0, "error": None}
+    writer = threading.Thread(
+        target=_upsert_writer,
+        args=(client, collection_name, buffer, state),
+        daemon=True
+    )
+    writer.start()
+
+    seen = set()
+    try:
+        for keys, batch, ends_chunk in _read_batches(csv_path, chunk_size, batch_size):
+            changed, payload_only = [], []
+            for key, row in zip(keys, batch):
+                pid = point_id(key)
+                seen.add(pid)
+                payload = build_payload(row)
+                previous = existing.get(pid)
+                if previous is None or previous[0] != payload["content_hash"]:
+                    changed.append((key, row))
+                elif previous[1] != payload["payload_hash"]:
+                    payload_only.append((pid, payload))
+                else:
+                    stats["unchanged"] += 1
+
+                if sparse_index is not None:
+                    from sparse_index import sparse_text
+
+                    sparse_index.add(pid, sparse_text(row))
+
+            if changed:
+                rows = [row for _, row in changed]
+                vectors = model.encode([resource_text(row) for row in rows], batch_size=batch_size)
+                buffer.put(_build_points([key for key, _ in changed], rows, vectors))
+                stats["encoded"] += len(changed)
+            if payload_only:
+                # Queued behind the pending upserts so the sync's writes apply in CSV order
+                buffer.put((_overwrite_payloads, payload_only))
+                stats["payload_updated"] += len(payload_only)
+            if state["error"] is not None:
+                raise state["error"]
+
+            stats["rows"] += len(batch)
+            if ends_chunk:
+                print(f"   ...{stats['rows']} rows checked, {stats['encoded']} re-encoded, "
+                      f"{stats['payload_updated']} payloads updated")
+    finally:
+        buffer.put(None)
+        writer.join()
+
+    if state["error"] is not None:
+        raise state["error"]
+
+    removed = [pid for pid in existing if pid not in seen]
+    _delete_points(client, collection_name, removed)
+    stats["deleted"] = len(removed)
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+# Model of an ingest worker process, loaded once by _init_encode_worker
+_worker_model = None
+
+def _init_encode_worker(model_factory, threads):
+    """Load the worker's own model copy, sharing the CPU with its siblings"""
+    global _worker_model
+
+    # Without this every worker would start one thread per core
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    _worker_model = model_factory()
+
+def _encode_in_worker(texts, batch_size):
+    """Encode one batch with the worker's model"""
+    return _worker_model.encode(texts, batch_size=batch_size)
+
+def ingest_csv_parallel(client, csv_path, model_factory=None, collection_name=COLLECTION_NAME,
+                        chunk_size=1000, batch_size=64, max_in_flight=4, workers=None,
+                        sparse_index=None):
+    """
+    ingest_csv with encoding spread over worker processes
+
+    The parent reads the CSV and hands batches to ``workers`` processes,
+    each holding its own model. Encoded batches come back in CSV order and
+    go through the same single writer thread as the serial path, so point
+    IDs, payloads and the sparse index are identical to ingest_csv. At most
+    two batches per worker are being encoded at any time.
+
+    Args:
+        client: QdrantClient with the target collection already created
+        csv_path: Path to a CSV with the PAYLOAD_FIELDS columns
+        model_factory: Picklable callable returning an encoder in each worker
+            (default: load_model)
+        collection_name: Target collection
+        chunk_size: Rows read from disk per chunk
+        batch_size: Texts per worker encode call and per upsert
+        max_in_flight: Encoded batches allowed to wait for upload
+        workers: Worker processes (default: one per CPU core)
+        sparse_index: Optional sparse_index.BM25Index filled in CSV order
+
+    Returns:
+        Dict with ``rows``, ``seconds``, ``rows_per_sec`` and ``workers``
+    """
+    import multiprocessing
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    model_factory = model_factory or load_model
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    # spawn: forking a process that already initialized torch is unsafe
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_encode_worker,
+        initargs=(model_factory, threads)
+    )
+
+    def encoded_batches():
+        pending = deque()
+        for keys, batch, ends_chunk in _read_batches(csv_path, chunk_size, batch_size):
+            texts = [resource_text(row) for row in batch]
+            pending.append((keys, batch, executor.submit(_encode_in_worker, texts, batch_size), ends_chunk))
+            if len(pending) >= 2 * workers:
+                keys, batch, future, ends_chunk = pending.popleft()
+                yield keys, batch, future.result(), ends_chunk
+        while pending:
+            keys, batch, future, ends_chunk = pending.popleft()
+            yield keys, batch, future.result(), ends_chunk
+
+    print(f"   Encoding with {workers} worker processes ({threads} threads each)")
+    try:
+        stats = _write_encoded_batches(client, collection_name, encoded_batches(), max_in_flight, sparse_index)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    stats["workers"] = workers
+    return stats
+
+def create_client(path=None, url=None):
+    """
+    Create a Qdrant client for the configured storage mode
+
+    Args:
+        path: Directory for an embedded on-disk collection
+        url: URL of a Qdrant server (takes precedence over path)
+
+    Without either the client is in-memory and lost on exit.
+    """
+    from qdrant_client import QdrantClient
+
+    if url:
+        return QdrantClient(url=url)
+    if path:
+        return QdrantClient(path=path)
+    return QdrantClient(":memory:")
+
+def file_sha256(path):
+    """Hash a file in blocks so large CSVs are never fully loaded"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def manifest_path_for(storage_path=None, snapshot_path=None):
+    """
+    Where the build manifest lives
+
+    Embedded storage keeps it inside the storage directory so it travels
+    with snapshots; server mode keeps it next to the snapshot file.
+    """
+    if storage_path:
+        return os.path.join(storage_path, MANIFEST_FILE)
+    if snapshot_path:
+        return snapshot_path + ".manifest.json"
+    return os.path.join('data', f"{COLLECTION_NAME}.manifest.json")
+
+def sparse_index_path_for(storage_path=None, snapshot_path=None):
+    """Where the BM25 index for hybrid search lives (next to the manifest)"""
+    if storage_path:
+        return os.path.join(storage_path, SPARSE_INDEX_FILE)
+    if snapshot_path:
+        return snapshot_path + ".sparse.npz"
+    return os.path.join('data', f"{COLLECTION_NAME}.sparse.npz")
+
+def embedding_cache_path_for(storage_path=None, snapshot_path=None):
+    """Where document embeddings are cached between ingests (next to the manifest)"""
+    if storage_path:
+        return os.path.join(storage_path, EMBEDDING_CACHE_FILE)
+    if snapshot_path:
+        return snapshot_path + ".embeddings.db"
+    return os.path.join('data', f"{COLLECTION_NAME}.embeddings.db")
+
+def build_manifest(csv_path, index_config=None):
+    """Describe what a collection was built from, to detect stale builds"""
+    return {
+        "collection": COLLECTION_NAME,
+        "csv_sha256": file_sha256(csv_path),
+        "model": MODEL_NAME,
+        "vector_size": VECTOR_SIZE,
+        "payload_schema": PAYLOAD_SCHEMA_VERSION,
+        "index_config": index_config or {},
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+def write_manifest(manifest, manifest_path):
+    """Record the manifest of a freshly built collection"""
+    os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok=True)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def collection_exists(client, collection_name=COLLECTION_NAME):
+    """True if the collection is present in Qdrant"""
+    return collection_name in [c.name for c in client.get_collections().collections]
+
+def _manifest_matches(client, manifest_path, expected, keys):
+    """True if the collection exists and its manifest agrees with expected on keys"""
+    if not collection_exists(client) or not os.path.exists(manifest_path):
+        return False
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    return all(manifest.get(key) == expected[key] for key in keys)
+
+def collection_is_current(client, manifest_path, csv_path, index_config=None):
+    """True if the collection exists and was built from this CSV, model and index config"""
+    return _manifest_matches(
+        client, manifest_path, build_manifest(csv_path, index_config),
+        ("collection", "csv_sha256", "model", "vector_size", "payload_schema", "index_config")
+    )
+
+def collection_can_sync(client, manifest_path, csv_path, index_config=None):
+    """True if the collection can be updated in place by sync_csv (any CSV)"""
+    return _manifest_matches(
+        client, manifest_path, build_manifest(csv_path, index_config),
+        ("collection", "model", "vector_size", "payload_schema", "index_config")
+    )
+
+def export_snapshot(client, snapshot_path, storage_path=None, url=None):
+    """
+    Export the collection to a snapshot file
+
+    Embedded storage is archived as a tarball of the storage directory
+    (manifest included). Server mode asks Qdrant for a native snapshot and
+    downloads it, writing the manifest alongside.
+    """
+    os.makedirs(os.path.dirname(snapshot_path) or '.', exist_ok=True)
+
+    if url:
+        import urllib.request
+        
+        description = client.create_snapshot(collection_name=COLLECTION_NAME)
+        download_url = f"{url.rstrip('/')}/collections/{COLLECTION_NAME}/snapshots/{description.name}"
+        with urllib.request.urlopen(download_url) as response, open(snapshot_path, 'wb') as f:
+            shutil.copyfileobj(response, f)
+    elif storage_path:
+        with tarfile.open(snapshot_path, 'w:gz') as archive:
+            # The lock file belongs to the running client, not the data
+            archive.add(
+                storage_path,
+                arcname='.',
+                filter=lambda info: None if os.path.basename(info.name) == '.lock' else info
+            )
+    else:
+        raise ValueError("Snapshots need a persistent collection: pass storage_path or url")
+
+    print(f"📸 Snapshot exported to {snapshot_path}")
+
+def _checked_members(archive, destination):
+    """
+    Members of a tar archive, refusing any that would escape destination
+
+    For Pythons without tarfile's extraction filters: absolute paths, ".."
+    components, links and special files raise ValueError.
+    """
+    root = os.path.realpath(destination)
+    for member in archive.getmembers():
+        target = os.path.realpath(os.path.join(root, member.name))
+        if os.path.isabs(member.name) or os.path.commonpath([root, target]) != root:
+            raise ValueError(f"Snapshot member {member.name!r} would be extracted outside {destination}")
+        if not (member.isfile() or member.isdir()):
+            raise ValueError(f"Snapshot member {member.name!r} is not a regular file or directory")
+        yield member
+
+def import_snapshot(snapshot_path, storage_path=None, client=None):
+    """
+    Restore a collection from a snapshot file
+
+    For embedded storage the archive is unpacked into ``storage_path``,
+    which must not be open by another client. In server mode the snapshot
+    is recovered through Qdrant; ``snapshot_path`` must then be an URL or a
+    path the server can read.
+    """
+    if client is not None and storage_path is None:
+        location = snapshot_path
+        if '://' not in location:
+            location = 'file://' + os.path.abspath(snapshot_path)
+        client.recover_snapshot(collection_name=COLLECTION_NAME, location=location)
+    elif storage_path:
+        os.makedirs(storage_path, exist_ok=True)
+        with tarfile.open(snapshot_path, 'r:gz') as archive:
+            # Never let a crafted archive write outside storage_path
+            if hasattr(tarfile, 'data_filter'):
+                archive.extractall(storage_path, filter='data')
+            else:
+                archive.extractall(storage_path, members=_checked_members(archive, storage_path))
+    else:
+        raise ValueError("Snapshots need a persistent collection: pass storage_path or client")
+
+    bump_collection_version(COLLECTION_NAME)
+    print(f"📸 Snapshot restored from {snapshot_path}")
+
+def create_payload_indexes(client, collection_name=COLLECTION_NAME):
+    """
+    Create keyword, integer and geo indexes on the filterable payload fields
+
+    Filtered searches then resolve matching points from the index, and
+    Qdrant's planner uses the index cardinality to pick between HNSW and
+    a payload-first scan.
+    """
+    from qdrant_client.models import PayloadSchemaType
+    from geo import GEO_FIELD
+    
+    for field in INDEXED_FIELDS:
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field,
+            field_schema=PayloadSchemaType.INTEGER if field in INTEGER_FIELDS else PayloadSchemaType.KEYWORD
+        )
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name=GEO_FIELD,
+        field_schema=PayloadSchemaType.GEO
+    )
+
+def build_index_config(quantization=None, hnsw_m=None, hnsw_ef_construct=None, on_disk_vectors=None):
+    """
+    Normalize the vector storage and HNSW options of a collection
+    
+    Args:
+        quantization: None (float32 only), "scalar" (int8, 4x smaller) or
+            "binary" (1 bit per dimension, 32x smaller)
+        hnsw_m: Graph links per node (Qdrant default 16); lower saves memory
+        hnsw_ef_construct: Build-time candidate list (Qdrant default 100)
+        on_disk_vectors: Keep the float32 originals on disk (default: only
+            when quantized, so RAM holds just the quantized copy and the
+            originals are read for rescoring)
+    
+    Returns:
+        Dict of the non-default options, recorded in the build manifest
+    """
+    if quantization is not None and quantization not in QUANTIZATION_KINDS:
+        raise ValueError(
+            f"Unknown quantization '{quantization}', choose from {', '.join(QUANTIZATION_KINDS)}"
+        )
+    if on_disk_vectors is None:
+        on_disk_vectors = quantization is not None
+    
+    config = {
+        "quantization": quantization,
+        "hnsw_m": hnsw_m,
+        "hnsw_ef_construct": hnsw_ef_construct,
+        "on_disk_vectors": on_disk_vectors or None,
+    }
+    return {key: value for key, value in config.items() if value is not None}
+
+def _quantization_config(quantization):
+    """qdrant_client quantization config for a QUANTIZATION_KINDS entry"""
+    from qdrant_client.models import (
+        BinaryQuantization, BinaryQuantizationConfig,
+        ScalarQuantization, ScalarQuantizationConfig, ScalarType
+    )
+    
+    # The quantized copy always stays in RAM; it is what HNSW traverses
+    if quantization == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+
+def create_resource_collection(client, collection_name=COLLECTION_NAME, index_config=None):
+    """
+    Create an empty, payload-indexed resources collection, replacing any existing one
+    
+    Args:
+        client: QdrantClient
+        collection_name: Collection to (re)create
+        index_config: Options from build_index_config (default: float32
+            vectors in RAM with Qdrant's default HNSW parameters)
+    """
+    from qdrant_client.models import Distance, HnswConfigDiff, VectorParams
+    
+    index_config = index_config or {}
+    hnsw_config = None
+    if "hnsw_m" in index_config or "hnsw_ef_construct" in index_config:
+        hnsw_config = HnswConfigDiff(
+            m=index_config.get("hnsw_m"),
+            ef_construct=index_config.get("hnsw_ef_construct")
+        )
+    quantization = index_config.get("quantization")
+    
+    if collection_exists(client, collection_name):
+        client.delete_collection(collection_name=collection_name)
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=VectorParams(
+            size=VECTOR_SIZE,
+            distance=Distance.COSINE,
+            on_disk=index_config.get("on_disk_vectors")
+        ),
+        hnsw_config=hnsw_config,
+        quantization_config=_quantization_config(quantization) if quantization else None,
+    )
+    # Indexes are created before ingest so they are built incrementally
+    create_payload_indexes(client, collection_name)
+    bump_collection_version(collection_name)
+
+def setup_qdrant(csv_path=None, chunk_size=1000, batch_size=64, max_in_flight=4,
+                 storage_path=None, url=None, snapshot_path=None, force_rebuild=False,
+                 encoder_backend=None, quantization=None, hnsw_m=None, hnsw_ef_construct=None,
+                 on_disk_vectors=None, workers=1, sparse_index_path=None):
+    """
+    Initialize Qdrant and load data
+
+    Args:
+        csv_path: Resources CSV to ingest. When omitted the bundled sample
+            data is generated and written to DEFAULT_CSV_PATH first.
+        chunk_size: Rows read from the CSV per chunk
+        batch_size: Texts per encode call and per upsert
+        max_in_flight: Encoded batches allowed to wait for upload
+        storage_path: Keep the collection on disk in this directory
+        url: Use a Qdrant server instead of embedded storage
+        snapshot_path: Restore from this snapshot when no collection exists
+            yet, and export a fresh snapshot after every rebuild
+        force_rebuild: Recreate the collection even if it is current or
+            could be synced
+        encoder_backend: Embedding backend ("torch", "onnx" or "int8")
+        quantization: None, "scalar" or "binary" (see build_index_config)
+        hnsw_m: HNSW links per node
+        hnsw_ef_construct: HNSW build-time candidate list size
+        on_disk_vectors: Keep float32 originals on disk (default: when quantized)
+        workers: Encoder processes for the ingest; above 1 the CSV is
+            embedded by ingest_csv_parallel
+        sparse_index_path: Save the BM25 index here instead of
+            sparse_index_path_for(storage_path, snapshot_path)
+
+    With storage_path or url nothing is re-embedded when the collection
+    (or its snapshot) was built from the same CSV. After a CSV edit the
+    collection is updated in place by sync_csv: only rows whose embedded
+    text changed are re-encoded, and document embeddings are cached on disk
+    (embedding_cache_path_for) across ingests. A different model, payload
+    schema or index config triggers a full rebuild. Quantization and HNSW
+    settings only take effect on a Qdrant server; embedded mode always
+    searches exactly.
+    
+    A BM25 index for hybrid search is built during ingest and saved to
+    sparse_index_path_for(storage_path, snapshot_path); load it with
+    sparse_index.BM25Index.load and pass it to CommunityNavigator. An
+    in-memory collection's index is only saved to an explicit
+    sparse_index_path, since both are gone when the process exits.
+    """
     print("🚀 Setting up Qdrant Vector Database...")
     
-    # Create data directory if it doesn't exist
-    os.makedirs('data', exist_ok=True)
+    if csv_path is None:
+        # Create data directory if it doesn't exist
+        os.makedirs('data', exist_ok=True)
+        
+        # Generate sample data
+        print("📊 Creating sample community resources data...")
+        count = write_sample_csv(DEFAULT_CSV_PATH)
+        print(f"✅ Created {count} community resources")
+        csv_path = DEFAULT_CSV_PATH
+    
+    index_config = build_index_config(quantization, hnsw_m, hnsw_ef_construct, on_disk_vectors)
+    persistent = bool(storage_path or url)
+    manifest_path = manifest_path_for(storage_path, snapshot_path if url else None)
+    sparse_path = sparse_index_path or sparse_index_path_for(storage_path, snapshot_path if url else None)
+    
+    restore = (persistent and snapshot_path and not force_rebuild
+               and os.path.exists(snapshot_path))
     
-    # Generate sample data
-    print("📊 Creating sample community resources data...")
-    df = create_sample_data()
-    df.to_csv('data/community_resources.csv', index=False)
-    print(f"✅ Created {len(df)} community resources")
+    # A new worker restores the prebuilt snapshot instead of re-embedding.
+    # Embedded storage must be unpacked before the client opens it.
+    if restore and not url and not os.path.exists(manifest_path):
+        print("\n📸 Restoring collection from snapshot...")
+        import_snapshot(snapshot_path, storage_path=storage_path)
     
-    # Initialize Qdrant client (in-memory for demo)
+    # Initialize Qdrant client (in-memory unless storage_path or url is set)
     print("\n🔧 Initializing Qdrant client...")
-    client = QdrantClient(":memory:")
+    client = create_client(path=storage_path, url=url)
+    
+    if restore and url and not collection_exists(client):
+        print("📸 Restoring collection from snapshot...")
+        import_snapshot(snapshot_path, client=client)
     
     # Initialize embedding model
     print("🧠 Loading embedding model...")
-    model = SentenceTransformer('all-MiniLM-L6-v2')
+    model = load_model(backend=encoder_backend)
     
-    # Create collection
-    print("📦 Creating Qdrant collection...")
-    client.create_collection(
-        collection_name="community_resources",
-        vectors_config=VectorParams(size=384, distance=Distance.COSINE),
-    )
+    if (persistent and not force_rebuild and os.path.exists(sparse_path)
+            and collection_is_current(client, manifest_path, csv_path, index_config)):
+        print("♻️  Collection is up to date with the CSV - skipping rebuild")
+        print("\n" + "="*60)
+        print("Setup complete! Qdrant is ready to use.")
+        print("="*60)
+        return client, model
     
-    # Prepare points for upload
-    print("⚡ Generating embeddings and uploading to Qdrant...")
-    points = []
+    from sparse_index import BM25Index
     
-    for idx, row in df.iterrows():
-        # Combine text fields for rich embedding
-        text = f"{row['name']} {row['category']} {row['description']} {row['services']}"
-        vector = model.encode(text).tolist()
+    sparse_index = BM25Index()
+    encoder = model
+    if persistent:
+        from embedding_cache import CachedEncoder, DiskEmbeddingCache
         
-        points.append(PointStruct(
-            id=str(uuid.uuid4()),
-            vector=vector,
-            payload={
-                "name": row['name'],
-                "category": row['category'],
-                "description": row['description'],
-                "location": row['location'],
-                "contact": row['contact'],
-                "hours": row['hours'],
-                "services": row['services']
-            }
-        ))
-    
-    # Upload to Qdrant
-    client.upsert(collection_name="community_resources", points=points)
-    
-    print(f"✅ Successfully uploaded {len(points)} resources to Qdrant!")
+        # Texts embedded by any earlier ingest or sync skip the model
+        cache_path = embedding_cache_path_for(storage_path, snapshot_path if url else None)
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        namespace = f"{MODEL_NAME}:{getattr(model, 'backend', None) or 'torch'}"
+        encoder = CachedEncoder(model, DiskEmbeddingCache(cache_path, namespace=namespace))
+    
+    if persistent and not force_rebuild and collection_can_sync(client, manifest_path, csv_path, index_config):
+        # Same model and schema: only changed rows need work
+        print(f"🔄 Syncing collection with {csv_path}...")
+        stats = sync_csv(
+            client, encoder, csv_path,
+            chunk_size=chunk_size,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            sparse_index=sparse_index
+        )
+        print(f"✅ Synced {stats['rows']} resources in {stats['seconds']:.1f}s: "
+              f"{stats['encoded']} re-encoded, {stats['payload_updated']} payloads updated, "
+              f"{stats['unchanged']} unchanged, {stats['deleted']} deleted")
+    else:
+        _rebuild_collection(
+            client, encoder, csv_path, index_config, sparse_index,
+            manifest_path=manifest_path if persistent else None,
+            chunk_size=chunk_size,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            workers=workers,
+            encoder_backend=encoder_backend
+        )
+    if encoder is not model:
+        encoder.cache.close()
+    
+    if persistent or sparse_index_path:
+        os.makedirs(os.path.dirname(sparse_path) or '.', exist_ok=True)
+        sparse_index.save(sparse_path)
+        print(f"🔤 Saved BM25 index of {len(sparse_index)} resources to {sparse_path}")
+    
+    if persistent:
+        write_manifest(build_manifest(csv_path, index_config), manifest_path)
+        if snapshot_path:
+            export_snapshot(client, snapshot_path, storage_path=storage_path, url=url)
     print("\n" + "="*60)
     print("Setup complete! Qdrant is ready to use.")
     print("="*60)
     
     return client, model
 
+def _rebuild_collection(client, model, csv_path, index_config, sparse_index, manifest_path=None,
+                        chunk_size=1000, batch_size=64, max_in_flight=4, workers=1,
+                        encoder_backend=None):
+    """Recreate the collection and ingest the whole CSV (setup_qdrant's full rebuild)"""
+    print("📦 Creating Qdrant collection...")
+    if manifest_path and os.path.exists(manifest_path):
+        # An interrupted rebuild must not look current on the next start
+        os.remove(manifest_path)
+    create_resource_collection(client, index_config=index_config)
+    
+    # Stream embeddings into Qdrant chunk by chunk
+    print(f"⚡ Generating embeddings and uploading to Qdrant from {csv_path}...")
+    if workers > 1:
+        from functools import partial
+        
+        stats = ingest_csv_parallel(
+            client, csv_path,
+            model_factory=partial(load_model, backend=encoder_backend),
+            chunk_size=chunk_size,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            workers=workers,
+            sparse_index=sparse_index
+        )
+    else:
+        stats = ingest_csv(
+            client, model, csv_path,
+            chunk_size=chunk_size,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            sparse_index=sparse_index
+        )
+    
+    print(f"✅ Successfully uploaded {stats['rows']} resources to Qdrant "
+          f"in {stats['seconds']:.1f}s ({stats['rows_per_sec']:.1f} rows/sec)")
+
+def setup_regions(csv_path, region_column=REGION_COLUMN, chunk_size=1000, batch_size=64, max_in_flight=4,
+                  storage_path=None, url=None, encoder_backend=None, quantization=None, hnsw_m=None,
+                  hnsw_ef_construct=None, on_disk_vectors=None, workers=1):
+    """
+    Build one collection per region (sharded multi-community mode)
+    
+    Rows are routed by region_column to region_collection(region), and
+    each region is created and ingested on its own, so every index stays
+    as small as its region and can be rebuilt or scaled independently.
+    Pass the regions to CommunityNavigator(regions=...) to route and fan
+    out queries; with storage_path they are also recorded in REGIONS_FILE
+    (see load_regions).
+    
+    Every call rebuilds all regional collections: delta sync, snapshots and
+    the BM25 index are single-collection features of setup_qdrant.
+    
+    Args:
+        csv_path: Resources CSV with a region column
+        region_column: Column naming each resource's region
+        (other arguments as for setup_qdrant)
+    
+    Returns:
+        (client, model, regions) with regions mapping each region to its
+        number of resources
+    """
+    import tempfile
+    from functools import partial
+    
+    print(f"🚀 Setting up regional Qdrant collections by {region_column!r}...")
+    
+    index_config = build_index_config(quantization, hnsw_m, hnsw_ef_construct, on_disk_vectors)
+    client = create_client(path=storage_path, url=url)
+    model = load_model(backend=encoder_backend)
+    
+    regions = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        region_csvs = split_csv_by_region(csv_path, workdir, region_column)
+        for region, region_csv in sorted(region_csvs.items()):
+            collection_name = region_collection(region)
+            print(f"📦 Building {collection_name} for {region}...")
+            create_resource_collection(client, collection_name, index_config)
+            
+            if workers > 1:
+                stats = ingest_csv_parallel(
+                    client, region_csv,
+                    model_factory=partial(load_model, backend=encoder_backend),
+                    collection_name=collection_name,
+                    chunk_size=chunk_size,
+                    batch_size=batch_size,
+                    max_in_flight=max_in_flight,
+                    workers=workers
+                )
+            else:
+                stats = ingest_csv(
+                    client, model, region_csv,
+                    collection_name=collection_name,
+                    chunk_size=chunk_size,
+                    batch_size=batch_size,
+                    max_in_flight=max_in_flight
+                )
+            regions[region] = stats["rows"]
+            print(f"✅ {region}: {stats['rows']} resources in {stats['seconds']:.1f}s")
+    
+    if storage_path:
+        with open(regions_path_for(storage_path), 'w') as f:
+            json.dump({"regions": sorted(regions)}, f, indent=2)
+    print("\n" + "="*60)
+    print(f"Setup complete! {len(regions)} regional collections are ready to use.")
+    print("="*60)
+    
+    return client, model, regions
+
+def parse_args():
+    """Command line options for building the collection"""
+    parser = argparse.ArgumentParser(description="Build the community resources collection")
+    parser.add_argument("--csv", dest="csv_path", default=None,
+                        help="Resources CSV to ingest (default: generate sample data)")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="Rows read from the CSV per chunk")
+    parser.add_argument("--batch-size", type=int, default=64,
+                        help="Texts per encode call and per upsert")
+    parser.add_argument("--max-in-flight", type=int, default=4,
+                        help="Encoded batches allowed to wait for upload")
+    parser.add_argument("--storage", dest="storage_path", default=None,
+                        help="Directory for an on-disk collection")
+    parser.add_argument("--url", default=None,
+                        help="Qdrant server URL (instead of embedded storage)")
+    parser.add_argument("--snapshot", dest="snapshot_path", default=None,
+                        help="Snapshot to restore from / export to")
+    parser.add_argument("--force", dest="force_rebuild", action="store_true",
+                        help="Rebuild even if the collection is up to date")
+    parser.add_argument("--encoder", dest="encoder_backend", default=None,
+                        choices=["torch", "onnx", "int8"],
+                        help="Embedding backend (default: $NAVIGATOR_ENCODER or torch)")
+    parser.add_argument("--quantization", default=None, choices=QUANTIZATION_KINDS,
+                        help="Quantize vectors (float32 originals move to disk)")
+    parser.add_argument("--hnsw-m", type=int, default=None,
+                        help="HNSW links per node (Qdrant default 16)")
+    parser.add_argument("--hnsw-ef-construct", type=int, default=None,
+                        help="HNSW build-time candidate list (Qdrant default 100)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Encoder processes for the ingest (each loads its own model)")
+    parser.add_argument("--numpy-engine", default=None,
+                        help="Also export the collection as numpy_engine files to this directory")
+    parser.add_argument("--sparse-index", dest="sparse_index_path", default=None,
+                        help="Save the BM25 index here (default: in --storage, or not at all in memory)")
+    parser.add_argument("--region-column", default=None,
+                        help="Build one collection per value of this CSV column (see setup_regions)")
+    args = parser.parse_args()
+    if args.region_column and not args.csv_path:
+        parser.error("--region-column needs a --csv with that column")
+    if args.region_column and (args.numpy_engine or args.snapshot_path):
+        parser.error("--numpy-engine and --snapshot export a single collection, not regional ones")
+    if args.region_column and args.sparse_index_path:
+        parser.error("--sparse-index covers a single collection; regional collections have no BM25 index")
+    return args
+
 if __name__ == "__main__":
-    setup_qdrant()
\ No newline at end of file
+    args = parse_args()
+    if args.region_column:
+        setup_regions(
+            args.csv_path,
+            region_column=args.region_column,
+            chunk_size=args.chunk_size,
+            batch_size=args.batch_size,
+            max_in_flight=args.max_in_flight,
+            storage_path=args.storage_path,
+            url=args.url,
+            encoder_backend=args.encoder_backend,
+            quantization=args.quantization,
+            hnsw_m=args.hnsw_m,
+            hnsw_ef_construct=args.hnsw_ef_construct,
+            workers=args.workers
+        )
+    else:
+        client, _ = setup_qdrant(
+            csv_path=args.csv_path,
+            chunk_size=args.chunk_size,
+            batch_size=args.batch_size,
+            max_in_flight=args.max_in_flight,
+            storage_path=args.storage_path,
+            url=args.url,
+            snapshot_path=args.snapshot_path,
+            force_rebuild=args.force_rebuild,
+            encoder_backend=args.encoder_backend,
+            quantization=args.quantization,
+            hnsw_m=args.hnsw_m,
+            hnsw_ef_construct=args.hnsw_ef_construct,
+            workers=args.workers,
+            sparse_index_path=args.sparse_index_path
+        )
+        if args.numpy_engine:
+            from numpy_engine import export_collection
+            
+            rows = export_collection(client, args.numpy_engine)
+            print(f"🧮 Exported {rows} resources to the NumPy engine in {args.numpy_engine}")
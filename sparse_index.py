@@ -0,0 +1,203 @@
+"""
+In-process BM25 index for hybrid sparse+dense retrieval
+
+Dense embeddings blur exact tokens users type (program names such as
+"EITC" or "GED", phone numbers, street names). BM25Index keeps an inverted
+index over the same resources so those tokens still rank, and
+reciprocal_rank_fusion merges its ranking with the dense one.
+
+The index is built during ingest (setup_qdrant.ingest_csv) and saved as a
+compressed ``.npz`` file next to the collection:
+
+    index = BM25Index.load(sparse_index_path_for("qdrant_storage"))
+    nav = CommunityNavigator(storage_path="qdrant_storage", sparse_index=index)
+    nav.search_resources("EITC tax help")
+"""
+
+import math
+import re
+from array import array
+
+import numpy as np
+
+# Default damping constant for reciprocal rank fusion (Cormack et al.)
+RRF_K = 60
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lowercased word and number tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def sparse_text(row):
+    """Text indexed lexically: the embedded fields plus contact and location"""
+    return f"{row['name']} {row['category']} {row['description']} {row['services']} " \
+           f"{row['contact']} {row['location']}"
+
+
+class BM25Index:
+    """
+    Okapi BM25 over resource point IDs
+
+    Postings are collected in compact arrays while documents are added and
+    frozen into CSR arrays (token -> documents, term frequencies) on the
+    first search or save, so scoring a query is a few vectorized numpy
+    operations per query token.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        """
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.ids = []
+        self._lengths = array('i')
+        self._pending = {}
+        self._frozen = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, point_id, text):
+        """Index one document under its Qdrant point ID"""
+        if self._pending is None:
+            raise ValueError("A loaded BM25Index is read-only; rebuild it to add documents")
+        doc = len(self.ids)
+        self.ids.append(str(point_id))
+
+        counts = {}
+        tokens = tokenize(text)
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        self._lengths.append(len(tokens))
+
+        for token, tf in counts.items():
+            postings = self._pending.get(token)
+            if postings is None:
+                postings = self._pending[token] = (array('i'), array('i'))
+            postings[0].append(doc)
+            postings[1].append(tf)
+
+        # New documents invalidate the frozen arrays
+        self._frozen = None
+
+    def _freeze(self):
+        """Build the CSR arrays used for scoring and saving"""
+        if self._frozen is not None:
+            return self._frozen
+
+        vocab = sorted(self._pending)
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        for i, token in enumerate(vocab):
+            indptr[i + 1] = indptr[i] + len(self._pending[token][0])
+
+        docs = np.empty(indptr[-1], dtype=np.int32)
+        tfs = np.empty(indptr[-1], dtype=np.float32)
+        for i, token in enumerate(vocab):
+            token_docs, token_tfs = self._pending[token]
+            docs[indptr[i]:indptr[i + 1]] = token_docs
+            tfs[indptr[i]:indptr[i + 1]] = token_tfs
+
+        self._frozen = self._scoring_arrays(
+            {token: i for i, token in enumerate(vocab)},
+            indptr, docs, tfs, np.asarray(self._lengths, dtype=np.float32)
+        )
+        return self._frozen
+
+    def _scoring_arrays(self, vocab, indptr, docs, tfs, lengths):
+        """Bundle the CSR arrays with the per-document length normalization"""
+        return {
+            "vocab": vocab,
+            "indptr": indptr,
+            "docs": docs,
+            "tfs": tfs,
+            "lengths": lengths,
+            # Shared by every query token, so computed once per index
+            "norm": self.k1 * (1 - self.b + self.b * lengths / max(float(lengths.mean()), 1e-9))
+        }
+
+    def search(self, query, top_k=50):
+        """
+        Rank documents for a query
+
+        Returns:
+            List of (point_id, score) pairs, best first, at most top_k long
+        """
+        if not self.ids:
+            return []
+
+        index = self._freeze()
+        norm = index["norm"]
+        n_docs = len(norm)
+
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for token in set(tokenize(query)):
+            row = index["vocab"].get(token)
+            if row is None:
+                continue
+            start, end = index["indptr"][row], index["indptr"][row + 1]
+            docs, tfs = index["docs"][start:end], index["tfs"][start:end]
+
+            df = end - start
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > top_k:
+            matched = matched[np.argpartition(-scores[matched], top_k - 1)[:top_k]]
+        matched = matched[np.argsort(-scores[matched])]
+
+        return [(self.ids[doc], float(scores[doc])) for doc in matched]
+
+    def save(self, path):
+        """Write the index to a compressed .npz file"""
+        index = self._freeze()
+        vocab = sorted(index["vocab"], key=index["vocab"].get)
+        np.savez_compressed(
+            path,
+            params=np.array([self.k1, self.b], dtype=np.float64),
+            ids=np.array(self.ids, dtype=str),
+            vocab=np.array(vocab, dtype=str),
+            indptr=index["indptr"],
+            docs=index["docs"],
+            tfs=index["tfs"],
+            lengths=index["lengths"]
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            k1, b = data["params"].tolist()
+            index = cls(k1=k1, b=b)
+            index.ids = data["ids"].tolist()
+            index._frozen = index._scoring_arrays(
+                {token: i for i, token in enumerate(data["vocab"].tolist())},
+                data["indptr"], data["docs"], data["tfs"], data["lengths"]
+            )
+        # Loaded indexes are read-only: add() would need the pending postings
+        index._pending = None
+        return index
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """
+    Merge several rankings of point IDs with reciprocal rank fusion
+
+    Args:
+        rankings: Iterables of point IDs, each ordered best first
+        k: Damping constant; larger values flatten the rank contribution
+
+    Returns:
+        List of (point_id, fused_score), best first
+    """
+    fused = {}
+    for ranking in rankings:
+        for rank, point_id in enumerate(ranking):
+            fused[point_id] = fused.get(point_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
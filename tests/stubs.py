@@ -0,0 +1,82 @@
+"""Stand-ins for the embedding model and Qdrant client used by the tests"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+
+class StubVector(list):
+    """Embedding shaped like the numpy vector the navigator expects"""
+
+    nbytes = 16
+
+    def tolist(self):
+        return list(self)
+
+    def copy(self):
+        return StubVector(self)
+
+
+class StubModel:
+    def encode(self, text):
+        if isinstance(text, list):
+            return [StubVector([0.1, 0.2]) for _ in text]
+        return StubVector([0.1, 0.2])
+
+
+def point(point_id, score=0.5, payload=None):
+    payload = {"name": f"Resource {point_id}", "category": "Food Assistance", **(payload or {})}
+    return SimpleNamespace(id=point_id, version=0, score=score, payload=payload)
+
+
+class StubClient:
+    """Synchronous client answering every query after an optional delay"""
+
+    def __init__(self, delay=0.0, collections=None, count_delay=0.0):
+        self.delay = delay
+        self.count_delay = count_delay
+        self.collections = collections
+        self.queried = []
+        self.counted = []
+
+    def query_points(self, collection_name, query, limit, **kwargs):
+        time.sleep(self.delay)
+        return self._answer(collection_name, limit, kwargs)
+
+    def query_batch_points(self, collection_name, requests, **kwargs):
+        time.sleep(self.delay)
+        return [self._answer(collection_name, request.limit, kwargs) for request in requests]
+
+    def count(self, collection_name, count_filter=None, exact=True):
+        self.counted.append(count_filter)
+        time.sleep(self.count_delay)
+        return SimpleNamespace(count=10)
+
+    def get_collection(self, collection_name):
+        return SimpleNamespace(collection_name=collection_name)
+
+    def _answer(self, collection_name, limit, kwargs):
+        if self.collections is not None and collection_name not in self.collections:
+            raise ValueError(f"Collection {collection_name} not found")
+        self.queried.append((collection_name, kwargs.get("timeout")))
+        return SimpleNamespace(points=[point(f"{collection_name}-{i}") for i in range(limit)])
+
+
+class AsyncStubClient(StubClient):
+    """StubClient with the AsyncQdrantClient call style"""
+
+    async def query_points(self, collection_name, query, limit, **kwargs):
+        await asyncio.sleep(self.delay)
+        return self._answer(collection_name, limit, kwargs)
+
+    async def query_batch_points(self, collection_name, requests, **kwargs):
+        await asyncio.sleep(self.delay)
+        return [self._answer(collection_name, request.limit, kwargs) for request in requests]
+
+    async def count(self, collection_name, count_filter=None, exact=True):
+        self.counted.append(count_filter)
+        await asyncio.sleep(self.count_delay)
+        return SimpleNamespace(count=10)
+
+    async def get_collection(self, collection_name):
+        return StubClient.get_collection(self, collection_name)
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+
+from async_navigator import AsyncCommunityNavigator
+from memory_store import InMemoryStore
+from stubs import AsyncStubClient, StubModel
+
+
+class ThreadRecordingStore(InMemoryStore):
+    """InMemoryStore noting the threads it is called from"""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def append(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().append(*args, **kwargs)
+
+    def interest_vector(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return super().interest_vector(*args, **kwargs)
+
+
+def test_memory_is_updated_off_the_event_loop():
+    store = ThreadRecordingStore()
+    nav = AsyncCommunityNavigator(client=AsyncStubClient(), model=StubModel(), memory_store=store)
+
+    async def run():
+        await nav.search_resources("food pantry", top_k=2)
+        await nav.search_resources_batch(["shelter", "clinic"], top_k=2)
+        await nav.get_recommendations(top_k=2)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert len(store.history(nav.user_id)) == 3
+    assert store.threads and loop_thread not in store.threads
+
+
+def test_lazy_model_and_client_load_off_the_event_loop(monkeypatch):
+    import async_navigator
+    import navigator
+
+    def slow_model(backend=None):
+        time.sleep(0.3)
+        return StubModel()
+
+    def slow_client(path=None, url=None):
+        time.sleep(0.3)
+        return AsyncStubClient()
+
+    monkeypatch.setattr(navigator, "load_model", slow_model)
+    monkeypatch.setattr(async_navigator, "create_async_client", slow_client)
+    nav = AsyncCommunityNavigator()
+
+    async def run():
+        gaps = []
+
+        async def ticker():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        ticks = asyncio.create_task(ticker())
+        results = await nav.search_resources("food pantry", top_k=2)
+        ticks.cancel()
+        return results, max(gaps)
+
+    results, longest_gap = asyncio.run(run())
+
+    assert len(results) == 2
+    assert longest_gap < 0.2
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from batching import MicroBatchEncoder
+from stubs import StubModel
+
+
+class BatchModel(StubModel):
+    def encode(self, text, batch_size=None):
+        return super().encode(text)
+
+
+def test_model_factory_loads_on_first_encode():
+    loads = []
+
+    def factory():
+        loads.append(1)
+        return BatchModel()
+
+    encoder = MicroBatchEncoder(model_factory=factory, max_wait_ms=0)
+    try:
+        assert loads == []
+        assert list(encoder.encode("food")) == [0.1, 0.2]
+        encoder.encode("shelter")
+        assert loads == [1]
+    finally:
+        encoder.close()
+
+
+def test_encoder_needs_a_model():
+    with pytest.raises(ValueError):
+        MicroBatchEncoder()
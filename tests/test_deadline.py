@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+import pytest
+
+from async_navigator import AsyncCommunityNavigator
+from degradation import FALLBACK, FULL
+from navigator import CommunityNavigator
+from stubs import AsyncStubClient, StubClient, StubModel
+
+# Filters are built with qdrant_client.models; import it before any deadline starts
+pytest.importorskip("qdrant_client.models")
+
+
+def test_slow_query_degrades_to_fallback_at_the_deadline():
+    nav = CommunityNavigator(client=StubClient(delay=0.5), model=StubModel())
+
+    started = time.perf_counter()
+    results = nav.search_resources("food pantry", deadline_ms=50)
+
+    assert results.degradation == FALLBACK
+    assert time.perf_counter() - started < 0.4
+
+
+def test_slow_batch_degrades_to_fallback_at_the_deadline():
+    nav = CommunityNavigator(client=StubClient(delay=0.5), model=StubModel())
+
+    started = time.perf_counter()
+    batch = nav.search_resources_batch(["food pantry", "shelter"], deadline_ms=50)
+
+    assert [results.degradation for results in batch] == [FALLBACK, FALLBACK]
+    assert time.perf_counter() - started < 0.4
+
+
+def test_query_within_the_deadline_is_full_quality():
+    nav = CommunityNavigator(client=StubClient(), model=StubModel())
+
+    results = nav.search_resources("food pantry", top_k=2, deadline_ms=1000)
+
+    assert results.degradation == FULL
+    assert len(results) == 2
+
+
+def test_slow_async_query_degrades_to_fallback_at_the_deadline():
+    nav = AsyncCommunityNavigator(client=AsyncStubClient(delay=0.5), model=StubModel())
+
+    started = time.perf_counter()
+    results = asyncio.run(nav.search_resources("food pantry", deadline_ms=50))
+
+    assert results.degradation == FALLBACK
+    assert time.perf_counter() - started < 0.4
+
+
+def test_slow_filter_count_is_bound_by_the_deadline():
+    nav = CommunityNavigator(client=StubClient(count_delay=0.5), model=StubModel())
+
+    started = time.perf_counter()
+    results = nav.search_resources("clinic", category_filter="Healthcare", deadline_ms=50)
+
+    assert results.degradation == FALLBACK
+    assert time.perf_counter() - started < 0.4
+
+
+def test_slow_async_filter_count_is_bound_by_the_deadline():
+    nav = AsyncCommunityNavigator(client=AsyncStubClient(count_delay=0.5), model=StubModel())
+
+    started = time.perf_counter()
+    results = asyncio.run(nav.search_resources("clinic", category_filter="Healthcare", deadline_ms=50))
+
+    assert results.degradation == FALLBACK
+    assert time.perf_counter() - started < 0.4
+
+
+def test_abandoned_query_reports_its_full_duration():
+    nav = CommunityNavigator(client=StubClient(delay=0.3), model=StubModel())
+
+    nav.search_resources("food pantry", deadline_ms=50)
+    time.sleep(0.4)
+
+    assert nav.stage_latency.estimate("qdrant_query") >= 0.3
+
+
+def test_requests_are_shed_when_deadline_queries_are_saturated():
+    client = StubClient()
+    nav = CommunityNavigator(client=client, model=StubModel())
+    while nav._deadline_slots.acquire(blocking=False):
+        pass
+
+    results = nav.search_resources("food pantry", deadline_ms=1000)
+
+    assert results.degradation == FALLBACK
+    assert client.queried == []
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from encoders import Encoder, check_output_contract, check_ranking_parity, create_encoder
+from setup_qdrant import VECTOR_SIZE
+
+PARITY_CORPUS = [
+    "Food pantry with free groceries every Saturday",
+    "Walk-in medical clinic for people without insurance",
+    "Legal aid for tenants facing eviction",
+    "GED and English classes for adults",
+    "Counseling and mental health support groups",
+    "Utility bill payment assistance",
+    "Low-cost dental care",
+    "Subsidized childcare for working parents",
+]
+PARITY_QUERIES = [
+    "I need food for my family",
+    "doctor without insurance",
+    "my landlord wants to evict me",
+    "help paying the electric bill",
+]
+
+
+class WrongSizeEncoder(Encoder):
+    backend = "wrong-size"
+
+    def _encode_texts(self, texts, batch_size):
+        return np.ones((len(texts), VECTOR_SIZE - 1), dtype=np.float32)
+
+
+def test_output_contract_rejects_wrong_dimension():
+    with pytest.raises(ValueError, match="wrong-size"):
+        check_output_contract(WrongSizeEncoder())
+
+
+@pytest.fixture(scope="module")
+def torch_encoder():
+    pytest.importorskip("sentence_transformers")
+    return create_encoder("torch")
+
+
+@pytest.mark.parametrize("backend", ["torch", "int8", "onnx"])
+def test_backend_meets_output_contract(backend):
+    pytest.importorskip("sentence_transformers")
+    if backend == "onnx":
+        pytest.importorskip("onnxruntime")
+
+    check_output_contract(create_encoder(backend))
+
+
+def test_onnx_ranking_matches_torch(torch_encoder):
+    pytest.importorskip("onnxruntime")
+
+    report = check_ranking_parity(torch_encoder, create_encoder("onnx"), PARITY_QUERIES, PARITY_CORPUS, top_k=3)
+
+    assert report["top1_agreement"] == 1.0
+    assert report["mean_overlap_at_k"] >= 0.9
+    assert report["max_cosine_drift"] < 1e-3
+
+
+def test_int8_ranking_stays_close_to_torch(torch_encoder):
+    report = check_ranking_parity(torch_encoder, create_encoder("int8"), PARITY_QUERIES, PARITY_CORPUS, top_k=3)
+
+    # Quantization may reorder near-ties; the encoders.py CLI fails below 0.8 overlap
+    assert report["mean_overlap_at_k"] >= 0.8
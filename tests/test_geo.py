@@ -0,0 +1,19 @@
+import logging
+
+from geo import GAZETTEER_PATH, check_geo_filtering, load_gazetteer
+
+
+def test_gazetteer_loads_outside_the_repo_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    assert len(load_gazetteer(GAZETTEER_PATH)) > 0
+    assert check_geo_filtering(GAZETTEER_PATH)
+
+
+def test_geo_filter_without_gazetteer_warns(tmp_path, caplog):
+    missing = str(tmp_path / "gazetteer.csv")
+
+    with caplog.at_level(logging.WARNING, logger="geo"):
+        assert not check_geo_filtering(missing)
+
+    assert any("Geo filter requested" in record.getMessage() for record in caplog.records)
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from filters import ResourceFilter, parse_open_at
+from hours import SLOTS_PER_DAY, TIMEZONE_ENV_VAR, parse_hours, slot_of
+
+
+def test_aware_timestamp_is_converted_to_resource_time(monkeypatch):
+    monkeypatch.setenv(TIMEZONE_ENV_VAR, "America/Chicago")
+
+    # 15:00 UTC on Monday 10 March 2025 is 10:00 in Chicago (CDT, UTC-5)
+    moment = parse_open_at("2025-03-10T15:00:00+00:00")
+
+    assert (moment.weekday(), moment.hour) == (0, 10)
+    assert slot_of(moment) == 10 * 60 // 15
+
+
+def test_aware_timestamp_matches_resource_hours(monkeypatch):
+    monkeypatch.setenv(TIMEZONE_ENV_VAR, "America/Chicago")
+    slots, months = parse_hours("Mon-Fri 9AM-5PM")
+    payload = {"open_slots": slots, "open_months": months}
+
+    # 14:30 UTC is 9:30 in Chicago, 22:30 UTC is 17:30: after closing
+    assert ResourceFilter(open_at="2025-03-10T14:30:00+00:00").matches(payload)
+    assert not ResourceFilter(open_at="2025-03-10T22:30:00+00:00").matches(payload)
+
+
+def test_naive_timestamp_is_resource_local(monkeypatch):
+    monkeypatch.setenv(TIMEZONE_ENV_VAR, "Asia/Tokyo")
+
+    assert parse_open_at("2025-03-10T10:00") == datetime(2025, 3, 10, 10, 0)
+
+
+def test_now_uses_resource_timezone(monkeypatch):
+    monkeypatch.setenv(TIMEZONE_ENV_VAR, "Asia/Tokyo")
+
+    moment = parse_open_at("now")
+
+    assert moment.utcoffset().total_seconds() == 9 * 3600
+    assert 0 <= slot_of(moment) < 7 * SLOTS_PER_DAY
@@ -0,0 +1,47 @@
+import json
+import sqlite3
+
+import pytest
+
+from memory_store import InMemoryStore, SQLiteMemoryStore
+
+
+def entry(i):
+    return {"timestamp": f"2025-03-10T10:0{i}:00", "query": f"query {i}", "top_result_id": f"r{i}",
+            "top_category": "Healthcare"}
+
+
+def fill(store, n=5):
+    for i in range(n):
+        store.append("u1", entry(i), query_vector=[0.25 * i, 1.0])
+
+
+@pytest.mark.parametrize("make_store", [
+    lambda tmp_path: InMemoryStore(max_history=3),
+    lambda tmp_path: SQLiteMemoryStore(str(tmp_path / "memory.db"), max_history=3),
+])
+def test_seen_resources_are_bounded_by_max_history(tmp_path, make_store):
+    store = make_store(tmp_path)
+    fill(store)
+
+    assert store.seen_resources("u1") == {"r2", "r3", "r4"}
+
+
+def test_sqlite_keeps_interest_vector_out_of_the_profile_json(tmp_path):
+    path = str(tmp_path / "memory.db")
+    store = SQLiteMemoryStore(path, max_history=3)
+    fill(store)
+    expected = store.interest_vector("u1")
+    store.close()
+
+    conn = sqlite3.connect(path)
+    profile = json.loads(conn.execute("SELECT profile FROM profiles WHERE user_id = 'u1'").fetchone()[0])
+    seen_rows = conn.execute("SELECT COUNT(*) FROM seen WHERE user_id = 'u1'").fetchone()[0]
+    conn.close()
+    assert profile["interest_vector"] is None
+    assert seen_rows == 3
+
+    reopened = SQLiteMemoryStore(path, max_history=3)
+    assert reopened.interest_vector("u1") == pytest.approx(expected)
+    assert reopened.profile("u1")["search_count"] == 5
+    assert reopened.seen_resources("u1") == {"r2", "r3", "r4"}
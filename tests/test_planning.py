@@ -0,0 +1,31 @@
+import pytest
+
+from filters import ResourceFilter
+from navigator import CommunityNavigator
+from stubs import StubClient, StubModel
+
+pytest.importorskip("qdrant_client.models")
+
+
+def test_geo_conditions_share_one_cardinality_count():
+    client = StubClient()
+    nav = CommunityNavigator(client=client, model=StubModel())
+
+    for lat in (41.881, 41.882, 41.883):
+        nav.search_resources("food pantry", category_filter=ResourceFilter(
+            categories=["Food Assistance"], near=(lat, -87.627), radius_km=3
+        ))
+
+    assert len(client.counted) == 1
+    assert client.counted[0].must[0].key == "category"
+    assert len(client.counted[0].must) == 1
+
+
+def test_geo_only_filter_is_not_counted():
+    client = StubClient()
+    nav = CommunityNavigator(client=client, model=StubModel())
+
+    nav.search_resources("food pantry", category_filter=ResourceFilter(near=(41.881, -87.627), radius_km=3))
+
+    assert client.counted == []
+    assert len(client.queried) == 1
@@ -0,0 +1,33 @@
+from navigator import CommunityNavigator
+from sparse_index import BM25Index
+from stubs import StubClient, StubModel
+
+REGIONAL_COLLECTIONS = ["community_resources_north", "community_resources_south"]
+
+
+def regional_navigator():
+    index = BM25Index()
+    index.add(1, "food pantry open on saturdays")
+    index.add(2, "free clinic with walk-in hours")
+    client = StubClient(collections=REGIONAL_COLLECTIONS)
+    nav = CommunityNavigator(client=client, model=StubModel(), regions=["North", "South"], sparse_index=index)
+    return nav, client
+
+
+def test_regions_keep_sparse_index_but_search_densely():
+    nav, client = regional_navigator()
+
+    results = nav.search_resources("food pantry", top_k=2, hybrid=True)
+
+    assert nav.sparse_index is not None
+    assert sorted(collection for collection, _ in client.queried) == REGIONAL_COLLECTIONS
+    assert len(results) == 2
+
+
+def test_default_search_on_regions_is_dense():
+    nav, client = regional_navigator()
+
+    results = nav.search_resources("food pantry", top_k=2)
+
+    assert sorted(collection for collection, _ in client.queried) == REGIONAL_COLLECTIONS
+    assert len(results) == 2
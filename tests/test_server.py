@@ -0,0 +1,50 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from navigator import CommunityNavigator
+from server import MAX_TOP_K, NavigatorHTTPServer
+from stubs import StubClient, StubModel
+
+
+@pytest.fixture
+def server():
+    navigator = CommunityNavigator(client=StubClient(), model=StubModel())
+    server = NavigatorHTTPServer(("127.0.0.1", 0), navigator)
+    server.warmup()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def search(server, body):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.server_address[1]}/search",
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_top_k_defaults_only_when_absent(server):
+    status, body = search(server, {"query": "food pantry"})
+
+    assert status == 200
+    assert len(body["results"]) == 5
+
+
+@pytest.mark.parametrize("top_k", [0, -1, MAX_TOP_K + 1])
+def test_top_k_out_of_range_is_rejected(server, top_k):
+    status, body = search(server, {"query": "food pantry", "top_k": top_k})
+
+    assert status == 400
+    assert "top_k" in body["error"]
@@ -0,0 +1,54 @@
+import io
+import tarfile
+
+import pytest
+
+from setup_qdrant import _checked_members, import_snapshot
+
+
+def write_archive(path, names):
+    with tarfile.open(path, "w:gz") as archive:
+        for name in names:
+            info = tarfile.TarInfo(name)
+            info.size = 2
+            archive.addfile(info, io.BytesIO(b"ok"))
+
+
+def test_snapshot_cannot_write_outside_storage(tmp_path):
+    snapshot = tmp_path / "snapshot.tar.gz"
+    write_archive(snapshot, ["collection/meta.json", "../escaped.txt"])
+
+    with pytest.raises((tarfile.TarError, ValueError)):
+        import_snapshot(str(snapshot), storage_path=str(tmp_path / "storage"))
+
+    assert not (tmp_path / "escaped.txt").exists()
+
+
+def test_snapshot_absolute_path_stays_inside_storage(tmp_path):
+    outside = tmp_path / "absolute.txt"
+    snapshot = tmp_path / "snapshot.tar.gz"
+    write_archive(snapshot, [str(outside)])
+
+    try:
+        import_snapshot(str(snapshot), storage_path=str(tmp_path / "storage"))
+    except (tarfile.TarError, ValueError):
+        pass
+
+    assert not outside.exists()
+
+
+def test_checked_members_rejects_escaping_paths(tmp_path):
+    snapshot = tmp_path / "snapshot.tar.gz"
+    write_archive(snapshot, ["collection/meta.json", "collection/../../escaped.txt"])
+
+    with tarfile.open(snapshot, "r:gz") as archive, pytest.raises(ValueError):
+        list(_checked_members(archive, str(tmp_path / "storage")))
+
+
+def test_snapshot_restores_into_storage(tmp_path):
+    snapshot = tmp_path / "snapshot.tar.gz"
+    write_archive(snapshot, ["collection/meta.json"])
+
+    import_snapshot(str(snapshot), storage_path=str(tmp_path / "storage"))
+
+    assert (tmp_path / "storage" / "collection" / "meta.json").read_bytes() == b"ok"
@@ -0,0 +1,70 @@
+import csv
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+qdrant_client = pytest.importorskip("qdrant_client")
+
+from setup_qdrant import VECTOR_SIZE, create_resource_collection, ingest_csv, sync_csv
+
+ROWS = [
+    {"name": "Daily Bread Food Bank", "category": "Food Assistance", "description": "Weekly groceries",
+     "location": "456 Oak Ave, West Side", "contact": "555-0200", "hours": "Tue-Sat 8AM-4PM",
+     "services": "Food Pantry"},
+    {"name": "City Community Health Clinic", "category": "Healthcare", "description": "Free checkups",
+     "location": "123 Main St, Downtown", "contact": "555-0100", "hours": "Mon-Fri 9AM-5PM",
+     "services": "Primary Care"},
+]
+
+
+class VectorModel:
+    def encode(self, texts, batch_size=None):
+        return np.ones((len(texts), VECTOR_SIZE), dtype=np.float32)
+
+
+class WriteThreadClient:
+    """QdrantClient proxy noting which threads issue writes"""
+
+    WRITES = {"upsert", "batch_update_points", "delete"}
+
+    def __init__(self, client):
+        self.client = client
+        self.write_threads = {}
+
+    def __getattr__(self, name):
+        attribute = getattr(self.client, name)
+        if name not in self.WRITES:
+            return attribute
+
+        def write(*args, **kwargs):
+            self.write_threads.setdefault(name, set()).add(threading.get_ident())
+            return attribute(*args, **kwargs)
+
+        return write
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_sync_writes_payloads_from_the_writer_thread(tmp_path):
+    csv_path = tmp_path / "resources.csv"
+    write_csv(csv_path, ROWS)
+    client = WriteThreadClient(qdrant_client.QdrantClient(":memory:"))
+    create_resource_collection(client)
+    ingest_csv(client, VectorModel(), str(csv_path))
+
+    revised = [ROWS[0], dict(ROWS[1], hours="Mon-Sat 9AM-5PM")]
+    write_csv(csv_path, revised + [dict(ROWS[0], name="Westside Pantry")])
+    client.write_threads.clear()
+
+    stats = sync_csv(client, VectorModel(), str(csv_path))
+
+    assert (stats["encoded"], stats["payload_updated"]) == (1, 1)
+    assert client.write_threads["upsert"] == client.write_threads["batch_update_points"]
+    assert threading.get_ident() not in client.write_threads["batch_update_points"]